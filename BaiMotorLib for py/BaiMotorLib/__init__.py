@@ -1,2 +1,8 @@
+# 参数扫描（MotorSimulation.parameter_sweep）的磁盘缓存以此区分结果，改变仿真行为时须提升版本号
+__version__ = "0.1.0"
 
-from . import common, controllers, drivers
\ No newline at end of file
+from ._lazy import lazy_package
+
+# 子包在首次访问时导入（如 BaiMotorLib.drivers.virtual.VirtualMotor）
+__all__ = ["common", "controllers", "drivers"]
+__getattr__, __dir__ = lazy_package(__name__, submodules={name: "." + name for name in __all__})
\ No newline at end of file
@@ -0,0 +1,34 @@
+"""
+包级惰性导入：包的 __init__ 只登记“名称 → 子模块”，首次访问该名称时才导入子模块（PEP 562 模块级 __getattr__）
+无界面进程只为实际用到的子模块付出导入开销，GUI依赖（PyQt5/pyqtgraph）与numpy仅在使用时导入
+"""
+import importlib
+
+
+def lazy_package(package, submodules=None, attributes=None):
+    """
+    生成包的 __getattr__ 与 __dir__
+    :param package: 包名（传入 __name__）
+    :param submodules: 别名 → 子模块相对名，如 {"time_sys": ".motorlib_time_sys"}
+    :param attributes: 属性名 → 子模块相对名，访问时返回子模块中的同名属性
+    :return: (__getattr__, __dir__)
+    """
+    submodules = dict(submodules or {})
+    attributes = dict(attributes or {})
+    module_globals = importlib.import_module(package).__dict__
+
+    def __getattr__(name):
+        if name in submodules:
+            value = importlib.import_module(submodules[name], package)
+        elif name in attributes:
+            value = getattr(importlib.import_module(attributes[name], package), name)
+        else:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        # 缓存到包的命名空间，之后的访问不再经过 __getattr__
+        module_globals[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(module_globals) | set(submodules) | set(attributes))
+
+    return __getattr__, __dir__
@@ -1,5 +1,18 @@
 
-from . import motor as motor
-from . import constants
-from . import motorlib_time_sys as time_sys
-from . import motorlib_log_sys as log_sys
\ No newline at end of file
+from .._lazy import lazy_package
+
+# 各子模块在首次访问时导入（sharded/async_runtime 依赖 multiprocessing/asyncio，导入开销较大）
+__getattr__, __dir__ = lazy_package(__name__, submodules={
+    "motor": ".motor",
+    "constants": ".constants",
+    "time_sys": ".motorlib_time_sys",
+    "log_sys": ".motorlib_log_sys",
+    "replay": ".motorlib_replay",
+    "snapshot": ".motorlib_snapshot",
+    "instrument": ".motorlib_instrument",
+    "fleet": ".motor_fleet",
+    "sharded": ".sharded_motor_manager",
+    "async_runtime": ".async_motor_runtime",
+})
+__all__ = ["motor", "constants", "time_sys", "log_sys", "replay", "snapshot", "instrument", "fleet", "sharded",
+           "async_runtime"]
\ No newline at end of file
@@ -0,0 +1,280 @@
+"""
+asyncio运行时：在事件循环中以固定墙钟周期驱动MotorManager，供基于asyncio的服务直接使用
+
+  - 节拍：第k个tick的截止时刻为 起始时刻 + k * period，按绝对时刻计算，sleep误差不会累计成漂移；
+          落后时连续补跑，单次最多补 max_catch_up 个tick，超出部分放弃（计入 skipped_ticks），节拍重新对齐
+  - 指令：set_target/set_state/set_brake_mode 只入队并返回可等待对象，在下一个tick边界统一生效，
+          生效后以生效时刻（时间系统tick计数）完成
+  - 订阅：subscribe() 返回异步迭代器，每个订阅者各有定长队列，队列满时丢弃最旧的采样（计入 dropped）；
+          发布只做入队，不等待任何订阅者，慢消费者不会拖慢控制节拍
+  - 结束：stop() 取消未生效的指令；tick出错时节拍任务随即结束，未生效的指令以该异常失败，
+          stop() 清理后重新抛出该异常；两种情况下订阅都在取完剩余采样后结束迭代
+"""
+import asyncio
+from collections import deque
+
+# 指令类型
+_CMD_TARGET = 0
+_CMD_STATE = 1
+_CMD_BRAKE = 2
+
+
+class SampleSubscription:
+    """
+    传感器采样订阅（异步迭代器）：
+    每个采样为 (tick, 读数元组)，读数元组按传感器顺序给出 (转速, 位置, 电流, 电压)；
+    运行时停止或调用close()后，取完队列中剩余的采样即结束迭代
+    """
+
+    def __init__(self, runtime, maxsize, every):
+        self._runtime = runtime
+        self._queue = deque(maxlen=maxsize)
+        self._waiter = None
+        self.every = every
+        self.dropped = 0      # 因队列已满而丢弃的采样数
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while not self._queue:
+            if self.closed:
+                raise StopAsyncIteration
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        return self._queue.popleft()
+
+    def close(self):
+        """取消订阅"""
+        if not self.closed:
+            self.closed = True
+            self._runtime._unsubscribe(self)
+            self._wake()
+
+    def _push(self, sample):
+        queue = self._queue
+        if len(queue) == queue.maxlen:
+            self.dropped += 1
+        queue.append(sample)
+        self._wake()
+
+    def _wake(self):
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+
+class AsyncMotorRuntime:
+    """
+    MotorManager的asyncio运行时，每个tick依次执行：
+    应用待处理指令 → 时间系统前进1ms → update_motor() → 传感器update() → 控制器execute() → 发布采样
+    约定全部方法在运行时所在的事件循环线程中调用
+    """
+
+    def __init__(self, manager, sensors=(), period_ms=1.0, max_catch_up=10):
+        """
+        :param manager: MotorManager实例
+        :param sensors: 每个tick更新并发布读数的传感器序列
+        :param period_ms: 每个tick的墙钟周期（ms），每个tick仿真时间前进1ms；小于1时按比例快于实时
+        :param max_catch_up: 落后时单次最多连续补跑的tick数
+        :raises ValueError: 周期非正或补跑数小于1时抛出异常
+        """
+        if period_ms <= 0:
+            raise ValueError("period_ms 需大于0")
+        if max_catch_up < 1:
+            raise ValueError("max_catch_up 至少为1")
+        self.manager = manager
+        self.sensors = list(sensors)
+        self.period_ms = period_ms
+        self.max_catch_up = max_catch_up
+        self.ticks = 0             # 已执行的tick数
+        self.catch_up_ticks = 0    # 因落后而连续补跑的tick数
+        self.skipped_ticks = 0     # 落后过多而放弃的tick数
+        self._commands = []        # [(指令类型, 值, 序号, future)]
+        self._subscribers = []
+        self._task = None
+        # 读数优先取未取整的原始值
+        self._readers = [tuple(getattr(sensor, "get_raw_" + name, None) or getattr(sensor, "get_" + name)
+                               for name in ("speed", "position", "current"))
+                         + (sensor.get_voltage,) for sensor in self.sensors]
+
+    # ---- 启停 ----
+    def start(self):
+        """在当前事件循环中启动节拍任务"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run(), name="AsyncMotorRuntime")
+        return self._task
+
+    async def stop(self):
+        """
+        停止节拍任务：未生效的指令被取消，全部订阅在取完剩余采样后结束
+        节拍任务因异常结束时，清理后重新抛出该异常
+        """
+        task, self._task = self._task, None
+        try:
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        finally:
+            self._shutdown()
+
+    @property
+    def running(self):
+        return self._task is not None and not self._task.done()
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
+    # ---- 指令（下一个tick边界生效） ----
+    def set_target(self, target, idx=None):
+        """
+        设置目标值
+        :param target: 目标值
+        :param idx: 电机在 manager.motors 中的序号（int或序列），None 表示全部电机
+        :return: future，生效后以生效时刻的tick计数完成
+        """
+        return self._command(_CMD_TARGET, target, idx)
+
+    def set_state(self, state, idx=None):
+        """设置控制器运行状态（ControllerState），返回值同set_target"""
+        return self._command(_CMD_STATE, state, idx)
+
+    def set_brake_mode(self, brake_mode, idx=None):
+        """设置刹车模式（MotorBrakeMode），返回值同set_target"""
+        return self._command(_CMD_BRAKE, brake_mode, idx)
+
+    # ---- 订阅 ----
+    def subscribe(self, maxsize=256, every=1):
+        """
+        订阅传感器采样
+        :param maxsize: 订阅队列长度，满时丢弃最旧的采样
+        :param every: 每every个tick发布一次
+        :raises ValueError: 参数非正时抛出异常
+        """
+        if maxsize <= 0 or every <= 0:
+            raise ValueError("maxsize 与 every 需为正整数")
+        subscription = SampleSubscription(self, maxsize, every)
+        self._subscribers.append(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription):
+        if subscription in self._subscribers:
+            self._subscribers.remove(subscription)
+
+    # ---- 节拍 ----
+    def step(self):
+        """同步执行一个tick（节拍任务内部调用，也可在未启动时手动单步）"""
+        if self._commands:
+            self._apply_commands()
+        manager = self.manager
+        manager.time_sys.tick_inc(ms=1)
+        manager.update_motor()
+        for sensor in self.sensors:
+            sensor.update()
+        for motor in manager.motors:
+            motor.Controller.execute()
+        self.ticks += 1
+        if self._subscribers:
+            self._publish()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        period = self.period_ms / 1000
+        start = loop.time()
+        done = 0
+        error = None
+        try:
+            while True:
+                delay = start + (done + 1) * period - loop.time()
+                # 落后时也让出一次事件循环，指令与订阅者得以运行
+                await asyncio.sleep(delay if delay > 0 else 0)
+                due = int((loop.time() - start) / period) - done
+                if due > self.max_catch_up:
+                    self.skipped_ticks += due - self.max_catch_up
+                    done += due - self.max_catch_up
+                    due = self.max_catch_up
+                if due > 1:
+                    self.catch_up_ticks += due - 1
+                for _ in range(due):
+                    self.step()
+                    done += 1
+        except asyncio.CancelledError:
+            raise
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            # 无论正常取消还是tick出错，都不遗留挂起的指令与订阅者
+            self._shutdown(error)
+
+    def _shutdown(self, error=None):
+        """
+        结束运行：未生效的指令以 error 失败（None 时取消），全部订阅在取完剩余采样后结束
+        :param error: 导致节拍任务结束的异常，None 表示正常停止
+        """
+        commands, self._commands = self._commands, []
+        for _, _, _, future in commands:
+            if future.done():
+                continue
+            if error is None:
+                future.cancel()
+            else:
+                future.set_exception(error)
+        for subscription in list(self._subscribers):
+            subscription.close()
+
+    def _command(self, kind, value, idx):
+        future = asyncio.get_running_loop().create_future()
+        self._commands.append((kind, value, idx, future))
+        return future
+
+    def _apply_commands(self):
+        """按入队顺序应用全部待处理指令"""
+        commands, self._commands = self._commands, []
+        motors = self.manager.motors
+        now = self.manager.time_sys.get_ticks()
+        for kind, value, idx, future in commands:
+            if future.done():
+                continue
+            try:
+                if idx is None:
+                    selected = motors
+                elif isinstance(idx, int):
+                    selected = (motors[idx],)
+                else:
+                    selected = [motors[i] for i in idx]
+                for motor in selected:
+                    controller = motor.Controller
+                    if kind == _CMD_TARGET:
+                        controller.set_target(value)
+                    elif kind == _CMD_STATE:
+                        controller.set_state(value)
+                    else:
+                        controller.set_brake_mode(value)
+            except Exception as exc:
+                future.set_exception(exc)
+            else:
+                future.set_result(now)
+
+    def _publish(self):
+        ticks = self.ticks
+        sample = None
+        for subscription in self._subscribers:
+            if ticks % subscription.every:
+                continue
+            if sample is None:
+                sample = (self.manager.time_sys.get_ticks(),
+                          tuple((speed(), position(), current(), voltage())
+                                for speed, position, current, voltage in self._readers))
+            subscription._push(sample)
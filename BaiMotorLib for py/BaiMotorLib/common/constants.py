@@ -21,7 +21,56 @@ class MotorDirection:
     MOTOR_DIR_FORWARD = 0          # 正转
     MOTOR_DIR_BACKWARD = 1         # 反转
 
+class MotorSchedulerMode:
+    """电机管理器调度模式常量"""
+    MOTOR_SCHED_LINEAR = 0         # 线性扫描：每个tick遍历全部电机
+    MOTOR_SCHED_HEAP = 1           # 优先队列：按下一次更新时间建堆，仅弹出到期电机
+
+class MotorLogLevel:
+    """日志等级常量（数值越大越严重）"""
+    MOTOR_LOG_DEBUG = 10           # 调试（如每次目标值变化）
+    MOTOR_LOG_INFO = 20            # 常规事件（状态切换、刹车、电机增删）
+    MOTOR_LOG_WARN = 30            # 警告
+    MOTOR_LOG_ERROR = 40           # 错误
+    MOTOR_LOG_OFF = 100            # 关闭日志
+
+class MotorLogEvent:
+    """日志事件码常量"""
+    MOTOR_EVT_STATE = 1            # 控制器状态切换（值0：原状态，值1：新状态）
+    MOTOR_EVT_BRAKE = 2            # 刹车模式设置（值0：刹车模式）
+    MOTOR_EVT_TARGET = 3           # 目标值设置（值0：目标值）
+    MOTOR_EVT_MOTOR_ADD = 4        # 电机加入管理器
+    MOTOR_EVT_MOTOR_REMOVE = 5     # 电机移出管理器
+    MOTOR_EVT_USER = 1000          # 用户自定义事件码起始值
+
+class MotorSimRunMode:
+    """仿真运行模式常量"""
+    MOTOR_SIM_ASAP = 0             # 尽快运行：逐ms步进，不等待墙钟
+    MOTOR_SIM_REALTIME = 1         # 墙钟锁定：按 speed_factor 倍实时运行（1为实时）
+    MOTOR_SIM_MACRO_STEP = 2       # 自适应宏步：跳过没有控制器到期的区间，仅在到期时刻完整步进
+
+class MotorPlantIntegrator:
+    """电机被控对象的离散化方式常量"""
+    MOTOR_PLANT_EULER = 0          # 前向欧拉（一阶），步长需远小于电气时间常数 L/R
+    MOTOR_PLANT_RK4 = 1            # 四阶龙格-库塔
+    MOTOR_PLANT_EXACT = 2          # 零阶保持精确离散化（矩阵指数），任意步长均稳定
+
+class MotorReplayCommand:
+    """回放日志的外部指令码"""
+    MOTOR_CMD_SET_TARGET = 1       # 设置目标值（值：目标值）
+    MOTOR_CMD_SET_STATE = 2        # 设置控制器状态（值：ControllerState）
+    MOTOR_CMD_SET_BRAKE = 3        # 设置刹车模式（值：MotorBrakeMode）
+    MOTOR_CMD_ADD_MOTOR = 4        # 加入电机（电机编号即派生传感器随机源的序号）
+    MOTOR_CMD_REMOVE_MOTOR = 5     # 移除电机
+    MOTOR_CMD_END = 6              # 录制结束（tick为结束时刻）
+
 # 禁止实例化（可选，强化静态类特性）
 ControllerState.__init__ = lambda self: None
 MotorBrakeMode.__init__ = lambda self: None
-MotorDirection.__init__ = lambda self: None
\ No newline at end of file
+MotorDirection.__init__ = lambda self: None
+MotorSchedulerMode.__init__ = lambda self: None
+MotorLogLevel.__init__ = lambda self: None
+MotorLogEvent.__init__ = lambda self: None
+MotorSimRunMode.__init__ = lambda self: None
+MotorPlantIntegrator.__init__ = lambda self: None
+MotorReplayCommand.__init__ = lambda self: None
\ No newline at end of file
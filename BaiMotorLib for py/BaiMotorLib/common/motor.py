@@ -1,5 +1,7 @@
 
 class Motor:
+    # 固定属性布局：大量电机实例时省去每个对象的__dict__
+    __slots__ = ("Driver", "Controller")
 
     def __init__(self, driver, controller):
         self.Driver = driver
@@ -0,0 +1,139 @@
+from array import array
+
+
+class MotorFleet:
+    """
+    电机群的列式热数据存储：目标值、输出、状态、刹车模式、下一次更新tick、驱动目标转速
+    各为一段连续的定长类型数组（array），每台电机占一行
+    控制器/驱动以“视图子类”创建：视图子类继承原类，只把上述热字段换成读写本存储对应行的属性，
+    其余行为（set_target、update、execute等）与原类完全一致；
+    容量在构造时固定，列数组不会重新分配，导出的memoryview/NumPy视图始终有效
+    """
+    # 列名与类型码
+    COLUMNS = (("target", "d"),
+               ("output", "d"),
+               ("state", "b"),
+               ("brake_mode", "b"),
+               ("next_update", "q"),
+               ("driver_target", "d"))
+    # 对象属性名 → 列名（原类中存在该属性的才会映射）
+    FIELDS = {"Target": "target",
+              "_output_speed": "output",
+              "state": "state",
+              "BrakeMode": "brake_mode",
+              "NextUpdateTick": "next_update",
+              "_target_speed": "driver_target"}
+
+    def __init__(self, capacity, time_sys=None):
+        """
+        :param capacity: 最大电机数量
+        :param time_sys: 时间系统实例，给出时新增的控制器立即绑定（单独使用update_due()时需要）
+        :raises ValueError: 容量非正时抛出异常
+        """
+        if capacity <= 0:
+            raise ValueError("capacity 需为正整数")
+        self.capacity = capacity
+        self.time_sys = time_sys
+        self.size = 0
+        self.controllers = []   # 第i行对应的控制器
+        self._columns = {name: array(code, bytes(array(code).itemsize * capacity)) for name, code in self.COLUMNS}
+        self._view_classes = {}
+        try:
+            import numpy as np
+        except ImportError:
+            self._next_update_np = None
+        else:
+            self._next_update_np = np.frombuffer(self._columns["next_update"], dtype=np.int64)
+
+    def add_motor(self, motor_cls, controller_cls, driver_cls, controller_kwargs=None, driver_kwargs=None):
+        """
+        新增一台电机：在同一行上创建驱动视图与控制器视图，再组装为电机
+        :param motor_cls: 电机类（如VirtualMotor），以 motor_cls(driver=..., controller=...) 构造
+        :param controller_cls: 控制器类（如OpenLoopController），以 motor_driver=驱动 传入驱动
+        :param driver_cls: 驱动类（如VirtualMotorDriver）
+        :return: 电机实例
+        :raises ValueError: 容量已满时抛出异常
+        """
+        row = self._allocate()
+        driver = self.view_class(driver_cls)(row, **(driver_kwargs or {}))
+        controller = self.view_class(controller_cls)(row, motor_driver=driver, **(controller_kwargs or {}))
+        if self.time_sys is not None:
+            controller.bind_time_sys(self.time_sys)
+        self.controllers.append(controller)
+        return motor_cls(driver=driver, controller=controller)
+
+    def view_class(self, cls):
+        """
+        获取cls的视图子类（按类缓存），构造方式为 view_cls(行号, *原构造参数)
+        :param cls: 声明了__slots__的控制器/驱动类
+        """
+        view = self._view_classes.get(cls)
+        if view is None:
+            slots = set()
+            for klass in cls.__mro__:
+                slots.update(getattr(klass, "__slots__", ()))
+            namespace = {"__slots__": ("_fleet_row",), "__init__": self._view_init(cls.__init__)}
+            for attr, column in self.FIELDS.items():
+                if attr in slots:
+                    namespace[attr] = self._column_property(self._columns[column], none_as_nan=attr == "Target")
+            view = type(cls.__name__, (cls,), namespace)
+            view.__qualname__ = cls.__qualname__
+            view.__module__ = cls.__module__
+            self._view_classes[cls] = view
+        return view
+
+    def column(self, name):
+        """获取单列前size行的memoryview（零拷贝，可用 numpy.frombuffer 包装）"""
+        return memoryview(self._columns[name])[:self.size]
+
+    def update_due(self, now_ticks):
+        """
+        快速调度：直接扫描next_update列，对到期（≤ now_ticks）的控制器调用update()
+        到期判定与MotorManager线性调度相同，省去每台电机的NextUpdate元组解包与compare_time；
+        已安装NumPy时以向量化比较找出到期行
+        :param now_ticks: 当前时间（时间系统tick计数，同 time_sys.get_ticks()）
+        :return: 本次更新的控制器数量
+        """
+        controllers = self.controllers
+        if self._next_update_np is not None:
+            due = (self._next_update_np[:self.size] <= now_ticks).nonzero()[0].tolist()
+        else:
+            due = [i for i, tick in enumerate(self._columns["next_update"][:self.size]) if tick <= now_ticks]
+        for i in due:
+            controllers[i].update()
+        return len(due)
+
+    def __len__(self):
+        return self.size
+
+    def _allocate(self):
+        if self.size == self.capacity:
+            raise ValueError(f"MotorFleet 容量已满（{self.capacity}）")
+        row = self.size
+        self.size += 1
+        return row
+
+    @staticmethod
+    def _view_init(base_init):
+        def __init__(self, row, *args, **kwargs):
+            self._fleet_row = row
+            base_init(self, *args, **kwargs)
+        return __init__
+
+    @staticmethod
+    def _column_property(col, none_as_nan=False):
+        """生成读写列中本行数据的属性；none_as_nan 时以NaN存储None（控制器Target的初始值）"""
+        if none_as_nan:
+            def getter(self):
+                value = col[self._fleet_row]
+                return None if value != value else value
+
+            def setter(self, value):
+                col[self._fleet_row] = float("nan") if value is None else value
+        else:
+            def getter(self):
+                return col[self._fleet_row]
+
+            def setter(self, value):
+                col[self._fleet_row] = value
+        return property(getter, setter)
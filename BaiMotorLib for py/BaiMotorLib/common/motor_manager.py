@@ -1,16 +1,43 @@
+import heapq
+from functools import partial
+from itertools import count
+
 from .motorlib_time_sys import *
+from .constants import MotorLogEvent, MotorLogLevel, MotorSchedulerMode
 
 class MotorManager:
-    def __init__(self, time_sys, *args):
+    def __init__(self, time_sys, *args, scheduler=MotorSchedulerMode.MOTOR_SCHED_LINEAR, log_sys=None):
         """
         电机管理器初始化
         :param time_sys: 时间系统实例（MotorlibTimeSys），用于电机更新的时间基准
         :param args: 可变参数，初始化时传入的多个电机实例
+        :param scheduler: 调度模式（MotorSchedulerMode），默认线性扫描；
+                          MOTOR_SCHED_HEAP 按下一次更新时间建小顶堆，每个tick仅处理到期电机
+        :param log_sys: 日志系统实例（MotorlibLogSys），None 表示不记录；
+                        日志系统改用管理器的时间基准取时间戳，
+                        电机加入时按加入顺序分配编号，并把日志系统注入其控制器
         """
         # 绑定时间系统，指定类型注解确保类型匹配
         self.time_sys: MotorlibTimeSys = time_sys
         # 初始化电机列表，接收可变参数的电机实例
         self.motors: list = list(args)
+        self.scheduler = scheduler
+        self.log_sys = log_sys
+        # 日志时间戳与控制器调度使用同一时间基准
+        if log_sys is not None:
+            log_sys.bind_time_sys(time_sys)
+        self._next_motor_id = 0   # 下一台加入电机的日志编号
+        # 堆调度状态：堆元素为 [到期tick, 序号, 电机]，序号保证同一时刻按加入顺序出堆
+        # 移除电机时仅把元素中的电机置为None（惰性删除），无需重建堆
+        self._heap: list = []
+        self._heap_entries: dict = {}
+        self._heap_seq = count()
+        # 控制器统一绑定到管理器的时间基准，使NextUpdate基于真实的当前时间计算
+        for motor in self.motors:
+            self._bind_motor(motor)
+        if self.scheduler == MotorSchedulerMode.MOTOR_SCHED_HEAP:
+            for motor in self.motors:
+                self._heap_push(motor)
 
     def add_motor(self, motor):
         """
@@ -19,6 +46,9 @@ class MotorManager:
         """
         if motor not in self.motors:
             self.motors.append(motor)
+            self._bind_motor(motor)
+            if self.scheduler == MotorSchedulerMode.MOTOR_SCHED_HEAP:
+                self._heap_push(motor)
 
     def remove_motor(self, motor):
         """
@@ -27,6 +57,27 @@ class MotorManager:
         """
         if motor in self.motors:
             self.motors.remove(motor)
+            self._log(MotorLogEvent.MOTOR_EVT_MOTOR_REMOVE, motor)
+            bind_reschedule_hook = getattr(motor.Controller, "bind_reschedule_hook", None)
+            if bind_reschedule_hook is not None:
+                bind_reschedule_hook(None)
+            entry = self._heap_entries.pop(motor, None)
+            if entry is not None:
+                entry[2] = None
+
+    def reschedule_motor(self, motor):
+        """
+        堆调度模式下重新登记电机的下一次更新时间
+        控制器经 _calc_next_update 重新计算（set_update_period/set_target等）时由调度通知自动登记；
+        只有绕过它直接修改NextUpdate并把时间提前时才需调用，推迟的情况在出堆时会被自动修正
+        :param motor: 已加入管理器的电机实例
+        """
+        if self.scheduler != MotorSchedulerMode.MOTOR_SCHED_HEAP or motor not in self.motors:
+            return
+        entry = self._heap_entries.get(motor)
+        if entry is not None:
+            entry[2] = None
+        self._heap_push(motor)
 
     def update_motor(self):
         """
@@ -35,6 +86,9 @@ class MotorManager:
         若更新时间已到（等于当前时间）或已过期（早于当前时间），触发电机控制器的update()方法
         注：motor.Controller.NextUpdate 需为 (ms, sec, min, hour) 格式的元组，与compare_time参数匹配
         """
+        if self.scheduler == MotorSchedulerMode.MOTOR_SCHED_HEAP:
+            self._update_motor_heap()
+            return
         # 遍历管理器中所有电机，逐台判断是否需要更新
         for motor in self.motors:
             # 取出电机控制器的下一次更新时间，解包后传入时间比较方法
@@ -46,3 +100,133 @@ class MotorManager:
             # 时间已到/已过期，触发电机控制器更新
             if time_state in (self.time_sys.NowTheTime, self.time_sys.OnceUponATime):
                 motor.Controller.update()
+
+    def next_deadline(self):
+        """
+        获取全部电机中最早的下一次更新时间（与time_sys.get_ticks()同基准），供宏步仿真跳过空闲区间
+        堆调度直接读堆顶（顺带丢弃已移除电机的惰性元素），线性调度扫描全部电机
+        :return: int，最早到期的tick；没有电机时返回None
+        """
+        if self.scheduler == MotorSchedulerMode.MOTOR_SCHED_HEAP:
+            heap = self._heap
+            while heap and heap[0][2] is None:
+                heapq.heappop(heap)
+            if not heap:
+                return None
+            # 堆键可能早于控制器在堆外推迟后的实际时间，取较早者不会漏掉到期
+            return heap[0][0]
+        if not self.motors:
+            return None
+        return min(self._deadline_key(motor) for motor in self.motors)
+
+    def dump_state(self):
+        """
+        导出管理器状态（快照用，见 motorlib_snapshot）：时间系统、日志编号计数，
+        以及按电机顺序的 (控制器状态, 驱动状态)；不提供dump_state的控制器/驱动记为None
+        传感器（连同被控对象）不属于管理器，由其所有者单独导出
+        """
+        motors = tuple((self._dump_part(motor.Controller), self._dump_part(motor.Driver)) for motor in self.motors)
+        return (self.time_sys.dump_state(), self._next_motor_id, motors)
+
+    def load_state(self, state):
+        """
+        恢复dump_state()导出的状态到当前的电机成员（电机数量与顺序须与导出时一致），并重建调度堆
+        :raises ValueError: 电机数量不一致时抛出异常
+        """
+        time_state, next_motor_id, motors = state
+        if len(motors) != len(self.motors):
+            raise ValueError(f"快照中的电机数量（{len(motors)}）与管理器（{len(self.motors)}）不一致")
+        self.time_sys.load_state(time_state)
+        self._next_motor_id = next_motor_id
+        for motor, (controller_state, driver_state) in zip(self.motors, motors):
+            if controller_state is not None:
+                motor.Controller.load_state(controller_state)
+            if driver_state is not None:
+                motor.Driver.load_state(driver_state)
+        if self.scheduler == MotorSchedulerMode.MOTOR_SCHED_HEAP:
+            self._heap = []
+            self._heap_entries = {}
+            self._heap_seq = count()
+            for motor in self.motors:
+                self._heap_push(motor)
+
+    @staticmethod
+    def _dump_part(part):
+        dump_state = getattr(part, "dump_state", None)
+        return dump_state() if dump_state is not None else None
+
+    def _update_motor_heap(self):
+        """
+        堆调度的单次tick：只弹出到期电机，更新后按新的NextUpdate重新入堆
+        复杂度 O(到期数 · log N)，与未到期电机数量无关
+        """
+        heap = self._heap
+        now = self.time_sys.get_ticks()
+        due = []
+        # 先收集本tick全部到期电机，避免更新后仍过期的电机在同一tick内被重复弹出
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            motor = entry[2]
+            if motor is None:
+                continue
+            key = self._deadline_key(motor)
+            if key > now:
+                # 控制器在堆外推迟了更新时间，按实际时间重新入堆
+                self._heap_push(motor, key)
+                continue
+            due.append(entry)
+
+        for entry in due:
+            motor = entry[2]
+            if motor is not None:
+                motor.Controller.update()
+
+        for entry in due:
+            motor = entry[2]
+            # 更新过程中被移除（或已被重新登记）的电机不再入堆
+            if motor is not None and self._heap_entries.get(motor) is entry:
+                self._heap_push(motor)
+
+    def _bind_motor(self, motor):
+        """
+        把电机控制器绑定到管理器的时间系统与日志系统（控制器需提供bind_time_sys / bind_log_sys），
+        堆调度时另绑定调度通知（bind_reschedule_hook）
+        """
+        bind_time_sys = getattr(motor.Controller, "bind_time_sys", None)
+        if bind_time_sys is not None:
+            bind_time_sys(self.time_sys)
+        if self.log_sys is not None:
+            bind_log_sys = getattr(motor.Controller, "bind_log_sys", None)
+            if bind_log_sys is not None:
+                bind_log_sys(self.log_sys, self._next_motor_id)
+                self._next_motor_id += 1
+            self._log(MotorLogEvent.MOTOR_EVT_MOTOR_ADD, motor)
+        if self.scheduler == MotorSchedulerMode.MOTOR_SCHED_HEAP:
+            bind_reschedule_hook = getattr(motor.Controller, "bind_reschedule_hook", None)
+            if bind_reschedule_hook is not None:
+                bind_reschedule_hook(partial(self._reschedule_earlier, motor))
+
+    def _log(self, event, motor):
+        """记录电机增删事件（INFO等级），编号取自其控制器"""
+        log_sys = self.log_sys
+        if log_sys is not None and MotorLogLevel.MOTOR_LOG_INFO >= log_sys.level:
+            log_sys.log(MotorLogLevel.MOTOR_LOG_INFO, event, getattr(motor.Controller, "MotorId", 0))
+
+    def _reschedule_earlier(self, motor):
+        """调度通知：控制器的下一次更新时间早于其堆键时按新时间重新入堆（推迟的情况留到出堆时修正）"""
+        entry = self._heap_entries.get(motor)
+        if entry is not None and motor.Controller.NextUpdateTick < entry[0]:
+            entry[2] = None
+            self._heap_push(motor, motor.Controller.NextUpdateTick)
+
+    def _heap_push(self, motor, key=None):
+        """按控制器当前的NextUpdate把电机压入堆，并登记其堆元素"""
+        if key is None:
+            key = self._deadline_key(motor)
+        entry = [key, next(self._heap_seq), motor]
+        self._heap_entries[motor] = entry
+        heapq.heappush(self._heap, entry)
+
+    def _deadline_key(self, motor):
+        """把 (ms, sec, min, hour) 格式的NextUpdate转换为整数tick比较键（与time_sys.get_ticks()同基准）"""
+        return self.time_sys.to_ticks(*motor.Controller.NextUpdate)
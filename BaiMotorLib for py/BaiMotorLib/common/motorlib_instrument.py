@@ -0,0 +1,269 @@
+"""
+热路径插桩：按阶段/按电机统计延迟直方图（HDR风格，定长内存），统计tick超时次数，提供快照接口
+
+启用方式为“换类”：attach_manager() 把管理器、控制器、驱动、传感器、时间系统实例的 __class__
+替换为动态生成的计时子类（子类只覆写被计时的方法，__slots__ = ()，与原对象内存布局一致），
+detach() 换回原类。未启用插桩时热路径上的代码与对象完全不变，没有任何判断或间接调用开销
+"""
+from array import array
+from time import perf_counter_ns
+
+
+class LatencyHistogram:
+    """
+    HDR风格的对数-线性直方图（单位ns）：
+    小于 2^sub_bucket_bits 的值逐个计数，更大的值每个2的幂区间再均分为 2^(sub_bucket_bits-1) 个桶，
+    相对误差不超过 1/2^(sub_bucket_bits-1)；桶数组在构造时一次分配，之后记录不再分配内存
+    """
+
+    def __init__(self, max_value_ns=10**9, sub_bucket_bits=5):
+        """
+        :param max_value_ns: 可区分的最大值，超出的值计入最后一个桶（max仍按真实值统计）
+        :param sub_bucket_bits: 子桶位数，越大精度越高、内存越大
+        :raises ValueError: 参数非法时抛出异常
+        """
+        if sub_bucket_bits < 2 or max_value_ns < 2 ** sub_bucket_bits:
+            raise ValueError("sub_bucket_bits 至少为2，max_value_ns 需不小于 2^sub_bucket_bits")
+        self._sub_bits = sub_bucket_bits
+        self._sub_count = 1 << sub_bucket_bits
+        self._half = self._sub_count >> 1
+        self._last = self._index(max_value_ns)
+        self._counts = array("q", bytes(8 * (self._last + 1)))
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def record(self, value_ns):
+        """记录一个延迟值（ns，非负整数）"""
+        index = self._index(value_ns)
+        if index > self._last:
+            index = self._last
+        self._counts[index] += 1
+        if self.count == 0 or value_ns < self.min:
+            self.min = value_ns
+        if value_ns > self.max:
+            self.max = value_ns
+        self.count += 1
+        self.total += value_ns
+
+    def percentile(self, p):
+        """
+        估算百分位数（返回所在桶的上界，不超过max）
+        :param p: 百分位（0~100）
+        """
+        if self.count == 0:
+            return 0
+        rank = max(1, -(-self.count * p // 100))
+        seen = 0
+        for index, n in enumerate(self._counts):
+            seen += n
+            if seen >= rank:
+                return min(self._upper(index), self.max)
+        return self.max
+
+    def reset(self):
+        """清空计数（不释放内存）"""
+        for index in range(len(self._counts)):
+            self._counts[index] = 0
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def snapshot(self):
+        """返回统计摘要dict（单位ns）"""
+        return {
+            "count": self.count,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "p999": self.percentile(99.9),
+        }
+
+    def _index(self, value):
+        if value < self._sub_count:
+            return value
+        shift = value.bit_length() - self._sub_bits
+        return self._sub_count + (shift - 1) * self._half + (value >> shift) - self._half
+
+    def _upper(self, index):
+        """桶内最大值"""
+        if index < self._sub_count:
+            return index
+        shift = (index - self._sub_count) // self._half + 1
+        sub = (index - self._sub_count) % self._half + self._half
+        return ((sub + 1) << shift) - 1
+
+
+class MotorInstrument:
+    """
+    插桩数据汇总：
+      - 阶段直方图 stages：tick、update_motor、compare_time、controller_update、execute、driver、sensor_update
+      - 电机直方图：每个控制器一次update()的耗时
+      - tick超时：一个tick耗时超过 tick_budget_ns 计为一次超时；
+        调用方用 begin_tick()/end_tick() 包住完整步进时按完整步进计，否则以update_motor()的耗时计
+    """
+    STAGES = ("tick", "update_motor", "compare_time", "controller_update", "execute", "driver", "sensor_update")
+
+    def __init__(self, tick_budget_ns=1_000_000, per_motor=True, max_value_ns=10**9):
+        """
+        :param tick_budget_ns: 单个tick的时间预算（ns），默认1ms
+        :param per_motor: 是否统计每台电机的update()耗时
+        :param max_value_ns: 直方图可区分的最大值（ns）
+        """
+        self.tick_budget_ns = tick_budget_ns
+        self.per_motor = per_motor
+        self.max_value_ns = max_value_ns
+        self.stages = {name: LatencyHistogram(max_value_ns) for name in self.STAGES}
+        self.ticks = 0
+        self.overruns = 0
+        self._motor_hist = {}     # 控制器 → 直方图
+        self._managers = []
+        self._swapped = []        # [(对象, 原类)]
+        self._swapped_ids = set()
+        self._classes = {}        # (原类, 方法名元组) → 计时子类
+        self._tick_start = None
+
+    # ---- 启用/停用 ----
+    def attach_manager(self, manager, sensors=()):
+        """
+        为管理器及其当前全部电机的控制器/驱动，以及给定的传感器启用插桩（之后加入的电机不计时）
+        :param manager: MotorManager实例
+        :param sensors: 需要计时update()的传感器序列
+        """
+        if manager not in self._managers:
+            self._managers.append(manager)
+        self._swap(manager, {"update_motor": self._timed_update_motor})
+        self._swap(manager.time_sys, {"compare_time": self._stage_timer("compare_time")})
+        for motor in manager.motors:
+            controller = motor.Controller
+            if self.per_motor:
+                self._motor_hist.setdefault(controller, LatencyHistogram(self.max_value_ns))
+            self._swap(controller, {"update": self._timed_controller_update,
+                                    "execute": self._stage_timer("execute")})
+            if motor.Driver is not None and hasattr(motor.Driver, "set_target"):
+                self._swap(motor.Driver, {"set_target": self._stage_timer("driver")})
+        for sensor in sensors:
+            self._swap(sensor, {"update": self._stage_timer("sensor_update")})
+
+    def detach(self):
+        """停用插桩：全部对象换回原类（已统计的数据保留，仍可snapshot()）"""
+        for obj, cls in reversed(self._swapped):
+            obj.__class__ = cls
+        self._swapped.clear()
+        self._swapped_ids.clear()
+
+    # ---- 完整tick计时 ----
+    def begin_tick(self):
+        """标记一个完整步进的开始"""
+        self._tick_start = perf_counter_ns()
+
+    def end_tick(self):
+        """标记一个完整步进的结束，记录tick耗时并判定超时"""
+        self._record_tick(perf_counter_ns() - self._tick_start)
+        self._tick_start = None
+
+    # ---- 快照 ----
+    def snapshot(self):
+        """
+        返回插桩数据快照：
+        {"ticks", "overruns", "tick_budget_ns", "stages": {阶段: 摘要}, "motors": [{"manager", "index", 摘要...}]}
+        电机按所在管理器及其在 manager.motors 中的序号标识
+        """
+        motors = []
+        for manager_index, manager in enumerate(self._managers):
+            for index, motor in enumerate(manager.motors):
+                hist = self._motor_hist.get(motor.Controller)
+                if hist is not None:
+                    motors.append(dict(manager=manager_index, index=index, **hist.snapshot()))
+        return {
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "tick_budget_ns": self.tick_budget_ns,
+            "stages": {name: hist.snapshot() for name, hist in self.stages.items()},
+            "motors": motors,
+        }
+
+    def reset(self):
+        """清空全部统计"""
+        for hist in self.stages.values():
+            hist.reset()
+        for hist in self._motor_hist.values():
+            hist.reset()
+        self.ticks = 0
+        self.overruns = 0
+
+    # ---- 内部实现 ----
+    def _record_tick(self, elapsed):
+        self.stages["tick"].record(elapsed)
+        self.ticks += 1
+        if elapsed > self.tick_budget_ns:
+            self.overruns += 1
+
+    def _swap(self, obj, methods):
+        """把对象换成覆写了methods（方法名 → 包装函数工厂）的计时子类"""
+        if id(obj) in self._swapped_ids:
+            return
+        cls = type(obj)
+        key = (cls, tuple(sorted(methods)))
+        sub = self._classes.get(key)
+        if sub is None:
+            namespace = {"__slots__": ()}
+            for name, wrap in methods.items():
+                namespace[name] = wrap(getattr(cls, name))
+            sub = type(cls.__name__, (cls,), namespace)
+            sub.__qualname__ = cls.__qualname__
+            sub.__module__ = cls.__module__
+            self._classes[key] = sub
+        self._swapped.append((obj, cls))
+        self._swapped_ids.add(id(obj))
+        obj.__class__ = sub
+
+    def _stage_timer(self, stage):
+        """生成“计时并记入指定阶段”的包装函数工厂"""
+        record = self.stages[stage].record
+
+        def wrap(func):
+            def timed(obj, *args, **kwargs):
+                start = perf_counter_ns()
+                try:
+                    return func(obj, *args, **kwargs)
+                finally:
+                    record(perf_counter_ns() - start)
+            return timed
+        return wrap
+
+    def _timed_controller_update(self, func):
+        record = self.stages["controller_update"].record
+        motor_hist = self._motor_hist
+
+        def timed(obj, *args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return func(obj, *args, **kwargs)
+            finally:
+                elapsed = perf_counter_ns() - start
+                record(elapsed)
+                hist = motor_hist.get(obj)
+                if hist is not None:
+                    hist.record(elapsed)
+        return timed
+
+    def _timed_update_motor(self, func):
+        record = self.stages["update_motor"].record
+        instrument = self
+
+        def timed(obj, *args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return func(obj, *args, **kwargs)
+            finally:
+                elapsed = perf_counter_ns() - start
+                record(elapsed)
+                if instrument._tick_start is None:
+                    instrument._record_tick(elapsed)
+        return timed
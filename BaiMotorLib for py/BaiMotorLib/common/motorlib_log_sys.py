@@ -0,0 +1,178 @@
+"""
+控制热路径用的结构化日志：日志为定长二进制记录，写入预分配缓冲区，由后台线程批量落盘
+
+文件布局（小端）：
+    文件头 32字节：magic(8s) | 版本(H) | 单条记录字节数(H) | 每毫秒tick数(I) | 保留(16x)
+    之后为连续的定长记录
+定长记录 32字节：tick(q) | 电机编号(I) | 事件码(H) | 等级(B) | 填充(x) | 值0(d) | 值1(d)
+"""
+import struct
+import threading
+from queue import Empty, Queue
+
+from .constants import MotorLogLevel
+
+LOG_MAGIC = b"BMLLOG\x00\x00"
+LOG_VERSION = 1
+
+LOG_HEADER = struct.Struct("<8sHHI16x")
+LOG_RECORD = struct.Struct("<qIHBxdd")
+
+
+class MotorlibLogSys:
+    """
+    非阻塞二进制日志：
+      - 等级检查：log() 首先比较整数等级，低于设定等级时立即返回；调用方也可先判断 level 再调用，省去函数调用
+      - 记录：struct.pack_into 写入预分配缓冲区，不创建字符串、不做格式化
+      - 落盘：缓冲区写满（或flush()）后交给后台线程写文件，调用线程从空闲池取下一块缓冲区继续写入；
+              后台线程跟不上、空闲池耗尽时丢弃记录并计入 dropped，而不是阻塞控制节拍
+    约定由单个线程（仿真线程）调用 log()/flush()；close() 之后 log() 的记录计入 dropped，flush() 直接返回
+    """
+
+    def __init__(self, time_sys, path, level=MotorLogLevel.MOTOR_LOG_INFO, buffer_records=4096, buffers=4):
+        """
+        :param time_sys: 时间系统实例，记录的时间戳取自 time_sys.get_ticks()；
+                         交给MotorManager后改为取管理器的时间基准（见 bind_time_sys）
+        :param path: 日志文件路径（覆盖写）
+        :param level: 日志等级（MotorLogLevel），低于该等级的记录被忽略
+        :param buffer_records: 每块缓冲区的记录数
+        :param buffers: 缓冲区块数（≥2），决定后台落盘可落后的程度
+        :raises ValueError: 缓冲区参数无效时抛出异常
+        """
+        if buffer_records <= 0 or buffers < 2:
+            raise ValueError("buffer_records 需为正整数，buffers 至少为2")
+        self.time_sys = time_sys
+        self.level = level
+        self.dropped = 0          # 因缓冲区耗尽而丢弃的记录数
+        self.records_written = 0  # 已落盘的记录数
+        self._buffer_bytes = buffer_records * LOG_RECORD.size
+        self._free = Queue()
+        for _ in range(buffers - 1):
+            self._free.put(bytearray(self._buffer_bytes))
+        self._pending = Queue()
+        self._buffer = bytearray(self._buffer_bytes)
+        self._offset = 0
+
+        self._file = open(path, "wb")
+        self._file.write(LOG_HEADER.pack(LOG_MAGIC, LOG_VERSION, LOG_RECORD.size, time_sys.TICKS_PER_MS))
+        self._writer = threading.Thread(target=self._drain, name="MotorlibLogSys", daemon=True)
+        self._writer.start()
+
+    def bind_time_sys(self, time_sys):
+        """
+        改用另一时间系统取时间戳（MotorManager构造时绑定到其时间基准）
+        :param time_sys: 时间系统实例，tick分辨率须与文件头中记录的一致
+        :raises ValueError: tick分辨率不一致时抛出异常
+        """
+        if time_sys.TICKS_PER_MS != self.time_sys.TICKS_PER_MS:
+            raise ValueError(f"时间系统的tick分辨率（{time_sys.TICKS_PER_MS}）与日志文件"
+                             f"（{self.time_sys.TICKS_PER_MS}）不一致")
+        self.time_sys = time_sys
+
+    def enabled(self, level):
+        """判断某等级的日志是否会被记录"""
+        return level >= self.level
+
+    def set_level(self, level):
+        """修改日志等级（MotorLogLevel.MOTOR_LOG_OFF 表示关闭）"""
+        self.level = level
+
+    def log(self, level, event, motor_id=0, value0=0.0, value1=0.0):
+        """
+        写入一条记录（不阻塞）
+        :param level: 日志等级（MotorLogLevel）
+        :param event: 事件码（MotorLogEvent）
+        :param motor_id: 电机编号
+        :param value0: 附加值0
+        :param value1: 附加值1
+        """
+        if level < self.level:
+            return
+        buffer = self._buffer
+        if buffer is None:
+            # 上一块已交出且空闲池为空：尝试取回一块，仍没有则丢弃
+            buffer = self._take_free()
+            if buffer is None:
+                self.dropped += 1
+                return
+            self._buffer = buffer
+        LOG_RECORD.pack_into(buffer, self._offset, self.time_sys.get_ticks(), motor_id, event, level,
+                             value0, value1)
+        self._offset += LOG_RECORD.size
+        if self._offset == self._buffer_bytes:
+            self._hand_off()
+
+    def flush(self, wait=False):
+        """
+        把当前缓冲区中的记录交给后台线程
+        :param wait: 是否等待后台线程写完全部已交出的记录
+        """
+        if self._file.closed:
+            return
+        if self._offset:
+            self._hand_off()
+        if wait:
+            self._pending.join()
+
+    def close(self):
+        """落盘剩余记录，停止后台线程并关闭文件"""
+        if self._file.closed:
+            return
+        self.flush()
+        self._pending.put(None)
+        self._writer.join()
+        self._file.close()
+        # 不再留有可写缓冲区，之后的 log() 走“缓冲区耗尽”分支丢弃记录
+        self._buffer = None
+        self._free = Queue()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _hand_off(self):
+        """把写有数据的缓冲区交给后台线程，并换上一块空闲缓冲区（没有缓冲区时只复位偏移，不向后台线程交出None）"""
+        if self._buffer is not None:
+            self._pending.put((self._buffer, self._offset))
+        self._offset = 0
+        self._buffer = self._take_free()
+
+    def _take_free(self):
+        try:
+            return self._free.get_nowait()
+        except Empty:
+            return None
+
+    def _drain(self):
+        """后台线程：写出交来的缓冲区并归还到空闲池"""
+        while True:
+            item = self._pending.get()
+            if item is None:
+                self._file.flush()
+                self._pending.task_done()
+                return
+            buffer, length = item
+            self._file.write(memoryview(buffer)[:length])
+            self._file.flush()
+            self.records_written += length // LOG_RECORD.size
+            self._free.put(buffer)
+            self._pending.task_done()
+
+
+def read_log(path):
+    """
+    读取二进制日志文件
+    :return: (每毫秒tick数, 记录列表)，记录为 (tick, 电机编号, 事件码, 等级, 值0, 值1)
+    :raises ValueError: 文件格式不匹配时抛出异常
+    """
+    with open(path, "rb") as file:
+        magic, version, record_size, ticks_per_ms = LOG_HEADER.unpack(file.read(LOG_HEADER.size))
+        if magic != LOG_MAGIC:
+            raise ValueError(f"不是BaiMotorLib日志文件：{path}")
+        if version != LOG_VERSION or record_size != LOG_RECORD.size:
+            raise ValueError(f"不支持的日志文件版本：{version}（记录长度 {record_size}）")
+        data = file.read()
+    usable = len(data) - len(data) % LOG_RECORD.size
+    return ticks_per_ms, list(LOG_RECORD.iter_unpack(data[:usable]))
@@ -0,0 +1,93 @@
+"""
+外部指令录制：把作用于MotorManager的外部指令（目标值/状态/刹车/增删电机）连同时间戳与随机种子写成紧凑二进制日志，
+供无界面确定性回放（MotorSimulation.replay）
+
+文件布局（小端）：
+    文件头 32字节：magic(8s) | 版本(H) | 单条记录字节数(H) | 每毫秒tick数(I) | 是否有种子(B) | 填充(7x) | 种子(Q)
+    之后为连续的定长记录
+定长记录 24字节：tick(q) | 电机编号(I) | 指令码(H) | 填充(2x) | 值(d)
+指令在时间系统到达tick、该tick的步进开始之前生效；最后一条为 MOTOR_CMD_END，tick为录制结束时刻
+"""
+import struct
+
+from .constants import MotorReplayCommand
+
+REPLAY_MAGIC = b"BMLREPL\x00"
+REPLAY_VERSION = 1
+
+REPLAY_HEADER = struct.Struct("<8sHHIB7xQ")
+REPLAY_RECORD = struct.Struct("<qIH2xd")
+
+
+class CommandRecorder:
+    """
+    外部指令录制器：记录写入内存缓冲区，攒满 buffer_records 条后一次写文件
+    约定由执行指令的线程（仿真线程）调用
+    """
+
+    def __init__(self, time_sys, path, seed=None, buffer_records=1024):
+        """
+        :param time_sys: 时间系统实例，记录的时间戳取自 time_sys.get_ticks()
+        :param path: 日志文件路径（覆盖写）
+        :param seed: 传感器随机种子（非负整数），None 表示未设种子（回放结果不可复现）
+        :param buffer_records: 缓冲的记录数
+        """
+        self.time_sys = time_sys
+        self.seed = seed
+        self._buffer = bytearray()
+        self._flush_bytes = buffer_records * REPLAY_RECORD.size
+        self._file = open(path, "wb")
+        self._file.write(REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, REPLAY_RECORD.size,
+                                            time_sys.TICKS_PER_MS, seed is not None, seed or 0))
+
+    def record(self, command, motor_id=0, value=0.0):
+        """
+        记录一条指令（时间戳为当前时刻）
+        :param command: 指令码（MotorReplayCommand）
+        :param motor_id: 电机编号
+        :param value: 指令值
+        """
+        self._buffer += REPLAY_RECORD.pack(self.time_sys.get_ticks(), motor_id, command, value)
+        if len(self._buffer) >= self._flush_bytes:
+            self.flush()
+
+    def flush(self):
+        """把缓冲区写入文件"""
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+        self._file.flush()
+
+    def close(self):
+        """写入结束记录（当前时刻）并关闭文件"""
+        if self._file.closed:
+            return
+        self.record(MotorReplayCommand.MOTOR_CMD_END)
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def read_command_log(path):
+    """
+    读取指令日志
+    :return: (每毫秒tick数, 种子或None, 记录列表)，记录为 (tick, 电机编号, 指令码, 值)
+    :raises ValueError: 文件格式不匹配时抛出异常
+    """
+    with open(path, "rb") as file:
+        header = file.read(REPLAY_HEADER.size)
+        if len(header) != REPLAY_HEADER.size:
+            raise ValueError(f"指令日志文件不完整：{path}")
+        magic, version, record_size, ticks_per_ms, has_seed, seed = REPLAY_HEADER.unpack(header)
+        if magic != REPLAY_MAGIC:
+            raise ValueError(f"不是BaiMotorLib指令日志文件：{path}")
+        if version != REPLAY_VERSION or record_size != REPLAY_RECORD.size:
+            raise ValueError(f"不支持的指令日志版本：{version}（记录长度 {record_size}）")
+        data = file.read()
+    usable = len(data) - len(data) % REPLAY_RECORD.size
+    return ticks_per_ms, seed if has_seed else None, list(REPLAY_RECORD.iter_unpack(data[:usable]))
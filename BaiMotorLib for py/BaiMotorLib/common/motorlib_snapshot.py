@@ -0,0 +1,201 @@
+"""
+仿真状态快照的紧凑二进制编码：各类的 dump_state() 返回由基本类型组成的嵌套结构，
+本模块把它编码为带类型标记的二进制串（不使用pickle，解码时不会执行任何代码），load_state() 负责还原
+
+文件布局（小端）：magic(8s) | 版本(H) | 编码后的值
+值编码：1字节类型标记 + 数据
+    N：None        T/F：布尔      i：int64(q)     I：大整数（长度(I) + 有符号大端字节）
+    d：float(d)    s：str（长度(I) + UTF-8）      b：bytes（长度(I) + 数据）
+    t/l：tuple/list（元素数(I) + 各元素）          a：全为float的list（元素数(I) + 连续double）
+    m：dict（键值对数(I) + 交替的键、值）
+"""
+import random
+import struct
+import sys
+from array import array
+
+SNAPSHOT_MAGIC = b"BMLSNAP\x00"
+SNAPSHOT_VERSION = 1
+
+SNAPSHOT_HEADER = struct.Struct("<8sH")
+_LEN = struct.Struct("<I")
+_INT = struct.Struct("<q")
+_FLOAT = struct.Struct("<d")
+_INT_MIN = -(1 << 63)
+_INT_MAX = (1 << 63) - 1
+_SWAP = sys.byteorder == "big"   # array按本机字节序读写，大端平台需转换为小端
+
+
+def dumps(state):
+    """把状态结构编码为快照字节串"""
+    out = bytearray(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION))
+    _encode(state, out)
+    return bytes(out)
+
+
+def loads(data):
+    """
+    解码快照字节串
+    :raises ValueError: 格式不匹配或数据不完整时抛出异常
+    """
+    if len(data) < SNAPSHOT_HEADER.size:
+        raise ValueError("快照数据不完整")
+    magic, version = SNAPSHOT_HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError("不是BaiMotorLib快照数据")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"不支持的快照版本：{version}")
+    try:
+        value, offset = _decode(memoryview(data), SNAPSHOT_HEADER.size)
+    except (struct.error, IndexError) as exc:
+        raise ValueError("快照数据不完整") from exc
+    except UnicodeDecodeError as exc:
+        raise ValueError("快照数据中的字符串无效") from exc
+    if offset != len(data):
+        raise ValueError("快照数据末尾有多余字节")
+    return value
+
+
+def rng_state(rng):
+    """
+    获取随机源状态
+    :param rng: numpy.random.Generator、random.Random实例或全局random模块
+    :return: ("np", bit_generator.state) / ("py", getstate())；全局random模块为进程共享状态，不保存，返回None
+    """
+    if rng is None or rng is random:
+        return None
+    if hasattr(rng, "bit_generator"):
+        return "np", rng.bit_generator.state
+    return "py", rng.getstate()
+
+
+def restore_rng(rng, state):
+    """
+    恢复rng_state()保存的随机源状态
+    :param rng: 现有随机源，类型相同时原地恢复
+    :param state: rng_state()的返回值，None 表示保持rng不变
+    :return: 恢复后的随机源（类型不同时新建同类随机源，调用方需替换引用）
+    :raises ValueError: 状态无效（类型标记、位生成器名称或状态内容不正确）时抛出异常
+    """
+    if state is None:
+        return rng
+    try:
+        kind, value = state
+        if kind == "np":
+            name = value["bit_generator"]
+            bit_generator = getattr(rng, "bit_generator", None)
+            if bit_generator is None or type(bit_generator).__name__ != name:
+                import numpy as np
+                bit_generator_cls = getattr(np.random, name, None) if isinstance(name, str) else None
+                if not (isinstance(bit_generator_cls, type) and issubclass(bit_generator_cls, np.random.BitGenerator)):
+                    raise ValueError(f"未知的位生成器：{name!r}")
+                rng = np.random.Generator(bit_generator_cls())
+            rng.bit_generator.state = value
+        elif kind == "py":
+            if not isinstance(rng, random.Random):
+                rng = random.Random()
+            rng.setstate(value)
+        else:
+            raise ValueError(f"未知的随机源类型：{kind!r}")
+    except (TypeError, KeyError, IndexError) as exc:
+        raise ValueError("随机源状态无效") from exc
+    return rng
+
+
+def _encode(value, out):
+    if value is None:
+        out += b"N"
+    elif value is True:
+        out += b"T"
+    elif value is False:
+        out += b"F"
+    elif isinstance(value, int):
+        value = int(value)
+        if _INT_MIN <= value <= _INT_MAX:
+            out += b"i"
+            out += _INT.pack(value)
+        else:
+            raw = value.to_bytes((value.bit_length() + 8) // 8, "big", signed=True)
+            out += b"I"
+            out += _LEN.pack(len(raw))
+            out += raw
+    elif isinstance(value, float):
+        out += b"d"
+        out += _FLOAT.pack(value)
+    elif isinstance(value, str):
+        raw = value.encode("utf-8")
+        out += b"s"
+        out += _LEN.pack(len(raw))
+        out += raw
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        raw = bytes(value)
+        out += b"b"
+        out += _LEN.pack(len(raw))
+        out += raw
+    elif isinstance(value, list) and value and all(type(item) is float for item in value):
+        out += b"a"
+        out += _LEN.pack(len(value))
+        values = array("d", value)
+        if _SWAP:
+            values.byteswap()
+        out += values.tobytes()
+    elif isinstance(value, (tuple, list)):
+        out += b"t" if isinstance(value, tuple) else b"l"
+        out += _LEN.pack(len(value))
+        for item in value:
+            _encode(item, out)
+    elif isinstance(value, dict):
+        out += b"m"
+        out += _LEN.pack(len(value))
+        for key, item in value.items():
+            _encode(key, out)
+            _encode(item, out)
+    else:
+        raise ValueError(f"快照不支持的类型：{type(value).__name__}")
+
+
+def _decode(data, offset):
+    tag = data[offset]
+    offset += 1
+    if tag == 0x4E:     # N
+        return None, offset
+    if tag == 0x54:     # T
+        return True, offset
+    if tag == 0x46:     # F
+        return False, offset
+    if tag == 0x69:     # i
+        return _INT.unpack_from(data, offset)[0], offset + _INT.size
+    if tag == 0x64:     # d
+        return _FLOAT.unpack_from(data, offset)[0], offset + _FLOAT.size
+    length = _LEN.unpack_from(data, offset)[0]
+    offset += _LEN.size
+    if tag in (0x49, 0x73, 0x62) and offset + length > len(data):
+        raise IndexError
+    if tag == 0x49:     # I
+        return int.from_bytes(data[offset:offset + length], "big", signed=True), offset + length
+    if tag == 0x73:     # s
+        return str(data[offset:offset + length], "utf-8"), offset + length
+    if tag == 0x62:     # b
+        return bytes(data[offset:offset + length]), offset + length
+    if tag == 0x61:     # a
+        end = offset + 8 * length
+        if end > len(data):
+            raise IndexError
+        values = array("d")
+        values.frombytes(data[offset:end])
+        if _SWAP:
+            values.byteswap()
+        return values.tolist(), end
+    if tag in (0x74, 0x6C):     # t / l
+        items = []
+        for _ in range(length):
+            item, offset = _decode(data, offset)
+            items.append(item)
+        return (tuple(items) if tag == 0x74 else items), offset
+    if tag == 0x6D:     # m
+        result = {}
+        for _ in range(length):
+            key, offset = _decode(data, offset)
+            result[key], offset = _decode(data, offset)
+        return result, offset
+    raise ValueError(f"快照数据中的未知类型标记：{tag:#x}")
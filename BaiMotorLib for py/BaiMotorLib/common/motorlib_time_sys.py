@@ -3,6 +3,8 @@ class MotorlibTimeSys:
     OnceUponATime = 0  # 给定时间 < 当前时间
     NowTheTime = 1  # 给定时间 = 当前时间
     FutureTime = 2  # 给定时间 > 当前时间
+    # 整数tick分辨率：每毫秒对应的tick数（本类以毫秒为tick）
+    TICKS_PER_MS = 1
 
     def __init__(self):
         # 初始化时间成员变量，分别存储毫秒、秒、分、时
@@ -21,7 +23,7 @@ class MotorlibTimeSys:
         :raises ValueError: 传入负数时抛出异常
         """
         # 合法性校验：禁止传入负数
-        if any(x < 0 for x in [ms, sec, min, hour]):
+        if ms < 0 or sec < 0 or min < 0 or hour < 0:
             raise ValueError("累加的时间值不能为负数（ms/sec/min/hour 均需≥0）")
 
         # 步骤1：先累加所有单位的原始值，不处理进位
@@ -59,7 +61,7 @@ class MotorlibTimeSys:
         :return: OnceUponATime(0)/NowTheTime(1)/FutureTime(2)
         """
         # 合法性校验：禁止传入负数
-        if any(x < 0 for x in [ms, sec, min, hour]):
+        if ms < 0 or sec < 0 or min < 0 or hour < 0:
             raise ValueError("比较的时间值不能为负数（ms/sec/min/hour 均需≥0）")
 
         # 按优先级从高到低比较：小时 → 分钟 → 秒 → 毫秒
@@ -99,4 +101,174 @@ class MotorlibTimeSys:
         获取当前完整时间，返回元组格式
         :return: tuple (hour, min, sec, ms)，对应时、分、秒、毫秒
         """
-        return (self.HOUR, self.MIN, self.SEC, self.MS)
\ No newline at end of file
+        return (self.HOUR, self.MIN, self.SEC, self.MS)
+
+    def get_ticks(self):
+        """
+        获取当前时间对应的整数tick计数（自时间零点起累计）
+        :return: int，单位为 1/TICKS_PER_MS 毫秒
+        """
+        return (((self.HOUR * 60 + self.MIN) * 60 + self.SEC) * 1000 + self.MS) * self.TICKS_PER_MS
+
+    def to_ticks(self, ms=0, sec=0, min=0, hour=0):
+        """
+        把 (ms, sec, min, hour) 格式的时间转换为整数tick计数，参数顺序与compare_time一致
+        :return: int，单位为 1/TICKS_PER_MS 毫秒
+        """
+        return (((hour * 60 + min) * 60 + sec) * 1000 + ms) * self.TICKS_PER_MS
+
+    def split_ticks(self, ticks):
+        """
+        把整数tick计数拆分为 (ms, sec, min, hour) 元组（与NextUpdate/compare_time参数同序）
+        不足1毫秒的部分向下取整
+        """
+        total_ms = ticks // self.TICKS_PER_MS
+        total_sec, ms = divmod(total_ms, 1000)
+        total_min, sec = divmod(total_sec, 60)
+        hour, min = divmod(total_min, 60)
+        return (ms, sec, min, hour)
+
+    def compare_ticks(self, ticks):
+        """
+        以整数tick比较给定时间与当前时间
+        :param ticks: 待比较的绝对时间（tick计数）
+        :return: OnceUponATime(0)/NowTheTime(1)/FutureTime(2)
+        """
+        now = self.get_ticks()
+        return (ticks >= now) + (ticks > now)
+
+    def advance_ticks(self, ticks=1):
+        """
+        按整数tick累加时间（本类tick即毫秒），接口与MotorlibMonoTimeSys一致
+        :param ticks: 要累加的tick数（非负整数）
+        """
+        self.tick_inc(ms=ticks)
+
+    def deadline_after(self, ms=0, ticks=0):
+        """
+        计算相对当前时间的绝对截止时间
+        :param ms: 相对毫秒数
+        :param ticks: 额外的相对tick数
+        :return: int，绝对截止时间（tick计数），可直接传给compare_ticks
+        """
+        return self.get_ticks() + ms * self.TICKS_PER_MS + ticks
+
+    def dump_state(self):
+        """
+        导出时间状态（快照用，见 motorlib_snapshot）
+        :return: (TICKS_PER_MS, 当前tick计数)
+        """
+        return (self.TICKS_PER_MS, self.get_ticks())
+
+    def load_state(self, state):
+        """
+        恢复dump_state()导出的时间状态
+        :raises ValueError: tick分辨率与本实例不一致时抛出异常
+        """
+        ticks_per_ms, ticks = state
+        if ticks_per_ms != self.TICKS_PER_MS:
+            raise ValueError(f"快照的tick分辨率（{ticks_per_ms}）与时间系统（{self.TICKS_PER_MS}）不一致")
+        self.MS, self.SEC, self.MIN, self.HOUR = self.split_ticks(ticks)
+
+
+class MotorlibMonoTimeSys(MotorlibTimeSys):
+    """
+    单调整数时间基准：内部只保存一个整数tick计数，tick_inc/compare均为O(1)整数运算
+    MS/SEC/MIN/HOUR 以只读属性提供，get_time/compare_time等原有元组接口保持兼容，
+    因此现有控制器与MotorManager无需修改即可使用
+    """
+
+    def __init__(self, ticks_per_ms=1):
+        """
+        :param ticks_per_ms: 每毫秒的tick数，1 表示毫秒分辨率，1000 表示微秒分辨率
+        :raises ValueError: 分辨率不是正整数时抛出异常
+        """
+        if not isinstance(ticks_per_ms, int) or ticks_per_ms <= 0:
+            raise ValueError("ticks_per_ms 必须为正整数（1=毫秒，1000=微秒）")
+        self.TICKS_PER_MS = ticks_per_ms
+        self.TICK = 0  # 自时间零点起累计的tick数，无上限
+
+    # ---- 兼容视图：由tick计数换算出原有的四个时间字段 ----
+    @property
+    def MS(self):
+        return self.TICK // self.TICKS_PER_MS % 1000
+
+    @property
+    def SEC(self):
+        return self.TICK // (self.TICKS_PER_MS * 1000) % 60
+
+    @property
+    def MIN(self):
+        return self.TICK // (self.TICKS_PER_MS * 60000) % 60
+
+    @property
+    def HOUR(self):
+        return self.TICK // (self.TICKS_PER_MS * 3600000)
+
+    def tick_inc(self, ms=0, sec=0, min=0, hour=0):
+        """
+        时间累加方法（兼容接口），参数含义与MotorlibTimeSys.tick_inc一致
+        :raises ValueError: 传入负数时抛出异常
+        """
+        if ms < 0 or sec < 0 or min < 0 or hour < 0:
+            raise ValueError("累加的时间值不能为负数（ms/sec/min/hour 均需≥0）")
+        self.TICK += (((hour * 60 + min) * 60 + sec) * 1000 + ms) * self.TICKS_PER_MS
+
+    def advance_ticks(self, ticks=1):
+        """
+        快速路径：直接累加整数tick，不做进位与合法性校验
+        :param ticks: 要累加的tick数（非负整数）
+        """
+        self.TICK += ticks
+
+    def compare_time(self, ms, sec, min, hour):
+        """
+        时间比较方法（兼容接口），返回值与MotorlibTimeSys.compare_time一致
+        :raises ValueError: 传入负数时抛出异常
+        """
+        if ms < 0 or sec < 0 or min < 0 or hour < 0:
+            raise ValueError("比较的时间值不能为负数（ms/sec/min/hour 均需≥0）")
+        ticks = (((hour * 60 + min) * 60 + sec) * 1000 + ms) * self.TICKS_PER_MS
+        now = self.TICK
+        return (ticks >= now) + (ticks > now)
+
+    def compare_ticks(self, ticks):
+        """
+        以整数tick比较给定时间与当前时间（无分支整数比较）
+        :return: OnceUponATime(0)/NowTheTime(1)/FutureTime(2)
+        """
+        now = self.TICK
+        return (ticks >= now) + (ticks > now)
+
+    def get_ticks(self):
+        """获取当前tick计数"""
+        return self.TICK
+
+    def deadline_after(self, ms=0, ticks=0):
+        """
+        计算相对当前时间的绝对截止时间
+        :param ms: 相对毫秒数
+        :param ticks: 额外的相对tick数（用于亚毫秒分辨率）
+        :return: int，绝对截止时间（tick计数），可直接传给compare_ticks
+        """
+        return self.TICK + ms * self.TICKS_PER_MS + ticks
+
+    def load_state(self, state):
+        """
+        恢复dump_state()导出的时间状态
+        :raises ValueError: tick分辨率与本实例不一致时抛出异常
+        """
+        ticks_per_ms, ticks = state
+        if ticks_per_ms != self.TICKS_PER_MS:
+            raise ValueError(f"快照的tick分辨率（{ticks_per_ms}）与时间系统（{self.TICKS_PER_MS}）不一致")
+        self.TICK = ticks
+
+    def get_time(self):
+        """
+        获取当前完整时间（兼容视图）
+        :return: tuple (hour, min, sec, ms)，对应时、分、秒、毫秒
+        """
+        total_sec, ms = divmod(self.TICK // self.TICKS_PER_MS, 1000)
+        total_min, sec = divmod(total_sec, 60)
+        hour, min = divmod(total_min, 60)
+        return (hour, min, sec, ms)
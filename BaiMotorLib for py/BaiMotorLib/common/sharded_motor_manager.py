@@ -0,0 +1,270 @@
+"""
+多进程分片电机管理器：把电机按序号均分到多个工作进程，每个进程拥有自己那一片电机与MotorManager，
+所有进程按同一个tick广播步进（各分片步进前校验自身时钟与广播的当前时间一致）；目标值/状态/刹车指令与传感器采样经共享内存数组交换，不经过pickle消息
+
+共享内存布局（均为8字节元素，按列连续存放）：
+    控制块：命令代数(q) | 本轮步进tick数(q) | 停止标志(q) | 本轮开始时的当前时间tick(q)
+    每列N个元素：COLUMNS 依序排列
+每一轮 step()：主进程写控制块 → 起始屏障 → 各分片应用待处理指令并步进 → 写回采样 → 结束屏障
+"""
+import multiprocessing
+from multiprocessing import shared_memory
+
+from .constants import MotorSchedulerMode
+from .motor_manager import MotorManager
+from .motorlib_time_sys import MotorlibMonoTimeSys
+
+# 列名与类型码（d=double，q=int64）
+COLUMNS = (("target", "d"),
+           ("output", "d"),
+           ("speed", "d"),
+           ("position", "d"),
+           ("current", "d"),
+           ("voltage", "d"),
+           ("state", "q"),
+           ("brake_mode", "q"),
+           ("pending", "q"))
+_CONTROL = ("generation", "ticks", "stop", "now")
+
+# 待处理指令位（pending列）
+_CMD_TARGET = 1
+_CMD_STATE = 2
+_CMD_BRAKE = 4
+
+
+def default_motor_factory(index, count, seed=None, update_period_ms=10):
+    """
+    默认的电机构造：虚拟驱动 + 开环控制器 + 虚拟传感器（在工作进程内调用，须为模块级函数以便spawn方式传递）
+    :param index: 电机全局序号
+    :param count: 电机总数
+    :param seed: 传感器噪声种子，各电机的随机源按序号派生，与分片方式无关
+    :return: (电机, 传感器)
+    """
+    from BaiMotorLib.drivers.virtual.pyqt5_motor import VirtualMotor, VirtualMotorDriver
+    from BaiMotorLib.drivers.virtual.pyqt5_sensor import VirtualSensor
+    from BaiMotorLib.controllers.virtual.pyqt5_controller import OpenLoopController
+    import numpy as np
+
+    # 与 make_sensor_rngs(seed, count)[index] 相同的派生（第index个子序列），无需生成全部count个
+    sensor = VirtualSensor(rng=np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(index,)))
+                           if seed is not None else None)
+    driver = VirtualMotorDriver()
+    controller = OpenLoopController(motor_driver=driver)
+    controller.set_update_period(update_period_ms, index % update_period_ms)
+    return VirtualMotor(driver=driver, controller=controller), sensor
+
+
+def _map_columns(buf, count):
+    """把共享内存映射为 (控制块, {列名: memoryview}) """
+    control = buf[:8 * len(_CONTROL)].cast("q")
+    columns = {}
+    offset = 8 * len(_CONTROL)
+    for name, code in COLUMNS:
+        columns[name] = buf[offset:offset + 8 * count].cast(code)
+        offset += 8 * count
+    return control, columns
+
+
+def _shm_size(count):
+    return 8 * len(_CONTROL) + 8 * count * len(COLUMNS)
+
+
+def _shard_main(shm_name, count, start, stop, barrier, factory, factory_kwargs, scheduler):
+    """工作进程入口：构造本分片电机，按屏障节拍循环步进；出错时打破屏障，主进程随即收到BrokenBarrierError"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    control, cols = _map_columns(shm.buf, count)
+    try:
+        time_sys = MotorlibMonoTimeSys()
+        motors = []
+        sensors = []
+        for index in range(start, stop):
+            motor, sensor = factory(index, count, **factory_kwargs)
+            motors.append(motor)
+            sensors.append(sensor)
+        manager = MotorManager(time_sys, *motors, scheduler=scheduler)
+        controllers = [motor.Controller for motor in motors]
+        drivers = [motor.Driver for motor in motors]
+        rows = range(start, stop)
+        _write_back(cols, rows, controllers, drivers, sensors)
+        seen_generation = 0
+        barrier.wait()  # 就绪
+
+        while True:
+            barrier.wait()  # 起始屏障：主进程已写好控制块与指令
+            if control[2]:
+                break
+            if time_sys.get_ticks() != control[3]:
+                # 分片时钟与主进程广播的时间不一致：打破屏障，主进程的step()随即失败
+                raise RuntimeError(f"分片 [{start}, {stop}) 的时间 {time_sys.get_ticks()} tick "
+                                   f"与主进程广播的 {control[3]} tick 不一致")
+            if control[0] != seen_generation:
+                seen_generation = control[0]
+                _apply_commands(cols, rows, controllers)
+            for _ in range(control[1]):
+                time_sys.advance_ticks(1)
+                manager.update_motor()
+                for sensor in sensors:
+                    sensor.update()
+                for controller in controllers:
+                    controller.execute()
+            _write_back(cols, rows, controllers, drivers, sensors)
+            barrier.wait()  # 结束屏障：采样已写回
+    except Exception:
+        barrier.abort()
+        raise
+    finally:
+        # 先释放对共享内存的全部视图，才能关闭
+        control.release()
+        for col in cols.values():
+            col.release()
+        shm.close()
+
+
+def _apply_commands(cols, rows, controllers):
+    """按 刹车 → 状态 → 目标 的顺序应用待处理指令"""
+    pending = cols["pending"]
+    for row, controller in zip(rows, controllers):
+        flags = pending[row]
+        if not flags:
+            continue
+        if flags & _CMD_BRAKE:
+            controller.set_brake_mode(cols["brake_mode"][row])
+        if flags & _CMD_STATE:
+            controller.set_state(cols["state"][row])
+        if flags & _CMD_TARGET:
+            controller.set_target(cols["target"][row])
+        pending[row] = 0
+
+
+def _write_back(cols, rows, controllers, drivers, sensors):
+    """把本分片的控制器状态与传感器采样写入共享内存"""
+    target, output, state, brake = cols["target"], cols["output"], cols["state"], cols["brake_mode"]
+    speed, position, current, voltage = cols["speed"], cols["position"], cols["current"], cols["voltage"]
+    for row, controller, driver, sensor in zip(rows, controllers, drivers, sensors):
+        target[row] = controller.Target
+        state[row] = controller.state
+        brake[row] = controller.BrakeMode
+        output[row] = driver.get_target_speed()
+        speed[row] = sensor.get_raw_speed()
+        position[row] = sensor.get_raw_position()
+        current[row] = sensor.get_raw_current()
+        voltage[row] = sensor.get_voltage()
+
+
+class ShardedMotorManager:
+    """
+    多进程分片电机管理器：
+      - 电机按序号连续分片，第k个进程负责 [k*N/S, (k+1)*N/S) 号电机，各自持有独立的MotorManager
+      - set_target/set_state/set_brake_mode 只写共享内存并置待处理位，在下一次step()的tick边界生效
+      - step(ticks) 广播当前时间与步进tick数并等待全部分片完成（每轮一对屏障），之后采样列即为最新值；
+        分片时钟与广播时间不一致时该分片退出，step()抛出BrokenBarrierError
+    采样列（speed/position/current/voltage/output/target/state/brake_mode）为共享内存上的memoryview，
+    可直接用 numpy.frombuffer 零拷贝包装；调用close()后失效
+    """
+
+    def __init__(self, num_motors, num_shards=None, factory=default_motor_factory, factory_kwargs=None,
+                 scheduler=MotorSchedulerMode.MOTOR_SCHED_HEAP, mp_context=None):
+        """
+        :param num_motors: 电机总数
+        :param num_shards: 分片（进程）数，默认为CPU核数，不超过电机数
+        :param factory: 电机构造函数 factory(序号, 总数, **factory_kwargs) -> (电机, 传感器)，须为模块级函数
+        :param factory_kwargs: 传给factory的额外参数（如 seed、update_period_ms）
+        :param scheduler: 各分片内MotorManager的调度模式
+        :param mp_context: multiprocessing上下文，默认使用平台默认启动方式
+        :raises ValueError: 电机数或分片数非正时抛出异常
+        """
+        if num_motors <= 0:
+            raise ValueError("num_motors 需为正整数")
+        ctx = mp_context or multiprocessing.get_context()
+        num_shards = min(num_shards or ctx.cpu_count() or 1, num_motors)
+        if num_shards <= 0:
+            raise ValueError("num_shards 需为正整数")
+        self.num_motors = num_motors
+        self.num_shards = num_shards
+        self.now_ticks = 0
+        self._shm = shared_memory.SharedMemory(create=True, size=_shm_size(num_motors))
+        self._shm.buf[:_shm_size(num_motors)] = bytes(_shm_size(num_motors))
+        self._control, self._cols = _map_columns(self._shm.buf, num_motors)
+        self._barrier = ctx.Barrier(num_shards + 1)
+        self._workers = []
+        bounds = [num_motors * k // num_shards for k in range(num_shards + 1)]
+        try:
+            for k in range(num_shards):
+                worker = ctx.Process(target=_shard_main, name=f"MotorShard-{k}",
+                                     args=(self._shm.name, num_motors, bounds[k], bounds[k + 1], self._barrier,
+                                           factory, factory_kwargs or {}, scheduler),
+                                     daemon=True)
+                worker.start()
+                self._workers.append(worker)
+            self._barrier.wait()  # 等待全部分片构造完成
+        except BaseException:
+            self.close()
+            raise
+
+    # ---- 指令（下一次step()时生效） ----
+    def set_target(self, target, idx=None):
+        """设置目标转速，idx为None时作用于全部电机"""
+        self._command("target", target, _CMD_TARGET, idx)
+
+    def set_state(self, state, idx=None):
+        """设置控制器运行状态"""
+        self._command("state", state, _CMD_STATE, idx)
+
+    def set_brake_mode(self, brake_mode, idx=None):
+        """设置刹车模式"""
+        self._command("brake_mode", brake_mode, _CMD_BRAKE, idx)
+
+    # ---- 步进 ----
+    def step(self, ticks=1):
+        """
+        全部分片同步推进ticks个tick（1 tick = 1ms）
+        :param ticks: 本轮步进的tick数，增大可减少屏障同步次数
+        :raises threading.BrokenBarrierError: 有分片出错（含时钟与广播时间不一致）时抛出异常
+        """
+        if self._shm is None:
+            raise ValueError("ShardedMotorManager 已关闭")
+        self._control[1] = ticks
+        self._control[3] = self.now_ticks
+        self._barrier.wait()
+        self._barrier.wait()
+        self.now_ticks += ticks
+
+    def column(self, name):
+        """获取共享内存中的一列（memoryview，长度为电机数）"""
+        return self._cols[name]
+
+    def close(self):
+        """通知全部分片退出并释放共享内存"""
+        if self._shm is None:
+            return
+        self._control[2] = 1
+        try:
+            self._barrier.wait(timeout=10)
+        except Exception:
+            pass
+        for worker in self._workers:
+            worker.join(timeout=10)
+            if worker.is_alive():
+                worker.terminate()
+        self._control.release()
+        for col in self._cols.values():
+            col.release()
+        self._cols = {}
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _command(self, column, value, flag, idx):
+        col = self._cols[column]
+        pending = self._cols["pending"]
+        rows = range(self.num_motors) if idx is None else ([idx] if isinstance(idx, int) else idx)
+        for row in rows:
+            col[row] = value
+            pending[row] |= flag
+        self._control[0] += 1
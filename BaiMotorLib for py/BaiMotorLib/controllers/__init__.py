@@ -1,3 +1,5 @@
 
-from . import common
-from . import virtual
+from .._lazy import lazy_package
+
+__all__ = ["common", "virtual"]
+__getattr__, __dir__ = lazy_package(__name__, submodules={name: "." + name for name in __all__})
\ No newline at end of file
@@ -0,0 +1,302 @@
+from BaiMotorLib.controllers.controller import Controller
+from BaiMotorLib.common.constants import ControllerState, MotorBrakeMode, MotorLogEvent, MotorLogLevel
+
+
+class PIDController(Controller):
+    """
+    转速闭环PID控制器（位置式），每 updatePeriodMS 由MotorManager调度一次：
+      - 微分作用于测量值（目标突变不产生微分冲击），并经一阶低通滤波（时间常数 derivativeFilterMS）
+      - 积分按条件积分抗饱和：输出已饱和且误差继续推向饱和方向时停止积分，积分项同时限制在输出范围内
+      - 输出限幅到 [outputMin, outputMax]
+    积分项以 ki 已乘入的形式保存，运行中修改增益不会引起输出跳变
+    """
+    __slots__ = ("MotorDriver", "Sensor", "kp", "ki", "kd", "derivativeFilterMS", "outputMin", "outputMax",
+                 "_integral", "_derivative", "_last_measure", "_output_speed")
+    def __init__(self, kp=1.0, ki=0.0, kd=0.0, motor_driver=None, sensor=None,
+                 output_min=0.0, output_max=None, derivative_filter_ms=0.0, update_period_ms=10):
+        """
+        :param kp: 比例增益
+        :param ki: 积分增益（1/s）
+        :param kd: 微分增益（s）
+        :param motor_driver: 电机驱动，输出经set_target下发
+        :param sensor: 转速反馈传感器（优先读取未量化的get_raw_speed）
+        :param output_min: 输出下限
+        :param output_max: 输出上限，None 表示不限
+        :param derivative_filter_ms: 微分低通滤波时间常数（ms），0 表示不滤波
+        :param update_period_ms: 控制更新周期（ms）
+        :raises ValueError: 输出限幅或周期无效时抛出异常
+        """
+        super().__init__()
+        self.MotorDriver = motor_driver
+        self.Sensor = sensor
+        self.Target = 0.0
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.derivativeFilterMS = derivative_filter_ms
+        self._integral = 0.0         # 积分项（已乘ki）
+        self._derivative = 0.0       # 滤波后的测量值变化率
+        self._last_measure = None    # 上一次测量值，None 表示需要重新初始化微分
+        self._output_speed = 0.0
+        self.outputMin = 0.0
+        self.outputMax = None
+        self.set_output_limits(output_min, output_max)
+        self.set_update_period(update_period_ms)
+
+    def set_target(self, target_speed):
+        """设置控制器目标转速（rpm），非负限制"""
+        self.Target = max(0.0, target_speed)
+        self._log(MotorLogLevel.MOTOR_LOG_DEBUG, MotorLogEvent.MOTOR_EVT_TARGET, self.Target)
+        self._calc_next_update()
+
+    def set_gains(self, kp=None, ki=None, kd=None):
+        """修改PID增益，None 表示保持原值"""
+        if kp is not None:
+            self.kp = kp
+        if ki is not None:
+            self.ki = ki
+        if kd is not None:
+            self.kd = kd
+
+    def set_output_limits(self, output_min, output_max=None):
+        """
+        设置输出限幅
+        :raises ValueError: 下限大于上限时抛出异常
+        """
+        if output_max is not None and output_min > output_max:
+            raise ValueError("输出下限不能大于输出上限")
+        self.outputMin = output_min
+        self.outputMax = output_max
+        self._integral = self._clamp(self._integral)
+
+    def set_brake_mode(self, brake_mode):
+        """设置刹车模式，联动控制器状态（刹车时清空积分）"""
+        if brake_mode in [MotorBrakeMode.MOTOR_BRAKE_NONE,
+                          MotorBrakeMode.MOTOR_BRAKE_SOFTWARE,
+                          MotorBrakeMode.MOTOR_BRAKE_HARDWARE]:
+            self.BrakeMode = brake_mode
+            self._log(MotorLogLevel.MOTOR_LOG_INFO, MotorLogEvent.MOTOR_EVT_BRAKE, brake_mode)
+            if self.BrakeMode != MotorBrakeMode.MOTOR_BRAKE_NONE:
+                self._set_state_logged(ControllerState.CONTROLLER_STATE_BRAKE)
+                self._output_speed = 0.0
+                self.reset()
+            else:
+                self._set_state_logged(ControllerState.CONTROLLER_STATE_RUNNING)
+            self._calc_next_update()
+
+    def set_state(self, state):
+        """设置控制器运行状态，仅支持预定义状态"""
+        valid_states = [ControllerState.CONTROLLER_STATE_IDLE,
+                        ControllerState.CONTROLLER_STATE_RUNNING,
+                        ControllerState.CONTROLLER_STATE_BRAKE,
+                        ControllerState.CONTROLLER_STATE_ERROR]
+        if state in valid_states:
+            self._set_state_logged(state)
+            self._calc_next_update()
+
+    def reset(self):
+        """清空积分与微分状态（无扰重启）"""
+        self._integral = 0.0
+        self._derivative = 0.0
+        self._last_measure = None
+
+    def update(self):
+        """控制器核心更新逻辑：读取反馈，计算PID输出并下发"""
+        if self.state == ControllerState.CONTROLLER_STATE_RUNNING:
+            measure = self.get_input()
+            if measure is not None:
+                self._output_speed = self.step(measure)
+        elif self.state != ControllerState.CONTROLLER_STATE_ERROR:
+            self._output_speed = 0.0  # 刹车/未运行时输出0，错误状态保持原输出
+            self.reset()
+        self.execute()
+        self._calc_next_update()
+
+    def step(self, measure):
+        """
+        以给定测量值计算一次PID输出（不下发、不调度），时间步长为 updatePeriodMS
+        :param measure: 当前测量值
+        :return: 限幅后的输出
+        """
+        dt = self.updatePeriodMS * 0.001
+        error = self.Target - measure
+        # 微分：作用于测量值，一阶低通滤波
+        last = self._last_measure
+        if last is not None:
+            rate = (measure - last) / dt
+            alpha = dt / (self.derivativeFilterMS * 0.001 + dt)
+            self._derivative += alpha * (rate - self._derivative)
+        self._last_measure = measure
+        p_term = self.kp * error
+        d_term = -self.kd * self._derivative
+        # 积分：条件积分抗饱和
+        integral = self._integral + self.ki * error * dt
+        unclamped = p_term + integral + d_term
+        output = self._clamp(unclamped)
+        if output == unclamped or (unclamped > output) != (error > 0):
+            self._integral = self._clamp(integral)
+        return self._clamp(p_term + self._integral + d_term)
+
+    def execute(self):
+        """执行控制输出：将转速指令传递给电机驱动"""
+        if self.MotorDriver is not None:
+            self.MotorDriver.set_target(self._output_speed)
+
+    def get_input(self):
+        """读取传感器转速反馈，未绑定传感器时返回None"""
+        if self.Sensor is None:
+            return None
+        if hasattr(self.Sensor, "get_raw_speed"):
+            return self.Sensor.get_raw_speed()
+        return self.Sensor.get_speed()
+
+    def put_output(self):
+        """返回当前控制器输出转速"""
+        return self._output_speed
+
+    def dump_state(self):
+        """导出控制器状态：基类状态 + 增益、滤波、限幅 + 积分/微分/输出状态"""
+        return (super().dump_state(), self.kp, self.ki, self.kd, self.derivativeFilterMS, self.outputMin,
+                self.outputMax, self._integral, self._derivative, self._last_measure, self._output_speed)
+
+    def load_state(self, state):
+        """恢复dump_state()导出的状态（不经set_output_limits，积分项按快照原值恢复）"""
+        (base, self.kp, self.ki, self.kd, self.derivativeFilterMS, self.outputMin, self.outputMax,
+         self._integral, self._derivative, self._last_measure, self._output_speed) = state
+        super().load_state(base)
+
+    def _clamp(self, value):
+        if value < self.outputMin:
+            return self.outputMin
+        if self.outputMax is not None and value > self.outputMax:
+            return self.outputMax
+        return value
+
+
+class PIDControllerArray:
+    """
+    N轴PID的向量化实现：增益、限幅、积分/微分状态均为长度N的NumPy数组，一次update()计算全部（或指定）轴
+    单轴算法与PIDController.step逐项一致；调度（哪些轴到期）由调用方以idx给出，如批量仿真中的到期掩码
+    """
+
+    def __init__(self, num_axes, kp=1.0, ki=0.0, kd=0.0, output_min=0.0, output_max=float("inf"),
+                 derivative_filter_ms=0.0, update_period_ms=10):
+        """
+        :param num_axes: 轴数量
+        :param kp, ki, kd: 增益，标量或长度为N的数组
+        :param output_min, output_max: 输出限幅，标量或长度为N的数组（无上限用inf）
+        :param derivative_filter_ms: 微分低通滤波时间常数（ms），标量或长度为N的数组
+        :param update_period_ms: 控制更新周期（ms），标量或长度为N的数组
+        :raises ValueError: 输出限幅或周期无效时抛出异常
+        """
+        import numpy as np
+        self._np = np
+        n = int(num_axes)
+        self.num_axes = n
+        full = lambda value: np.broadcast_to(np.asarray(value, dtype=float), (n,)).copy()
+        self.kp = full(kp)
+        self.ki = full(ki)
+        self.kd = full(kd)
+        self.output_min = full(output_min)
+        self.output_max = full(output_max)
+        self.derivative_filter_ms = full(derivative_filter_ms)
+        self.update_period_ms = full(update_period_ms)
+        if (self.output_min > self.output_max).any():
+            raise ValueError("输出下限不能大于输出上限")
+        if (self.update_period_ms <= 0).any():
+            raise ValueError("更新周期必须大于0ms")
+        self.target = np.zeros(n)
+        self.output = np.zeros(n)
+        self.state = np.full(n, ControllerState.CONTROLLER_STATE_IDLE, dtype=np.int8)
+        # 与PIDController一致：积分项初值限制在输出范围内（下限为正时从下限开始）
+        self._integral = np.clip(np.zeros(n), self.output_min, self.output_max)
+        self._derivative = np.zeros(n)
+        self._last_measure = np.zeros(n)
+        self._has_last = np.zeros(n, dtype=bool)
+
+    def set_target(self, target, idx=None):
+        """设置目标值，非负限制"""
+        self.target[self._index(idx)] = self._np.maximum(0.0, target)
+
+    def set_gains(self, kp=None, ki=None, kd=None, idx=None):
+        """修改增益，None 表示保持原值"""
+        idx = self._index(idx)
+        if kp is not None:
+            self.kp[idx] = kp
+        if ki is not None:
+            self.ki[idx] = ki
+        if kd is not None:
+            self.kd[idx] = kd
+
+    def set_state(self, state, idx=None):
+        """设置运行状态，仅支持预定义状态；切换到非运行状态时清空积分/微分"""
+        if state not in (ControllerState.CONTROLLER_STATE_IDLE,
+                         ControllerState.CONTROLLER_STATE_RUNNING,
+                         ControllerState.CONTROLLER_STATE_BRAKE,
+                         ControllerState.CONTROLLER_STATE_ERROR):
+            return
+        idx = self._index(idx)
+        self.state[idx] = state
+        if state in (ControllerState.CONTROLLER_STATE_IDLE, ControllerState.CONTROLLER_STATE_BRAKE):
+            self.output[idx] = 0.0
+            self.reset(idx)
+
+    def reset(self, idx=None):
+        """清空积分与微分状态"""
+        idx = self._index(idx)
+        self._integral[idx] = 0.0
+        self._derivative[idx] = 0.0
+        self._has_last[idx] = False
+
+    def update(self, measure, idx=None):
+        """
+        对指定轴计算一次PID输出，非运行状态的轴输出0（错误状态保持原输出）
+        :param measure: 测量值，长度为N的数组（只读取idx选中的轴）
+        :param idx: 参与本次更新的轴（布尔掩码或下标），None 表示全部
+        :return: 全部轴的输出数组（内部数组，只读使用）
+        """
+        np = self._np
+        if idx is None and (self.state == ControllerState.CONTROLLER_STATE_RUNNING).all():
+            running = slice(None)  # 常见情况：全部轴运行，以切片视图计算，免去花式索引的聚集/散射
+        else:
+            axes = np.arange(self.num_axes)[self._index(idx)]
+            state = self.state[axes]
+            running = axes[state == ControllerState.CONTROLLER_STATE_RUNNING]
+            stopped = axes[(state == ControllerState.CONTROLLER_STATE_IDLE) |
+                           (state == ControllerState.CONTROLLER_STATE_BRAKE)]
+            if stopped.size:
+                self.output[stopped] = 0.0
+                self.reset(stopped)
+            if not running.size:
+                return self.output
+
+        m = np.asarray(measure, dtype=float)[running]
+        dt = self.update_period_ms[running] * 0.001
+        error = self.target[running] - m
+        # 微分：作用于测量值，一阶低通滤波；首次更新的轴不计算微分
+        has_last = self._has_last[running]
+        rate = (m - self._last_measure[running]) / dt
+        alpha = dt / (self.derivative_filter_ms[running] * 0.001 + dt)
+        derivative = self._derivative[running]
+        derivative = np.where(has_last, derivative + alpha * (rate - derivative), derivative)
+        self._derivative[running] = derivative
+        self._last_measure[running] = m
+        self._has_last[running] = True
+
+        low = self.output_min[running]
+        high = self.output_max[running]
+        p_term = self.kp[running] * error
+        d_term = -self.kd[running] * derivative
+        # 积分：条件积分抗饱和
+        integral = self._integral[running] + self.ki[running] * error * dt
+        unclamped = p_term + integral + d_term
+        output = np.clip(unclamped, low, high)
+        accept = (output == unclamped) | ((unclamped > output) != (error > 0))
+        integral = np.where(accept, np.clip(integral, low, high), self._integral[running])
+        self._integral[running] = integral
+        self.output[running] = np.clip(p_term + integral + d_term, low, high)
+        return self.output
+
+    def _index(self, idx):
+        """None 表示全部轴"""
+        return slice(None) if idx is None else idx
@@ -0,0 +1,4 @@
+from ..._lazy import lazy_package
+
+__all__ = ["PIDController", "PIDControllerArray"]
+__getattr__, __dir__ = lazy_package(__name__, attributes=dict.fromkeys(__all__, ".PID"))
\ No newline at end of file
@@ -1,13 +1,30 @@
 # BaiMotorLib/controllers/controller.py
-from BaiMotorLib.common.constants import ControllerState, MotorBrakeMode
+from BaiMotorLib.common.constants import ControllerState, MotorBrakeMode, MotorLogEvent, MotorLogLevel
+from BaiMotorLib.common.motorlib_time_sys import MotorlibTimeSys
+
+# 未绑定时间系统的控制器共用的零点时间基准（从不累加）
+_UNBOUND_TIME_SYS = MotorlibTimeSys()
 
 class Controller:
     """控制器基类：所有控制器的统一父类"""
+    # 固定属性布局（子类同样声明__slots__），大量控制器实例时省去每个对象的__dict__
+    __slots__ = ("Target", "BrakeMode", "state", "TimeSys", "updatePeriodMS", "updatePhaseMS",
+                 "NextUpdate", "NextUpdateTick", "LogSys", "MotorId", "RescheduleHook")
+
     def __init__(self):
         # 统一通过静态类属性引用常量，消除本地常量定义
         self.Target = None          # 控制目标值（如转速、位置）
         self.BrakeMode = MotorBrakeMode.MOTOR_BRAKE_NONE  # 初始无刹车
         self.state = ControllerState.CONTROLLER_STATE_IDLE  # 初始未运行
+        # 调度契约：控制器在 updatePhaseMS + k * updatePeriodMS 时刻更新（k为整数）
+        self.TimeSys = None         # 绑定的时间系统（由MotorManager注入），未绑定时以时间零点计算
+        self.updatePeriodMS = 10    # 更新周期（ms）
+        self.updatePhaseMS = 0      # 更新相位（ms），用于错开多台电机的更新时刻
+        self.NextUpdate = (0, 0, 0, 0)  # 下一次更新时间 (ms, sec, min, hour)，供MotorManager调用
+        self.NextUpdateTick = 0     # 下一次更新时间（时间系统tick计数）
+        self.LogSys = None          # 绑定的日志系统（由MotorManager注入），None 表示不记录
+        self.MotorId = 0            # 日志中的电机编号
+        self.RescheduleHook = None  # 下一次更新时间重新计算后的通知（由堆调度的MotorManager注入）
 
     # 预留抽象方法，子类必须实现
     def set_target(self, target):
@@ -17,4 +34,89 @@ class Controller:
         raise NotImplementedError("子类必须实现update方法")
 
     def execute(self):
-        raise NotImplementedError("子类必须实现execute方法")
\ No newline at end of file
+        raise NotImplementedError("子类必须实现execute方法")
+
+    def bind_time_sys(self, time_sys):
+        """
+        绑定时间系统并按当前时间重新计算下一次更新时间
+        :param time_sys: 时间系统实例（MotorlibTimeSys或MotorlibMonoTimeSys），通常为MotorManager的时间基准
+        """
+        self.TimeSys = time_sys
+        self._calc_next_update()
+
+    def bind_log_sys(self, log_sys, motor_id=0):
+        """
+        绑定日志系统
+        :param log_sys: 日志系统实例（MotorlibLogSys），None 表示不记录
+        :param motor_id: 日志记录中的电机编号
+        """
+        self.LogSys = log_sys
+        self.MotorId = motor_id
+
+    def bind_reschedule_hook(self, hook):
+        """
+        绑定调度通知：每次重新计算下一次更新时间后调用 hook()，堆调度的MotorManager据此把提前的到期时间重新入堆
+        :param hook: 无参可调用对象，None 表示解除
+        """
+        self.RescheduleHook = hook
+
+    def set_update_period(self, period_ms, phase_ms=0):
+        """
+        设置更新周期与相位
+        :param period_ms: 更新周期（ms），正整数
+        :param phase_ms: 更新相位（ms），0 ~ period_ms-1
+        :raises ValueError: 周期非正或相位越界时抛出异常
+        """
+        if period_ms <= 0:
+            raise ValueError("更新周期必须大于0ms")
+        if not 0 <= phase_ms < period_ms:
+            raise ValueError("更新相位需满足 0 ≤ phase_ms < period_ms")
+        self.updatePeriodMS = period_ms
+        self.updatePhaseMS = phase_ms
+        self._calc_next_update()
+
+    def dump_state(self):
+        """
+        导出控制器状态（快照用，见 motorlib_snapshot），子类在其后追加自身状态
+        :return: (Target, BrakeMode, state, updatePeriodMS, updatePhaseMS, NextUpdateTick)
+        """
+        return (self.Target, self.BrakeMode, self.state, self.updatePeriodMS, self.updatePhaseMS,
+                self.NextUpdateTick)
+
+    def load_state(self, state):
+        """
+        恢复dump_state()导出的状态：下一次更新时间直接取快照值（不按当前时间重新计算），
+        因此须在时间系统恢复之后、以相同分辨率的时间系统调用
+        """
+        (self.Target, self.BrakeMode, self.state, self.updatePeriodMS, self.updatePhaseMS,
+         self.NextUpdateTick) = state
+        time_sys = self.TimeSys if self.TimeSys is not None else _UNBOUND_TIME_SYS
+        self.NextUpdate = time_sys.split_ticks(self.NextUpdateTick)
+
+    def _calc_next_update(self):
+        """
+        按调度契约计算下一次更新时间：取严格晚于当前时间的第一个 phase + k * period 时刻
+        以网格对齐而非“当前时间+周期”计算，更新延迟时不会产生累计漂移
+        """
+        # 未绑定时间系统时以时间零点为当前时间
+        time_sys = self.TimeSys if self.TimeSys is not None else _UNBOUND_TIME_SYS
+        ticks_per_ms = time_sys.TICKS_PER_MS
+        now = time_sys.get_ticks()
+        period = self.updatePeriodMS * ticks_per_ms
+        phase = self.updatePhaseMS * ticks_per_ms
+        self.NextUpdateTick = now + period - (now - phase) % period
+        self.NextUpdate = time_sys.split_ticks(self.NextUpdateTick)
+        if self.RescheduleHook is not None:
+            self.RescheduleHook()
+
+    def _log(self, level, event, value0=0.0, value1=0.0):
+        """未绑定日志系统或等级不足时只做一次判断即返回"""
+        log_sys = self.LogSys
+        if log_sys is not None and level >= log_sys.level:
+            log_sys.log(level, event, self.MotorId, value0, value1)
+
+    def _set_state_logged(self, state):
+        """切换控制器状态，状态变化时记录日志"""
+        if state != self.state:
+            self._log(MotorLogLevel.MOTOR_LOG_INFO, MotorLogEvent.MOTOR_EVT_STATE, self.state, state)
+        self.state = state
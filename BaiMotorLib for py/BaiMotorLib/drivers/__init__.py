@@ -1,4 +1,6 @@
 
+from .._lazy import lazy_package
 from .driver import Driver
 
-from . import virtual
\ No newline at end of file
+__all__ = ["Driver", "virtual"]
+__getattr__, __dir__ = lazy_package(__name__, submodules={"virtual": ".virtual"})
\ No newline at end of file
@@ -1,5 +1,6 @@
 
 class MotorDriver:
+    __slots__ = ()
     MOTOR_DIR_FORWARD = 0
     MOTOR_DIR_BACKWARD = 1
 
@@ -13,6 +14,8 @@ class MotorDriver:
         pass
 
 class SensorDriver:
+    __slots__ = ()
+
     def __init__(self):
         pass
     def update(self):
@@ -27,6 +30,7 @@ class SensorDriver:
         pass
 
 class Driver:
+    __slots__ = ("MotorDriver", "SensorDriver")
 
     def __init__(self, motor_driver, sensor_driver):
         self.MotorDriver = MotorDriver
@@ -1,2 +1,15 @@
-from .pyqt5_motor import *
-from .pyqt5_sensor import *
\ No newline at end of file
+from ..._lazy import lazy_package
+
+__all__ = ["VirtualMotor", "VirtualMotorDriver",
+           "VirtualSensor", "VirtualSensorArray", "make_sensor_rngs",
+           "DCMotorPlant", "DCMotorPlantArray", "discretize_dc_motor"]
+__getattr__, __dir__ = lazy_package(__name__, attributes={
+    "VirtualMotor": ".pyqt5_motor",
+    "VirtualMotorDriver": ".pyqt5_motor",
+    "VirtualSensor": ".pyqt5_sensor",
+    "VirtualSensorArray": ".pyqt5_sensor",
+    "make_sensor_rngs": ".pyqt5_sensor",
+    "DCMotorPlant": ".dc_motor_plant",
+    "DCMotorPlantArray": ".dc_motor_plant",
+    "discretize_dc_motor": ".dc_motor_plant",
+})
\ No newline at end of file
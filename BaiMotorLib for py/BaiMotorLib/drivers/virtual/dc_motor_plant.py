@@ -0,0 +1,283 @@
+import math
+
+from BaiMotorLib.common.constants import MotorPlantIntegrator
+
+
+def discretize_dc_motor(resistance, inductance, back_emf, torque_const, inertia, damping, dt_s,
+                        integrator=MotorPlantIntegrator.MOTOR_PLANT_EXACT, substeps=1):
+    """
+    把直流电机线性模型离散化为 x[k+1] = Ad·x[k] + Bd·u[k]（输入在步长内保持不变）
+    状态 x = (电流i, 角速度ω, 角度θ)，输入 u = (端电压V, 负载转矩T)：
+        L·di/dt = V - R·i - Ke·ω
+        J·dω/dt = Kt·i - B·ω - T
+        dθ/dt   = ω
+    三种方式都以增广矩阵 M = [[A, Bu], [0, 0]]·h 的指数 exp(M) = [[Ad, Bd], [0, I]] 表示：
+    欧拉取exp的1阶泰勒展开，RK4（线性定常系统）恰为4阶展开，精确离散化取完整矩阵指数；
+    substeps>1 时以 h = dt/substeps 离散化后自乘substeps次
+    :param dt_s: 步长（s）
+    :param integrator: 离散化方式（MotorPlantIntegrator）
+    :param substeps: 每步内的子步数（欧拉/RK4在步长接近电气时间常数时需增大）
+    :return: (Ad, Bd)，分别为3×3与3×2的嵌套元组
+    :raises ValueError: 参数非法时抛出异常
+    """
+    if resistance < 0 or inductance <= 0 or inertia <= 0 or damping < 0:
+        raise ValueError("需满足 R ≥ 0、L > 0、J > 0、B ≥ 0")
+    if dt_s <= 0 or substeps < 1:
+        raise ValueError("dt 需大于0，substeps 至少为1")
+    h = dt_s / substeps
+    m = [[-resistance / inductance, -back_emf / inductance, 0.0, 1.0 / inductance, 0.0],
+         [torque_const / inertia, -damping / inertia, 0.0, 0.0, -1.0 / inertia],
+         [0.0, 1.0, 0.0, 0.0, 0.0],
+         [0.0, 0.0, 0.0, 0.0, 0.0],
+         [0.0, 0.0, 0.0, 0.0, 0.0]]
+    m = [[v * h for v in row] for row in m]
+    if integrator == MotorPlantIntegrator.MOTOR_PLANT_EULER:
+        e = _taylor_exp(m, 1)
+    elif integrator == MotorPlantIntegrator.MOTOR_PLANT_RK4:
+        e = _taylor_exp(m, 4)
+    elif integrator == MotorPlantIntegrator.MOTOR_PLANT_EXACT:
+        e = _expm(m)
+    else:
+        raise ValueError(f"未知的离散化方式：{integrator}")
+    e = _mat_pow(e, substeps)
+    return tuple(tuple(row[:3]) for row in e[:3]), tuple(tuple(row[3:]) for row in e[:3])
+
+
+def _mat_mul(a, b):
+    return [[sum(a[i][k] * b[k][j] for k in range(len(b))) for j in range(len(b[0]))] for i in range(len(a))]
+
+
+def _mat_pow(a, n):
+    result = None
+    while n:
+        if n & 1:
+            result = a if result is None else _mat_mul(result, a)
+        n >>= 1
+        if n:
+            a = _mat_mul(a, a)
+    return result
+
+
+def _taylor_exp(m, order):
+    """exp(m) 的order阶泰勒展开（Horner形式）"""
+    size = len(m)
+    result = [[float(i == j) for j in range(size)] for i in range(size)]
+    for k in range(order, 0, -1):
+        result = _mat_mul(m, result)
+        result = [[v / k + (i == j) for j, v in enumerate(row)] for i, row in enumerate(result)]
+    return result
+
+
+def _expm(m):
+    """矩阵指数：缩放到范数不超过0.5后做16阶泰勒展开，再平方还原（纯Python，只在构造时调用一次）"""
+    norm = max(sum(abs(v) for v in row) for row in m)
+    squarings = max(0, math.ceil(math.log2(norm / 0.5))) if norm > 0.5 else 0
+    scale = 2.0 ** -squarings
+    e = _taylor_exp([[v * scale for v in row] for row in m], 16)
+    for _ in range(squarings):
+        e = _mat_mul(e, e)
+    return e
+
+
+class DCMotorPlant:
+    """
+    直流电机被控对象（电气+机械常微分方程，参数见 discretize_dc_motor）
+    离散化矩阵在构造/改参时预先计算，每步只做十余次乘加；
+    驱动（VirtualMotorDriver）写入端电压，传感器（VirtualSensor）推进并读取状态
+    """
+    __slots__ = ("resistance", "inductance", "back_emf", "torque_const", "inertia", "damping",
+                 "dt_ms", "integrator", "substeps", "voltage_limit",
+                 "current", "omega", "theta", "voltage", "load_torque", "_coeffs")
+
+    def __init__(self, resistance=1.0, inductance=1e-3, back_emf=0.05, torque_const=0.05, inertia=2e-5,
+                 damping=1e-5, load_torque=0.0, dt_ms=1, integrator=MotorPlantIntegrator.MOTOR_PLANT_EXACT,
+                 substeps=1, voltage_limit=24.0):
+        """
+        :param resistance: 电枢电阻R（Ω）
+        :param inductance: 电枢电感L（H）
+        :param back_emf: 反电动势常数Ke（V·s/rad）
+        :param torque_const: 转矩常数Kt（N·m/A）
+        :param inertia: 转动惯量J（kg·m²）
+        :param damping: 粘滞摩擦系数B（N·m·s/rad）
+        :param load_torque: 负载转矩（N·m）
+        :param dt_ms: 每步时长（ms），与传感器update()周期一致
+        :param integrator: 离散化方式（MotorPlantIntegrator）
+        :param substeps: 欧拉/RK4每步内的子步数
+        :param voltage_limit: 端电压限幅（V），指令电压限制在 ±voltage_limit
+        """
+        self.resistance = resistance
+        self.inductance = inductance
+        self.back_emf = back_emf
+        self.torque_const = torque_const
+        self.inertia = inertia
+        self.damping = damping
+        self.dt_ms = dt_ms
+        self.integrator = integrator
+        self.substeps = substeps
+        self.voltage_limit = voltage_limit
+        self.current = 0.0      # 电流 (A)
+        self.omega = 0.0        # 角速度 (rad/s)
+        self.theta = 0.0        # 角度 (rad)
+        self.voltage = 0.0      # 端电压 (V)
+        self.load_torque = load_torque
+        self._coeffs = None
+        self.rediscretize()
+
+    def rediscretize(self):
+        """修改电机参数、步长或离散化方式后重新计算离散化矩阵"""
+        ad, bd = discretize_dc_motor(self.resistance, self.inductance, self.back_emf, self.torque_const,
+                                     self.inertia, self.damping, self.dt_ms * 0.001, self.integrator,
+                                     self.substeps)
+        # θ列恒为单位列，不参与运算
+        self._coeffs = (ad[0][0], ad[0][1], bd[0][0], bd[0][1],
+                        ad[1][0], ad[1][1], bd[1][0], bd[1][1],
+                        ad[2][0], ad[2][1], bd[2][0], bd[2][1])
+
+    def set_voltage(self, voltage):
+        """设置端电压（V），限制在 ±voltage_limit"""
+        self.voltage = max(-self.voltage_limit, min(voltage, self.voltage_limit))
+
+    def command_speed(self, speed_rpm):
+        """按空载稳态关系 V = ω·(Ke + R·B/Kt) 把目标转速（rpm）换算为端电压（开环前馈，带载时转速下垂）"""
+        omega = speed_rpm * (2 * math.pi) / 60
+        self.set_voltage(omega * (self.back_emf + self.resistance * self.damping / self.torque_const))
+
+    def set_load_torque(self, torque):
+        """设置负载转矩（N·m）"""
+        self.load_torque = torque
+
+    def step(self):
+        """推进一步（dt_ms）"""
+        a00, a01, b00, b01, a10, a11, b10, b11, a20, a21, b20, b21 = self._coeffs
+        i, w, v, t = self.current, self.omega, self.voltage, self.load_torque
+        self.current = a00 * i + a01 * w + b00 * v + b01 * t
+        self.omega = a10 * i + a11 * w + b10 * v + b11 * t
+        self.theta += a20 * i + a21 * w + b20 * v + b21 * t
+
+    def get_speed_rpm(self):
+        """获取转速（rpm）"""
+        return self.omega * 60 / (2 * math.pi)
+
+    def dump_state(self):
+        """导出被控对象的参数与状态（快照用，离散化系数不导出，恢复时按参数重新计算）"""
+        return (self.resistance, self.inductance, self.back_emf, self.torque_const, self.inertia, self.damping,
+                self.dt_ms, self.integrator, self.substeps, self.voltage_limit,
+                self.current, self.omega, self.theta, self.voltage, self.load_torque)
+
+    def load_state(self, state):
+        """恢复dump_state()导出的参数与状态，参数有变化时重新离散化"""
+        params = tuple(state[:9])
+        if params != (self.resistance, self.inductance, self.back_emf, self.torque_const, self.inertia,
+                      self.damping, self.dt_ms, self.integrator, self.substeps):
+            (self.resistance, self.inductance, self.back_emf, self.torque_const, self.inertia, self.damping,
+             self.dt_ms, self.integrator, self.substeps) = params
+            self.rediscretize()
+        self.voltage_limit, self.current, self.omega, self.theta, self.voltage, self.load_torque = state[9:]
+
+    def reset(self):
+        """清零状态（电流、转速、角度、端电压）"""
+        self.current = 0.0
+        self.omega = 0.0
+        self.theta = 0.0
+        self.voltage = 0.0
+
+
+class DCMotorPlantArray:
+    """
+    N台直流电机被控对象的向量化实现：状态与离散化系数均为长度N的NumPy数组（参数相同时系数为标量），
+    一次step()对全部电机做同样的十余次乘加，运算顺序与DCMotorPlant逐项一致，
+    因此第i台与以相同参数构造的DCMotorPlant结果逐位一致
+    """
+
+    def __init__(self, num_motors, resistance=1.0, inductance=1e-3, back_emf=0.05, torque_const=0.05,
+                 inertia=2e-5, damping=1e-5, load_torque=0.0, dt_ms=1,
+                 integrator=MotorPlantIntegrator.MOTOR_PLANT_EXACT, substeps=1, voltage_limit=24.0):
+        """
+        :param num_motors: 电机数量
+        其余参数同DCMotorPlant，电机参数、负载转矩与电压限幅可为标量或长度为N的数组
+        """
+        import numpy as np
+        self._np = np
+        n = int(num_motors)
+        self.num_motors = n
+        self.dt_ms = dt_ms
+        self.integrator = integrator
+        self.substeps = substeps
+
+        def column(value):
+            return np.broadcast_to(np.asarray(value, dtype=float), (n,)).copy()
+
+        self.resistance = column(resistance)
+        self.inductance = column(inductance)
+        self.back_emf = column(back_emf)
+        self.torque_const = column(torque_const)
+        self.inertia = column(inertia)
+        self.damping = column(damping)
+        self.voltage_limit = column(voltage_limit)
+        self.load_torque = column(load_torque)
+        self.current = np.zeros(n)
+        self.omega = np.zeros(n)
+        self.theta = np.zeros(n)
+        self.voltage = np.zeros(n)
+        self._coeffs = None
+        self.rediscretize()
+
+    def rediscretize(self):
+        """修改参数后重新计算离散化系数（参数相同的电机共用一次计算）"""
+        np = self._np
+        params = np.stack((self.resistance, self.inductance, self.back_emf, self.torque_const,
+                           self.inertia, self.damping), axis=1)
+        unique, inverse = np.unique(params, axis=0, return_inverse=True)
+        table = np.empty((len(unique), 12))
+        for row, values in enumerate(unique.tolist()):
+            ad, bd = discretize_dc_motor(*values, self.dt_ms * 0.001, self.integrator, self.substeps)
+            table[row] = (ad[0][0], ad[0][1], bd[0][0], bd[0][1],
+                          ad[1][0], ad[1][1], bd[1][0], bd[1][1],
+                          ad[2][0], ad[2][1], bd[2][0], bd[2][1])
+        if len(unique) == 1:
+            self._coeffs = tuple(table[0].tolist())
+        else:
+            coeffs = table[inverse.reshape(-1)]
+            self._coeffs = tuple(coeffs[:, k].copy() for k in range(12))
+
+    def set_voltage(self, voltage, idx=None):
+        """设置端电压（V），限制在 ±voltage_limit，idx为None时作用于全部电机"""
+        idx = slice(None) if idx is None else idx
+        limit = self.voltage_limit[idx]
+        self.voltage[idx] = self._np.maximum(-limit, self._np.minimum(voltage, limit))
+
+    def command_speed(self, speed_rpm, idx=None):
+        """按空载稳态关系把目标转速（rpm）换算为端电压，运算顺序与DCMotorPlant.command_speed一致"""
+        idx = slice(None) if idx is None else idx
+        omega = self._np.asarray(speed_rpm, dtype=float) * (2 * math.pi) / 60
+        self.set_voltage(omega * (self.back_emf[idx] + self.resistance[idx] * self.damping[idx]
+                                  / self.torque_const[idx]), idx)
+
+    def set_load_torque(self, torque, idx=None):
+        """设置负载转矩（N·m）"""
+        self.load_torque[slice(None) if idx is None else idx] = torque
+
+    def step(self):
+        """全部电机推进一步（dt_ms）"""
+        a00, a01, b00, b01, a10, a11, b10, b11, a20, a21, b20, b21 = self._coeffs
+        i, w, v, t = self.current, self.omega, self.voltage, self.load_torque
+        current = a00 * i + a01 * w + b00 * v + b01 * t
+        omega = a10 * i + a11 * w + b10 * v + b11 * t
+        self.theta += a20 * i + a21 * w + b20 * v + b21 * t
+        self.current[:] = current
+        self.omega[:] = omega
+
+    def get_speed_rpm(self):
+        """获取全部转速（rpm，新数组）"""
+        return self.omega * 60 / (2 * math.pi)
+
+    def reset(self, idx=None):
+        """清零状态"""
+        idx = slice(None) if idx is None else idx
+        self.current[idx] = 0.0
+        self.omega[idx] = 0.0
+        self.theta[idx] = 0.0
+        self.voltage[idx] = 0.0
+
+    def __len__(self):
+        return self.num_motors
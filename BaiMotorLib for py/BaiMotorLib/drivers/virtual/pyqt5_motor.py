@@ -3,8 +3,14 @@ from BaiMotorLib.drivers.driver import MotorDriver
 from BaiMotorLib.common.constants import MotorDirection, MotorBrakeMode
 
 class VirtualMotorDriver(MotorDriver):
-    def __init__(self):
+    __slots__ = ("_target_speed", "_direction", "_brake_mode", "_plant")
+
+    def __init__(self, plant=None):
+        """
+        :param plant: 被控对象（DCMotorPlant），给出时目标转速按开环前馈换算为端电压写入，None 表示只记录目标转速
+        """
         super().__init__()
+        self._plant = plant
         self._target_speed = 0.0    # 目标转速（rpm）
         self._direction = MotorDirection.MOTOR_DIR_FORWARD  # 默认正转
         self._brake_mode = MotorBrakeMode.MOTOR_BRAKE_NONE  # 默认无刹车
@@ -12,11 +18,15 @@ class VirtualMotorDriver(MotorDriver):
     def set_target(self, speed):
         """设置目标转速，非负限制"""
         self._target_speed = max(0.0, speed)
+        if self._plant is not None:
+            self._apply_plant()
 
     def set_direction(self, direction):
         """设置电机转向，仅支持预定义正/反转"""
         if direction in [MotorDirection.MOTOR_DIR_FORWARD, MotorDirection.MOTOR_DIR_BACKWARD]:
             self._direction = direction
+            if self._plant is not None:
+                self._apply_plant()
 
     def brake(self, mode):
         """设置刹车模式，刹车时强制目标转速为0"""
@@ -26,15 +36,32 @@ class VirtualMotorDriver(MotorDriver):
             self._brake_mode = mode
             if self._brake_mode != MotorBrakeMode.MOTOR_BRAKE_NONE:
                 self._target_speed = 0.0
+                if self._plant is not None:
+                    self._apply_plant()
+
+    def _apply_plant(self):
+        """按转向把目标转速写入被控对象（端电压为0即电枢短接，相当于能耗制动）"""
+        speed = self._target_speed if self._direction == MotorDirection.MOTOR_DIR_FORWARD else -self._target_speed
+        self._plant.command_speed(speed)
+
+    def dump_state(self):
+        """导出驱动状态（快照用）：(目标转速, 转向, 刹车模式)，共用的被控对象随传感器导出"""
+        return (self._target_speed, self._direction, self._brake_mode)
+
+    def load_state(self, state):
+        """恢复dump_state()导出的状态（不向被控对象重新下发，端电压随被控对象状态一同恢复）"""
+        self._target_speed, self._direction, self._brake_mode = state
 
     # 新增：获取当前目标转速（供传感器/界面读取）
     def get_target_speed(self):
         return self._target_speed
 
 class VirtualMotor(Motor):
-    def __init__(self, driver=None, controller=None):
-        # 未传入驱动时，默认初始化虚拟电机驱动
+    __slots__ = ()
+
+    def __init__(self, driver=None, controller=None, plant=None):
+        # 未传入驱动时，默认初始化虚拟电机驱动（可带被控对象）
         if driver is None:
-            driver = VirtualMotorDriver()
+            driver = VirtualMotorDriver(plant=plant)
         # 严格按父类参数要求：driver和controller为必传（适配大写属性）
         super().__init__(driver, controller)
\ No newline at end of file
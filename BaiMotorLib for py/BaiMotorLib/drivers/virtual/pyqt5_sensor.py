@@ -1,9 +1,42 @@
 from BaiMotorLib.drivers.driver import SensorDriver
+from BaiMotorLib.common.motorlib_snapshot import restore_rng, rng_state
+import math
 import random
 
+
+def make_sensor_rngs(seed, count):
+    """
+    为count个传感器派生互相独立的numpy随机源（SeedSequence.spawn），派生方式与VirtualSensorArray一致：
+    VirtualSensor(rng=make_sensor_rngs(seed, n)[i]) 与 VirtualSensorArray(n, seed=seed) 第i路的读数逐位一致
+    :param seed: 随机种子，None 表示不可复现
+    :param count: 传感器数量
+    :return: numpy.random.Generator 列表
+    """
+    import numpy as np
+    return [np.random.default_rng(child) for child in np.random.SeedSequence(seed).spawn(count)]
+
+
 class VirtualSensor(SensorDriver):
-    def __init__(self, *args, **kwargs):
+    __slots__ = ("_rng", "_dt_ms", "_noise_block", "_noise_buf", "_noise_pos",
+                 "_speed", "_position", "_current", "_voltage", "_noise", "_plant")
+
+    def __init__(self, *args, rng=None, dt_ms=1, noise_block=256, plant=None, **kwargs):
+        """
+        :param rng: 噪声随机源，默认使用全局random模块；
+                    传入random.Random实例时逐次取样，传入numpy.random.Generator时按块预生成噪声；
+                    传入已设种子的实例可使仿真结果可复现
+        :param dt_ms: 每次update()对应的时间步长（ms），用于位置积分
+        :param noise_block: 使用numpy随机源时每次预生成的噪声步数
+        :param plant: 被控对象（DCMotorPlant），给出时每次update()推进一步被控对象，
+                      读数为其转速/角度/电流叠加噪声，电压为端电压；None 表示噪声随机游走
+        """
         super().__init__(*args, **kwargs)
+        self._plant = plant
+        self._rng = rng if rng is not None else random
+        self._dt_ms = dt_ms
+        self._noise_block = noise_block
+        self._noise_buf = []    # 预生成的噪声，转速/电流样本交替排列的扁平列表（仅numpy随机源）
+        self._noise_pos = 0
         # 初始化虚拟传感器参数
         self._speed = 0.0       # 转速 (rpm)
         self._position = 0.0    # 位置 (rad)
@@ -13,15 +46,120 @@ class VirtualSensor(SensorDriver):
 
     def update(self):
         """更新传感器数据，模拟真实传感器的数值变化（带微小噪声）"""
-        # 模拟转速小幅波动
-        self._speed += random.uniform(-self._noise, self._noise)
+        if self._plant is not None:
+            self._update_plant()
+            return
+        u_speed, u_current = self._next_noise()
+        # 模拟转速小幅波动（与 uniform(-noise, noise) 相同的运算）
+        self._speed += -self._noise + (self._noise - -self._noise) * u_speed
         self._speed = max(0.0, self._speed)  # 转速非负
         # 模拟位置随转速累加（简单积分）
-        self._position += (self._speed / 60) * (2 * 3.14159) * 0.001  # 按毫秒级更新
+        self._position += (self._speed / 60) * (2 * math.pi) * (self._dt_ms * 0.001)
         # 模拟电流小幅波动
-        self._current += random.uniform(-self._noise * 0.1, self._noise * 0.1)
+        current_low = -self._noise * 0.1
+        self._current += current_low + (self._noise * 0.1 - current_low) * u_current
         self._current = max(0.0, min(self._current, 5.0))  # 电流限制在0~5A
 
+    def advance(self, steps):
+        """
+        连续推进steps步，结果与调用steps次update()逐位一致（消耗相同的噪声样本）
+        噪声系数为0时各量不再变化，位置按闭式一次累加
+        :param steps: 步数（非负整数）
+        """
+        if steps <= 0:
+            return
+        if self._plant is not None:
+            for _ in range(steps):
+                self._update_plant()
+            return
+        noise = self._noise
+        if noise == 0:
+            self._speed = max(0.0, self._speed)
+            self._current = max(0.0, min(self._current, 5.0))
+            self._position += steps * ((self._speed / 60) * (2 * math.pi) * (self._dt_ms * 0.001))
+            return
+        speed, position, current = self._speed, self._position, self._current
+        dt_s = self._dt_ms * 0.001
+        speed_span = noise - -noise
+        current_low = -noise * 0.1
+        current_span = noise * 0.1 - current_low
+        # 条件赋值与 max(0.0, x) / min(x, 5.0) 结果逐位相同，省去内置函数调用
+        for u_speed, u_current in self._noise_pairs(steps):
+            speed += -noise + speed_span * u_speed
+            if not speed > 0.0:
+                speed = 0.0
+            position += (speed / 60) * (2 * math.pi) * dt_s
+            current += current_low + current_span * u_current
+            if current > 5.0:
+                current = 5.0
+            if not current > 0.0:
+                current = 0.0
+        self._speed, self._position, self._current = speed, position, current
+
+    def _update_plant(self):
+        """推进被控对象一步并采样：转速/电流叠加与随机游走相同幅度的均匀噪声，角度与电压取真值"""
+        plant = self._plant
+        plant.step()
+        u_speed, u_current = self._next_noise()
+        self._speed = plant.get_speed_rpm() + (-self._noise + (self._noise - -self._noise) * u_speed)
+        self._position = plant.theta
+        current_low = -self._noise * 0.1
+        self._current = plant.current + (current_low + (self._noise * 0.1 - current_low) * u_current)
+        self._voltage = plant.voltage
+
+    def _noise_pairs(self, steps):
+        """依次产出steps步的噪声样本对，消耗顺序与逐次_next_noise()相同"""
+        if not hasattr(self._rng, "bit_generator"):
+            for _ in range(steps):
+                yield self._rng.random(), self._rng.random()
+            return
+        while steps:
+            pos = self._noise_pos
+            if pos == len(self._noise_buf):
+                self._noise_buf = self._rng.random(2 * self._noise_block).tolist()
+                pos = 0
+            n = min(steps, (len(self._noise_buf) - pos) // 2)
+            self._noise_pos = pos + 2 * n
+            steps -= n
+            buf = self._noise_buf
+            yield from zip(buf[pos:pos + 2 * n:2], buf[pos + 1:pos + 2 * n:2])
+
+    def _next_noise(self):
+        """取一步的两个[0, 1)均匀样本：numpy随机源从预生成块中读取，块用尽时整块补充"""
+        if not hasattr(self._rng, "bit_generator"):
+            return self._rng.random(), self._rng.random()
+        pos = self._noise_pos
+        if pos == len(self._noise_buf):
+            self._noise_buf = self._rng.random(2 * self._noise_block).tolist()
+            pos = 0
+        self._noise_pos = pos + 2
+        return self._noise_buf[pos], self._noise_buf[pos + 1]
+
+    def dump_state(self):
+        """
+        导出传感器状态（快照用）：读数、噪声系数、步长、尚未消耗的预生成噪声、随机源状态，
+        以及被控对象的参数与状态（由本传感器推进，驱动共用同一对象）；全局random模块的状态不保存（见 rng_state）
+        """
+        return (self._speed, self._position, self._current, self._voltage, self._noise, self._dt_ms,
+                self._noise_buf[self._noise_pos:], rng_state(self._rng),
+                self._plant.dump_state() if self._plant is not None else None)
+
+    def load_state(self, state):
+        """
+        恢复dump_state()导出的状态，恢复后的噪声序列与导出时刻之后逐位一致
+        :raises ValueError: 快照与本传感器的被控对象有无不一致时抛出异常
+        """
+        (speed, position, current, voltage, noise, dt_ms, noise_buf, rng, plant) = state
+        if (plant is None) != (self._plant is None):
+            raise ValueError("快照与传感器的被控对象设置不一致")
+        self._speed, self._position, self._current, self._voltage = speed, position, current, voltage
+        self._noise, self._dt_ms = noise, dt_ms
+        self._noise_buf = list(noise_buf)
+        self._noise_pos = 0
+        self._rng = restore_rng(self._rng, rng)
+        if plant is not None:
+            self._plant.load_state(plant)
+
     def get_speed(self):
         """获取当前转速"""
         return round(self._speed, 2)
@@ -36,4 +174,114 @@ class VirtualSensor(SensorDriver):
 
     def get_voltage(self):
         """获取当前电压（虚拟电压固定）"""
-        return self._voltage
\ No newline at end of file
+        return self._voltage
+
+    def get_raw_speed(self):
+        """获取当前转速（未量化）"""
+        return self._speed
+
+    def get_raw_position(self):
+        """获取当前位置（未量化）"""
+        return self._position
+
+    def get_raw_current(self):
+        """获取当前电流（未量化）"""
+        return self._current
+
+
+class VirtualSensorArray:
+    """
+    N路虚拟传感器的向量化实现：状态保存为NumPy数组，一次update()更新全部传感器
+    每路传感器有独立的随机源（由make_sensor_rngs派生），噪声按块预生成为 (noise_block, N, 2) 数组，
+    因此第i路的读数与 VirtualSensor(rng=make_sensor_rngs(seed, N)[i]) 逐位一致，且与N及块大小无关
+    """
+
+    def __init__(self, num_sensors, seed=None, noise=0.01, voltage=24.0, dt_ms=1, noise_block=1024, plant=None):
+        """
+        :param num_sensors: 传感器数量
+        :param seed: 噪声随机种子，None 表示不可复现
+        :param noise: 噪声系数，标量或长度为N的数组
+        :param voltage: 虚拟电压（V），标量或长度为N的数组
+        :param dt_ms: 每次update()对应的时间步长（ms）
+        :param noise_block: 每次预生成的噪声步数
+        :param plant: 被控对象（DCMotorPlantArray，长度为N），语义同VirtualSensor的plant参数
+        """
+        import numpy as np
+        self._np = np
+        self.plant = plant
+        n = int(num_sensors)
+        self.num_sensors = n
+        self.dt_ms = dt_ms
+        self.speed = np.zeros(n)
+        self.position = np.zeros(n)
+        self.current = np.zeros(n)
+        self.voltage = np.broadcast_to(np.asarray(voltage, dtype=float), (n,)).copy()
+        self.noise = np.broadcast_to(np.asarray(noise, dtype=float), (n,)).copy()
+        self._rngs = make_sensor_rngs(seed, n)
+        self._noise_block = noise_block
+        self._noise_buf = np.empty((noise_block, n, 2))
+        self._noise_pos = noise_block
+
+    def update(self):
+        """更新全部传感器，运算顺序与VirtualSensor.update逐项一致"""
+        np = self._np
+        if self._noise_pos == self._noise_block:
+            for i, rng in enumerate(self._rngs):
+                self._noise_buf[:, i, :] = rng.random((self._noise_block, 2))
+            self._noise_pos = 0
+        samples = self._noise_buf[self._noise_pos]
+        self._noise_pos += 1
+
+        plant = self.plant
+        if plant is not None:
+            plant.step()
+            self.speed[:] = plant.get_speed_rpm() + (-self.noise + (self.noise - -self.noise) * samples[:, 0])
+            self.position[:] = plant.theta
+            current_low = -self.noise * 0.1
+            self.current[:] = plant.current + (current_low + (self.noise * 0.1 - current_low) * samples[:, 1])
+            self.voltage[:] = plant.voltage
+            return
+
+        self.speed += -self.noise + (self.noise - -self.noise) * samples[:, 0]
+        np.maximum(self.speed, 0.0, out=self.speed)
+        self.position += (self.speed / 60) * (2 * math.pi) * (self.dt_ms * 0.001)
+        current_low = -self.noise * 0.1
+        self.current += current_low + (self.noise * 0.1 - current_low) * samples[:, 1]
+        np.minimum(self.current, 5.0, out=self.current)
+        np.maximum(self.current, 0.0, out=self.current)
+
+    def advance(self, steps):
+        """连续推进steps步（与调用steps次update()一致），接口与VirtualSensor.advance相同"""
+        for _ in range(steps):
+            self.update()
+
+    def get_speed(self):
+        """获取全部转速（保留2位小数的新数组）"""
+        return self._np.round(self.speed, 2)
+
+    def get_position(self):
+        """获取全部位置（保留4位小数的新数组）"""
+        return self._np.round(self.position, 4)
+
+    def get_current(self):
+        """获取全部电流（保留2位小数的新数组）"""
+        return self._np.round(self.current, 2)
+
+    def get_voltage(self):
+        """获取全部电压"""
+        return self.voltage
+
+    def get_raw_speed(self):
+        """获取全部转速（未量化，返回内部数组，只读使用）"""
+        return self.speed
+
+    def get_raw_position(self):
+        """获取全部位置（未量化，返回内部数组，只读使用）"""
+        return self.position
+
+    def get_raw_current(self):
+        """获取全部电流（未量化，返回内部数组，只读使用）"""
+        return self.current
+
+    def __len__(self):
+        return self.num_sensors
@@ -1,2 +1,8 @@
-from .simulation_core import MotorSimulationCore
+from BaiMotorLib._lazy import lazy_package
 
+# 按需导入：batch_simulation 依赖numpy，qt5_simulation_ui/simulation_worker 依赖PyQt5/pyqtgraph，均不在包导入时加载
+__all__ = ["MotorSimulationCore", "MotorBatchSimulation"]
+__getattr__, __dir__ = lazy_package(__name__, attributes={
+    "MotorSimulationCore": ".simulation_core",
+    "MotorBatchSimulation": ".batch_simulation",
+})
@@ -0,0 +1,168 @@
+import numpy as np
+
+from BaiMotorLib.common.constants import ControllerState, MotorBrakeMode
+from BaiMotorLib.drivers.virtual.pyqt5_sensor import VirtualSensorArray
+
+
+class MotorBatchSimulation:
+    """
+    无界面批量仿真引擎：N台虚拟电机的状态以NumPy数组保存，每个仿真步长对全部电机做一次向量化运算
+    单台电机的行为与标量路径一致：
+      - 控制器：OpenLoopController（按 updatePhaseMS + k * updatePeriodMS 调度，update()输出目标/0）
+      - 传感器：VirtualSensorArray（转速/电流均匀噪声随机游走，位置按1ms积分）
+      - 步进顺序：tick_inc → update_motor → sensor.update → controller.execute → 记录
+    每台电机的噪声来自各自派生的随机源（make_sensor_rngs），
+    因此 num_motors=1 时与 MotorSimulationCore(seed=seed) 的状态轨迹逐位一致，
+    num_motors=N 时第i台与使用 make_sensor_rngs(seed, N)[i] 的VirtualSensor结果一致
+    """
+
+    def __init__(self, num_motors, seed=None, update_period_ms=10, noise=0.01, voltage=24.0, plant=None):
+        """
+        :param num_motors: 电机数量
+        :param seed: 噪声随机种子，None 表示不可复现
+        :param update_period_ms: 控制器更新周期（ms），标量或长度为N的数组
+        :param noise: 传感器噪声系数，标量或长度为N的数组
+        :param voltage: 虚拟电压（V）
+        :param plant: 被控对象（DCMotorPlantArray，长度为N），给出时驱动目标转速换算为端电压、传感器读取其状态，
+                      第i台与以相同参数的DCMotorPlant接入VirtualMotorDriver/VirtualSensor的结果逐位一致
+        """
+        n = int(num_motors)
+        self.num_motors = n
+        self.time_ms = 0
+
+        # 传感器状态（对应VirtualSensor），以下数组与self.sensor共用，原地更新
+        self.plant = plant
+        self.sensor = VirtualSensorArray(n, seed=seed, noise=noise, voltage=voltage, plant=plant)
+        self.speed = self.sensor.speed
+        self.position = self.sensor.position
+        self.current = self.sensor.current
+        self.voltage = self.sensor.voltage
+        self.noise = self.sensor.noise
+
+        # 控制器状态（对应OpenLoopController）
+        self.target = np.zeros(n)
+        self.output = np.zeros(n)
+        self.state = np.full(n, ControllerState.CONTROLLER_STATE_IDLE, dtype=np.int8)
+        self.brake_mode = np.full(n, MotorBrakeMode.MOTOR_BRAKE_NONE, dtype=np.int8)
+        self.update_period_ms = np.broadcast_to(np.asarray(update_period_ms, dtype=np.int64), (n,)).copy()
+        self.update_phase_ms = np.zeros(n, dtype=np.int64)
+        self.next_update = np.zeros(n, dtype=np.int64)
+        self._calc_next_update(slice(None))
+
+        # 驱动状态（对应VirtualMotorDriver）
+        self.driver_target = np.zeros(n)
+
+    # ---- 控制器指令（语义同OpenLoopController，idx为None时作用于全部电机） ----
+    def set_target(self, target_speed, idx=None):
+        """设置目标转速（rpm），非负限制"""
+        idx = self._index(idx)
+        self.target[idx] = np.maximum(0.0, target_speed)
+        self._calc_next_update(idx)
+
+    def set_state(self, state, idx=None):
+        """设置控制器运行状态，仅支持预定义状态"""
+        if state not in (ControllerState.CONTROLLER_STATE_IDLE,
+                         ControllerState.CONTROLLER_STATE_RUNNING,
+                         ControllerState.CONTROLLER_STATE_BRAKE,
+                         ControllerState.CONTROLLER_STATE_ERROR):
+            return
+        idx = self._index(idx)
+        self.state[idx] = state
+        self._calc_next_update(idx)
+
+    def set_brake_mode(self, brake_mode, idx=None):
+        """设置刹车模式，联动控制器状态"""
+        if brake_mode not in (MotorBrakeMode.MOTOR_BRAKE_NONE,
+                              MotorBrakeMode.MOTOR_BRAKE_SOFTWARE,
+                              MotorBrakeMode.MOTOR_BRAKE_HARDWARE):
+            return
+        idx = self._index(idx)
+        self.brake_mode[idx] = brake_mode
+        if brake_mode != MotorBrakeMode.MOTOR_BRAKE_NONE:
+            self.state[idx] = ControllerState.CONTROLLER_STATE_BRAKE
+            self.output[idx] = 0.0
+        else:
+            self.state[idx] = ControllerState.CONTROLLER_STATE_RUNNING
+        self._calc_next_update(idx)
+
+    def set_update_period(self, period_ms, phase_ms=0, idx=None):
+        """设置控制器更新周期与相位（ms）"""
+        idx = self._index(idx)
+        self.update_period_ms[idx] = period_ms
+        self.update_phase_ms[idx] = phase_ms
+        self._calc_next_update(idx)
+
+    # ---- 仿真步进 ----
+    def step(self):
+        """推进1ms：时间 → 到期控制器更新 → 传感器更新 → 控制输出"""
+        self.time_ms += 1
+        now = self.time_ms
+
+        # 1. 到期控制器执行update()：刹车/未运行输出0，运行中输出目标转速，错误状态保持原输出
+        due = self.next_update <= now
+        if due.any():
+            state = self.state[due]
+            output = self.output[due]
+            output[state == ControllerState.CONTROLLER_STATE_BRAKE] = 0.0
+            output[state == ControllerState.CONTROLLER_STATE_IDLE] = 0.0
+            running = state == ControllerState.CONTROLLER_STATE_RUNNING
+            output[running] = self.target[due][running]
+            self.output[due] = output
+            self.driver_target[due] = np.maximum(0.0, output)
+            self._calc_next_update(due)
+
+        # 2. 传感器更新：运算顺序与VirtualSensor.update逐项一致，保证浮点结果相同
+        if self.plant is not None:
+            self.plant.command_speed(self.driver_target)
+        self.sensor.update()
+
+        # 3. 控制器execute()：把输出下发到驱动
+        np.maximum(0.0, self.output, out=self.driver_target)
+
+    def run(self, steps, record_every=1):
+        """
+        连续推进多个步长
+        :param steps: 步数（ms）
+        :param record_every: 每隔多少步记录一次轨迹，0 表示不记录
+        :return: 记录时返回dict，各列为形状 (记录数, N) 的数组（time_ms为一维）；不记录时返回None
+        """
+        if not record_every:
+            for _ in range(steps):
+                self.step()
+            return None
+
+        rows = steps // record_every
+        n = self.num_motors
+        trace = {
+            "time_ms": np.empty(rows, dtype=np.int64),
+            "speed": np.empty((rows, n)),
+            "position": np.empty((rows, n)),
+            "current": np.empty((rows, n)),
+            "voltage": np.empty((rows, n)),
+            "target_speed": np.empty((rows, n)),
+            "controller_state": np.empty((rows, n), dtype=np.int8),
+        }
+        row = 0
+        for i in range(1, steps + 1):
+            self.step()
+            if i % record_every == 0:
+                trace["time_ms"][row] = self.time_ms
+                trace["speed"][row] = self.speed
+                trace["position"][row] = self.position
+                trace["current"][row] = self.current
+                trace["voltage"][row] = self.voltage
+                trace["target_speed"][row] = self.target
+                trace["controller_state"][row] = self.state
+                row += 1
+        return trace
+
+    def _calc_next_update(self, idx):
+        """按调度契约（phase + k * period，严格晚于当前时间）计算下一次更新时间"""
+        period = self.update_period_ms[idx]
+        phase = self.update_phase_ms[idx]
+        now = self.time_ms
+        self.next_update[idx] = now + period - (now - phase) % period
+
+    def _index(self, idx):
+        """None 表示全部电机"""
+        return slice(None) if idx is None else idx
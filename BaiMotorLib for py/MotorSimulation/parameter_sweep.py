@@ -0,0 +1,224 @@
+"""
+参数扫描：按网格或随机采样生成仿真场景，分发到进程池并行运行，逐个返回摘要指标
+
+  - 场景参数为扁平dict（见 DEFAULT_PARAMS），未给出的键取默认值
+  - 每个场景的摘要按 (完整参数, 场景运行函数, 库版本) 的哈希缓存到磁盘，扩展扫描范围后重新运行时只计算新增的点；
+    缓存不跟踪源码改动，修改仿真行为（控制器、电机模型、摘要指标等）时须同步提升 BaiMotorLib.__version__，
+    否则会读到旧结果
+  - 指标：稳定时间、超调量、RMS误差、峰值电流、末值转速（见 summarize）
+"""
+import contextlib
+import hashlib
+import io
+import itertools
+import json
+import os
+import random
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import BaiMotorLib
+from BaiMotorLib.common.constants import MotorPlantIntegrator, MotorSimRunMode
+from BaiMotorLib.drivers.virtual.dc_motor_plant import DCMotorPlant
+from .simulation_core import MotorSimulationCore
+
+# 场景参数默认值：kp/ki/kd 全为None时使用开环控制器；plant为False时不接入电机模型
+DEFAULT_PARAMS = {
+    "duration_ms": 1000,
+    "target_speed": 1000.0,
+    "update_period_ms": 10,
+    "seed": 0,
+    "kp": None,
+    "ki": None,
+    "kd": None,
+    "plant": True,
+    "resistance": 1.0,
+    "inductance": 1e-3,
+    "back_emf": 0.05,
+    "torque_const": 0.05,
+    "inertia": 2e-5,
+    "damping": 1e-5,
+    "load_torque": 0.0,
+    "integrator": MotorPlantIntegrator.MOTOR_PLANT_EXACT,
+    "settle_band": 0.02,
+}
+_PLANT_KEYS = ("resistance", "inductance", "back_emf", "torque_const", "inertia", "damping", "load_torque",
+               "integrator")
+
+
+def grid(**axes):
+    """
+    网格采样：各参数取值列表的笛卡尔积
+    :param axes: 参数名 → 取值序列
+    :return: 场景参数dict列表（按参数给出顺序，最后一个参数变化最快）
+    """
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*(axes[name] for name in names))]
+
+
+def random_sample(count, seed=None, **ranges):
+    """
+    随机采样
+    :param count: 场景数量
+    :param seed: 采样随机种子，相同种子得到相同的场景序列（扩展count时前面的场景不变）
+    :param ranges: 参数名 → (下限, 上限) 元组（整数上下限时取整数，否则取均匀浮点数）或取值列表（均匀选取）
+    :return: 场景参数dict列表
+    """
+    rng = random.Random(seed)
+    points = []
+    for _ in range(count):
+        point = {}
+        for name, spec in ranges.items():
+            if isinstance(spec, tuple):
+                low, high = spec
+                point[name] = rng.randint(low, high) if isinstance(low, int) and isinstance(high, int) \
+                    else rng.uniform(low, high)
+            else:
+                point[name] = rng.choice(list(spec))
+        points.append(point)
+    return points
+
+
+def summarize(time_ms, speed, current, target, settle_band=0.02):
+    """
+    由仿真轨迹计算摘要指标
+    :param time_ms, speed, current: 等长序列
+    :param target: 目标转速（rpm）
+    :param settle_band: 稳定带宽（相对目标值的比例）
+    :return: dict：settling_time_ms（最后一次离开稳定带之后的时刻，始终未进入为None）、
+             overshoot_pct、rms_error、peak_current、final_speed
+    """
+    if not len(speed):
+        raise ValueError("轨迹为空")
+    band = abs(target) * settle_band
+    settling = time_ms[0]
+    for t, value in zip(time_ms, speed):
+        if abs(value - target) > band:
+            settling = None
+        elif settling is None:
+            settling = t
+    peak = max(speed)
+    return {
+        "settling_time_ms": settling,
+        "overshoot_pct": max(0.0, (peak - target) / target * 100) if target else 0.0,
+        "rms_error": (sum((value - target) ** 2 for value in speed) / len(speed)) ** 0.5,
+        "peak_current": max(abs(value) for value in current),
+        "final_speed": speed[-1],
+    }
+
+
+def run_scenario(params):
+    """
+    运行一个场景（进程池工作进程内调用）
+    :param params: 场景参数（未给出的键取 DEFAULT_PARAMS）
+    :return: 摘要指标dict
+    """
+    p = dict(DEFAULT_PARAMS, **params)
+    plant = DCMotorPlant(**{key: p[key] for key in _PLANT_KEYS}) if p["plant"] else None
+    gains = None
+    if any(p[key] is not None for key in ("kp", "ki", "kd")):
+        gains = tuple(p[key] or 0.0 for key in ("kp", "ki", "kd"))
+    core = MotorSimulationCore(simulation_duration_ms=p["duration_ms"], seed=p["seed"], plant=plant,
+                               pid_gains=gains)
+    core.controller.set_update_period(p["update_period_ms"])
+    with contextlib.redirect_stdout(io.StringIO()):
+        core.start_simulation(p["target_speed"], mode=MotorSimRunMode.MOTOR_SIM_ASAP)
+    data = core.get_simulation_data()
+    return summarize(data.column("time_ms"), data.column("speed"), data.column("current"), p["target_speed"],
+                     p["settle_band"])
+
+
+def runner_name(runner):
+    """
+    场景运行函数的限定名（模块名.函数名），用于区分不同运行函数的缓存
+    :raises ValueError: 不是模块级函数（lambda、嵌套函数等）时抛出异常，这类函数的名字不能唯一标识其行为
+    """
+    name = getattr(runner, "__qualname__", "")
+    if not name or "<" in name:
+        raise ValueError(f"缓存扫描结果时runner须为模块级函数：{runner!r}")
+    return f"{runner.__module__}.{name}"
+
+
+def params_key(params, runner=run_scenario):
+    """
+    场景缓存键：补全默认值后的参数、场景运行函数的限定名与库版本的SHA-256
+    :param params: 场景参数
+    :param runner: 场景运行函数，不同运行函数的结果互不复用
+    """
+    full = dict(DEFAULT_PARAMS, **params)
+    text = json.dumps({"params": full, "runner": runner_name(runner), "version": BaiMotorLib.__version__},
+                      sort_keys=True)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class SweepCache:
+    """磁盘结果缓存：每个场景一个 <键>.json 文件，写入经临时文件原子替换，并行写入互不干扰"""
+
+    def __init__(self, directory):
+        """
+        :param directory: 缓存目录（不存在时创建）
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, key):
+        """读取缓存的摘要，不存在或损坏时返回None"""
+        try:
+            with open(os.path.join(self.directory, key + ".json"), encoding="utf-8") as file:
+                return json.load(file)["summary"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, key, params, summary, runner=run_scenario):
+        """写入摘要（连同参数、场景运行函数与库版本，便于人工查看）"""
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump({"params": params, "runner": runner_name(runner), "version": BaiMotorLib.__version__,
+                       "summary": summary}, file, ensure_ascii=False)
+        os.replace(tmp, os.path.join(self.directory, key + ".json"))
+
+
+def run_sweep(points, cache_dir=None, max_workers=None, runner=run_scenario):
+    """
+    并行运行参数扫描，逐个返回结果（生成器）：先返回缓存命中的场景，其余按完成顺序返回
+    :param points: 场景参数dict序列（如 grid()/random_sample() 的结果）
+    :param cache_dir: 缓存目录，None 表示不缓存
+    :param max_workers: 进程数，默认为CPU核数；0 表示在当前进程内顺序运行
+    :param runner: 场景运行函数 runner(params) -> 摘要dict（须为模块级函数以便传给工作进程；
+                   缓存键包含其限定名，不同运行函数的结果互不复用）
+    :return: 逐个产出 (场景参数, 摘要dict, 是否来自缓存)
+    :raises ValueError: 给出cache_dir而runner不是模块级函数时抛出异常
+    """
+    cache = SweepCache(cache_dir) if cache_dir is not None else None
+    pending = []
+    for params in points:
+        key = params_key(params, runner) if cache is not None else None
+        summary = cache.get(key) if cache is not None else None
+        if summary is not None:
+            yield params, summary, True
+        else:
+            pending.append((key, params))
+    if not pending:
+        return
+
+    if max_workers == 0:
+        for key, params in pending:
+            summary = runner(params)
+            if cache is not None:
+                cache.put(key, params, summary, runner)
+            yield params, summary, False
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(runner, params): (key, params) for key, params in pending}
+        try:
+            for future in as_completed(futures):
+                key, params = futures[future]
+                summary = future.result()
+                if cache is not None:
+                    cache.put(key, params, summary, runner)
+                yield params, summary, False
+        finally:
+            # 调用方提前停止迭代或出错时不再启动排队中的场景
+            for future in futures:
+                future.cancel()
@@ -0,0 +1,94 @@
+import numpy as np
+
+
+class PlotRingBuffer:
+    """
+    多通道定长环形缓冲区（曲线显示用）
+    每个通道分配 2 * capacity 的存储并“双写”（位置i与i+capacity同时写入），
+    因此最近capacity个点在内存中始终连续，view() 直接返回切片视图，无需拼接或复制；
+    追加数据只做标量写入，不分配新数组
+    """
+
+    def __init__(self, channels, capacity):
+        """
+        :param channels: 通道名序列，如 ("time_ms", "speed")
+        :param capacity: 每个通道保留的最大点数
+        """
+        self.channels = tuple(channels)
+        self.capacity = capacity
+        self._index = {name: i for i, name in enumerate(self.channels)}
+        self._data = np.zeros((len(self.channels), 2 * capacity))
+        self._head = 0    # 下一次写入位置（0 ~ capacity-1）
+        self._length = 0  # 有效点数
+
+    def append(self, *values):
+        """追加一个采样点，values按通道顺序给出"""
+        i = self._head
+        j = i + self.capacity
+        data = self._data
+        for k, value in enumerate(values):
+            data[k, i] = value
+            data[k, j] = value
+        self._head = i + 1 if i + 1 < self.capacity else 0
+        if self._length < self.capacity:
+            self._length += 1
+
+    def extend(self, block):
+        """
+        批量追加
+        :param block: 形状为 (通道数, n) 的数组，n 可大于capacity（只保留最后capacity个点）
+        """
+        block = np.asarray(block, dtype=float)
+        n = block.shape[1]
+        if n >= self.capacity:
+            block = block[:, n - self.capacity:]
+            self._data[:, :self.capacity] = block
+            self._data[:, self.capacity:] = block
+            self._head = 0
+            self._length = self.capacity
+            return
+        first = min(n, self.capacity - self._head)
+        for offset in (0, self.capacity):
+            start = self._head + offset
+            self._data[:, start:start + first] = block[:, :first]
+            self._data[:, offset:offset + n - first] = block[:, first:]
+        self._head = (self._head + n) % self.capacity
+        self._length = min(self._length + n, self.capacity)
+
+    def clear(self):
+        self._head = 0
+        self._length = 0
+
+    def view(self, channel):
+        """返回指定通道按时间顺序排列的连续视图（只读使用，后续追加会改变其内容）"""
+        end = self._head + self.capacity
+        return self._data[self._index[channel], end - self._length:end]
+
+    def decimated(self, x_channel, y_channel, max_points):
+        """
+        峰值抽取：点数超过max_points时，把数据分成 max_points//2 段，每段保留最小值与最大值，
+        保证尖峰在缩略显示中不丢失；点数不超过max_points时直接返回视图
+        :return: (x, y) 两个一维数组
+        """
+        x = self.view(x_channel)
+        y = self.view(y_channel)
+        bins = max_points // 2
+        if self._length <= max_points or bins <= 0:
+            return x, y
+        size = self._length // bins
+        start = self._length - size * bins  # 丢弃最旧的不足一段的点，保证最新数据完整显示
+        x_bins = x[start:].reshape(bins, size)
+        y_bins = y[start:].reshape(bins, size)
+        x_out = np.empty(2 * bins)
+        y_out = np.empty(2 * bins)
+        x_out[0::2] = x_bins[:, 0]
+        x_out[1::2] = x_bins[:, -1]
+        y_out[0::2] = y_bins.min(axis=1)
+        y_out[1::2] = y_bins.max(axis=1)
+        return x_out, y_out
+
+    def __getitem__(self, channel):
+        return self.view(channel)
+
+    def __len__(self):
+        return self._length
@@ -1,8 +1,10 @@
+import secrets
 import sys
+import time
 import numpy as np
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QPushButton, QLineEdit, QLabel, QGroupBox, QGridLayout)
-from PyQt5.QtCore import QTimer, Qt
+from PyQt5.QtCore import QTimer, Qt, QThread, QMetaObject
 from PyQt5.QtGui import QFont
 import pyqtgraph as pg
 from pyqtgraph import PlotWidget
@@ -10,13 +12,35 @@ from pyqtgraph import PlotWidget
 # 导入项目核心模块（仅使用，不修改）
 from BaiMotorLib.common.motor_manager import MotorManager
 from BaiMotorLib.common.motorlib_time_sys import MotorlibTimeSys
-from BaiMotorLib.common.constants import ControllerState, MotorBrakeMode
+from BaiMotorLib.common.constants import MotorBrakeMode, MotorReplayCommand
+from BaiMotorLib.common.motorlib_replay import CommandRecorder
 from BaiMotorLib.drivers.virtual.pyqt5_motor import VirtualMotor, VirtualMotorDriver
-from BaiMotorLib.drivers.virtual.pyqt5_sensor import VirtualSensor
+from BaiMotorLib.drivers.virtual.pyqt5_sensor import VirtualSensor, make_sensor_rngs
 from BaiMotorLib.controllers.virtual.pyqt5_controller import OpenLoopController
+from .plot_buffer import PlotRingBuffer
+from .simulation_worker import SimulationWorker, SnapshotChannel
 
 class MotorQt5SimulationUI(QMainWindow):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, trace_sink=None, refresh_hz=30, max_catchup_steps=200,
+                 history_len=100000, display_points=2000, speed_factor=1.0, plant=None, seed=None,
+                 command_log=None):
+        """
+        :param parent: 父窗口
+        :param trace_sink: 流式落盘输出端（如 trace_file.TraceFileSink），每个仿真步长的完整采样同时写入
+        :param refresh_hz: 界面（标签+曲线）刷新频率，建议30~60Hz，与1ms仿真步长无关
+        :param max_catchup_steps: 单次仿真定时器回调最多追赶的步数，超出部分视为丢弃（仿真时间放慢）
+        :param history_len: 曲线保留的历史点数（环形缓冲区容量）
+        :param display_points: 曲线实际绘制的最大点数，历史点数更多时按峰值抽取后绘制
+        :param speed_factor: 仿真倍速（1为实时），可运行中经 worker.request_speed_factor() 修改
+        :param plant: 被控对象（DCMotorPlant），给出时转速/电流曲线由电机模型产生，None 表示噪声随机游走
+        :param seed: 传感器噪声随机种子，None 且不录制时使用全局random
+        :param command_log: 指令日志路径，给出时录制启动/刹车指令与种子（未给种子时随机生成），
+                            可用 MotorSimulation.replay.Replayer 无界面重现本次会话；
+                            指令日志不含被控对象参数，不能与plant同时给出
+        :raises ValueError: 同时给出plant与command_log时抛出异常
+        """
+        if plant is not None and command_log is not None:
+            raise ValueError("指令日志不记录被控对象参数，回放无法重现带plant的会话，plant与command_log不能同时使用")
         super().__init__(parent)
         self.setWindowTitle("电机仿真系统 - PyQt5可视化（不修改驱动库）")
         self.setGeometry(100, 100, 1200, 800)
@@ -24,26 +48,53 @@ class MotorQt5SimulationUI(QMainWindow):
 
         # 1. 初始化仿真核心组件（严格遵循Motor类大写属性：self.Driver / self.Controller）
         self.time_sys = MotorlibTimeSys()
-        self.sensor = VirtualSensor()  # 虚拟传感器（采集电机数据）
-        self.motor_driver = VirtualMotorDriver()  # 虚拟电机驱动
+        self.plant = plant
+        if command_log is not None and seed is None:
+            seed = secrets.randbits(63)
+        self.seed = seed
+        # 虚拟传感器（采集电机数据），设种子时与回放会话中电机0的随机源一致
+        self.sensor = VirtualSensor(rng=make_sensor_rngs(seed, 1)[0] if seed is not None else None, plant=plant)
+        self.motor_driver = VirtualMotorDriver(plant=plant)  # 虚拟电机驱动
         self.controller = OpenLoopController(motor_driver=self.motor_driver)  # 开环控制器
         # 严格按Motor库定义初始化：driver/controller为必传，绑定后通过大写属性访问
         self.motor = VirtualMotor(driver=self.motor_driver, controller=self.controller)
         # 电机管理器直接使用（不修改、不新增方法）
         self.motor_manager = MotorManager(self.time_sys, self.motor)
+        self.recorder = None
+        if command_log is not None:
+            self.recorder = CommandRecorder(self.time_sys, command_log, seed)
+            self.recorder.record(MotorReplayCommand.MOTOR_CMD_ADD_MOTOR, 0)
 
         # 2. 仿真状态变量
         self.simulation_running = False
-        self.sim_data = {"time_ms": [], "speed": [], "current": [], "target_speed": []}
-        self.max_data_len = 500  # 曲线最大显示数据点（避免卡顿）
+        self.max_data_len = history_len  # 曲线保留的历史点数（定长环形缓冲，追加不分配内存）
+        self.display_points = display_points  # 每帧绘制点数上限，帧耗时与历史长度无关
+        self.sim_data = PlotRingBuffer(("time_ms", "speed", "current", "target_speed"), self.max_data_len)
+        self.trace_sink = trace_sink  # 完整仿真数据写入磁盘，界面只保留最近的显示数据
+        # 性能计数：统计窗口内的仿真步数与界面帧数，每秒刷新一次显示
+        self._stat_start = time.perf_counter()
+        self._stat_steps_base = 0
+        self._stat_frames = 0
 
         # 3. 初始化UI组件
         self._init_ui()
 
-        # 4. 初始化定时器（1ms刷新，模拟实时仿真）
-        self.timer = QTimer(self)
-        self.timer.setInterval(1)  # 1ms周期，与仿真步长一致
-        self.timer.timeout.connect(self._simulation_tick)
+        # 4. 仿真在独立工作线程中运行：仿真对象只由工作线程访问，界面通过指令队列控制、通过快照通道读取数据
+        self.snapshot_channel = SnapshotChannel()
+        self.worker = SimulationWorker(self.time_sys, self.motor_manager, self.sensor, self.motor_driver,
+                                       self.controller, self.snapshot_channel, trace_sink=trace_sink,
+                                       max_catchup_steps=max_catchup_steps, speed_factor=speed_factor,
+                                       recorder=self.recorder)
+        self.worker_thread = QThread(self)
+        self.worker.moveToThread(self.worker_thread)
+        self.worker_thread.started.connect(self.worker.start_loop)
+        self.worker_thread.start()
+
+        # 5. 界面定时器按refresh_hz从快照通道取数据，刷新标签与曲线
+        self.render_timer = QTimer(self)
+        self.render_timer.setInterval(max(1, round(1000 / refresh_hz)))
+        self.render_timer.timeout.connect(self._refresh_display)
+        self.render_timer.start()
 
     def _init_ui(self):
         """初始化UI布局：控制区、数据显示区、曲线区（功能不变）"""
@@ -107,7 +158,8 @@ class MotorQt5SimulationUI(QMainWindow):
             "电机电流": QLabel("0.00 A"),
             "电机电压": QLabel(f"{self.sensor.get_voltage()} V"),
             "转子位置": QLabel("0.0000 rad"),
-            "仿真状态": QLabel("未运行")
+            "仿真状态": QLabel("未运行"),
+            "步速/帧率": QLabel("0 步/s | 0 帧/s")
         }
         # 设置数据标签样式
         for lbl in self.data_labels.values():
@@ -158,17 +210,13 @@ class MotorQt5SimulationUI(QMainWindow):
             target_speed = float(self.target_speed_input.text())
             if target_speed < 0:
                 raise ValueError
-            # 直接给控制器设置目标转速
-            self.controller.set_target(target_speed)
         except ValueError:
             self.data_labels["仿真状态"].setText("参数错误！")
             self.data_labels["仿真状态"].setStyleSheet("color: red; font-size: 14px; background-color: white; padding: 5px;")
             return
-        # 直接切换控制器为运行状态（绕过电机管理器）
-        self.controller.set_state(ControllerState.CONTROLLER_STATE_RUNNING)
-        # 启动定时器，开始仿真
+        # 由工作线程在tick边界设置目标转速并切换为运行状态（绕过电机管理器）
+        self.worker.request_start(target_speed)
         self.simulation_running = True
-        self.timer.start()
         # 更新界面状态
         self.data_labels["仿真状态"].setText("运行中")
         self.data_labels["仿真状态"].setStyleSheet("color: green; font-size: 14px; background-color: white; padding: 5px;")
@@ -181,8 +229,8 @@ class MotorQt5SimulationUI(QMainWindow):
         """
         if not self.simulation_running:
             return
-        # 直接暂停定时器，停止仿真步长更新
-        self.timer.stop()
+        # 通知工作线程停止仿真步长更新
+        self.worker.request_stop()
         self.simulation_running = False
         # 更新界面状态
         self.data_labels["仿真状态"].setText("已停止")
@@ -196,52 +244,46 @@ class MotorQt5SimulationUI(QMainWindow):
         """
         if not self.simulation_running:
             return
-        # 直接给控制器设置硬件刹车模式，强制转速归0
-        self.controller.set_brake_mode(MotorBrakeMode.MOTOR_BRAKE_HARDWARE)
-        # 停止仿真定时器
-        self.timer.stop()
+        # 由工作线程设置硬件刹车模式（强制转速归0）并停止仿真
+        self.worker.request_brake(MotorBrakeMode.MOTOR_BRAKE_HARDWARE)
         self.simulation_running = False
         # 更新界面状态
         self.data_labels["仿真状态"].setText("紧急刹车")
         self.data_labels["仿真状态"].setStyleSheet("color: red; font-size: 14px; background-color: white; padding: 5px;")
         self.start_btn.setEnabled(True)
 
-    def _simulation_tick(self):
-        """
-        仿真核心步长（1ms执行一次）
-        仅保留对motor_manager.update_motor()的调用（库中原有方法，不修改）
-        其余逻辑不变：更新时间→更新电机→更新传感器→记录数据→刷新界面
-        """
-        # 1. 时间系统步进1ms（库中原有方法）
-        self.time_sys.tick_inc(ms=1)
-        # 2. 调用电机管理器原有update_motor()方法（仅使用，不修改）
-        self.motor_manager.update_motor()
-        # 3. 更新传感器数据（带噪声，库中原有逻辑）
-        self.sensor.update()
-        # 4. 执行控制器输出（确保控制指令传递到驱动）
-        self.controller.execute()
-        # 5. 获取当前仿真数据（严格适配属性规范）
-        current_time = self.time_sys.get_time()
-        total_ms = current_time[3] + current_time[2]*1000 + current_time[1]*60*1000 + current_time[0]*3600*1000
-        current_speed = self.sensor.get_speed()
-        current_current = self.sensor.get_current()
-        # 从电机驱动获取实际目标转速（驱动与控制器已绑定，数据一致）
-        target_speed = self.motor_driver.get_target_speed()
-        current_pos = self.sensor.get_position()
-        # 6. 记录数据，限制长度避免内存溢出
-        self.sim_data["time_ms"].append(total_ms)
-        self.sim_data["speed"].append(current_speed)
-        self.sim_data["current"].append(current_current)
-        self.sim_data["target_speed"].append(target_speed)
-        if len(self.sim_data["time_ms"]) > self.max_data_len:
-            for key in self.sim_data:
-                self.sim_data[key] = self.sim_data[key][-self.max_data_len:]
-        # 7. 刷新实时数据标签
-        self.data_labels["当前转速"].setText(f"{current_speed} rpm")
-        self.data_labels["目标转速"].setText(f"{target_speed:.2f} rpm")
-        self.data_labels["电机电流"].setText(f"{current_current:.2f} A")
-        self.data_labels["转子位置"].setText(f"{current_pos:.4f} rad")
-        # 8. 刷新实时曲线
-        self.speed_curve.setData(self.sim_data["time_ms"], self.sim_data["speed"])
-        self.target_speed_curve.setData(self.sim_data["time_ms"], self.sim_data["target_speed"])
-        self.current_curve.setData(self.sim_data["time_ms"], self.sim_data["current"])
\ No newline at end of file
+    def _refresh_display(self):
+        """界面刷新（refresh_hz）：从快照通道取出新采样，刷新实时数据标签、曲线与步速/帧率计数"""
+        for block in self.snapshot_channel.drain():
+            self.sim_data.extend(block)
+        snapshot = self.snapshot_channel.latest
+        if snapshot is None:
+            return
+        # 1. 刷新实时数据标签
+        self.data_labels["当前转速"].setText(f"{snapshot['speed']} rpm")
+        self.data_labels["目标转速"].setText(f"{snapshot['target_speed']:.2f} rpm")
+        self.data_labels["电机电流"].setText(f"{snapshot['current']:.2f} A")
+        self.data_labels["转子位置"].setText(f"{snapshot['position']:.4f} rad")
+        # 2. 刷新实时曲线（直接使用环形缓冲区的连续视图，点数过多时峰值抽取）
+        self.speed_curve.setData(*self.sim_data.decimated("time_ms", "speed", self.display_points))
+        self.target_speed_curve.setData(*self.sim_data.decimated("time_ms", "target_speed", self.display_points))
+        self.current_curve.setData(*self.sim_data.decimated("time_ms", "current", self.display_points))
+        # 3. 每秒更新一次实际达到的仿真步速与帧率
+        self._stat_frames += 1
+        now = time.perf_counter()
+        elapsed = now - self._stat_start
+        if elapsed >= 1.0:
+            steps = snapshot["steps_total"] - self._stat_steps_base
+            self.data_labels["步速/帧率"].setText(
+                f"{steps / elapsed:.0f} 步/s | {self._stat_frames / elapsed:.0f} 帧/s")
+            self._stat_start = now
+            self._stat_steps_base = snapshot["steps_total"]
+            self._stat_frames = 0
+
+    def closeEvent(self, event):
+        """窗口关闭事件：停止工作线程"""
+        self.render_timer.stop()
+        QMetaObject.invokeMethod(self.worker, "stop_loop", Qt.BlockingQueuedConnection)
+        self.worker_thread.quit()
+        self.worker_thread.wait()
+        event.accept()
@@ -0,0 +1,256 @@
+"""
+确定性录制/回放：
+  - ReplaySession：以MotorManager驱动的多电机仿真会话，全部外部指令经会话方法执行，给出录制器时同时写入指令日志
+  - Replayer：读取指令日志，在无界面进程中全速重新执行，得到与录制时逐位一致的轨迹；
+              回放过程中按固定间隔保存状态快照，seek(tick) 从最近的快照恢复后只补跑剩余区间
+每台电机的传感器随机源由 (种子, 电机编号) 派生，与电机加入的先后和数量无关
+"""
+import secrets
+from bisect import bisect_left, bisect_right
+
+from BaiMotorLib.common.constants import MotorReplayCommand, MotorSchedulerMode
+from BaiMotorLib.common.motor_manager import MotorManager
+from BaiMotorLib.common.motorlib_replay import CommandRecorder, read_command_log
+from BaiMotorLib.common.motorlib_snapshot import dumps, loads
+from BaiMotorLib.common.motorlib_time_sys import MotorlibTimeSys
+
+
+def default_replay_factory(motor_id, seed):
+    """
+    默认的电机构造：虚拟驱动 + 开环控制器（周期10ms、相位0） + 虚拟传感器
+    传感器随机源与 make_sensor_rngs(seed, n)[motor_id] 相同，因此电机0与
+    MotorSimulationCore(seed=seed)/界面(seed=seed) 的电机一致
+    :return: (电机, 传感器)
+    """
+    import numpy as np
+    from BaiMotorLib.drivers.virtual.pyqt5_motor import VirtualMotor, VirtualMotorDriver
+    from BaiMotorLib.drivers.virtual.pyqt5_sensor import VirtualSensor
+    from BaiMotorLib.controllers.virtual.pyqt5_controller import OpenLoopController
+
+    sensor = VirtualSensor(rng=np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(motor_id,))))
+    driver = VirtualMotorDriver()
+    controller = OpenLoopController(motor_driver=driver)
+    return VirtualMotor(driver=driver, controller=controller), sensor
+
+
+class ReplaySession:
+    """
+    可录制/回放的仿真会话：时间系统 + MotorManager + 按编号管理的电机与传感器
+    每次step()：时间前进1ms → update_motor() → 传感器update() → 控制器execute()（与MotorSimulationCore一致）
+    """
+
+    def __init__(self, seed=None, factory=default_replay_factory, recorder_path=None,
+                 scheduler=MotorSchedulerMode.MOTOR_SCHED_LINEAR):
+        """
+        :param seed: 传感器随机种子，None 时随机生成一个（并写入指令日志，回放仍可复现）
+        :param factory: 电机构造函数 factory(电机编号, 种子) -> (电机, 传感器)
+        :param recorder_path: 指令日志路径，None 表示不录制
+        :param scheduler: MotorManager调度模式
+        """
+        self.seed = seed if seed is not None else secrets.randbits(63)
+        self.factory = factory
+        self.time_sys = MotorlibTimeSys()
+        self.manager = MotorManager(self.time_sys, scheduler=scheduler)
+        self.motors = {}      # 电机编号 → (电机, 传感器)，按加入顺序
+        self.next_id = 0
+        self.recorder = CommandRecorder(self.time_sys, recorder_path, self.seed) if recorder_path else None
+
+    # ---- 外部指令 ----
+    def add_motor(self, motor_id=None):
+        """
+        加入一台电机
+        :param motor_id: 电机编号，None 表示取下一个未用编号
+        :return: 电机编号
+        :raises ValueError: 编号已存在时抛出异常
+        """
+        if motor_id is None:
+            motor_id = self.next_id
+        if motor_id in self.motors:
+            raise ValueError(f"电机编号 {motor_id} 已存在")
+        motor, sensor = self.factory(motor_id, self.seed)
+        self.motors[motor_id] = (motor, sensor)
+        self.next_id = max(self.next_id, motor_id + 1)
+        self.manager.add_motor(motor)
+        self._record(MotorReplayCommand.MOTOR_CMD_ADD_MOTOR, motor_id)
+        return motor_id
+
+    def remove_motor(self, motor_id):
+        """移除电机（编号不存在时忽略）"""
+        entry = self.motors.pop(motor_id, None)
+        if entry is not None:
+            self.manager.remove_motor(entry[0])
+            self._record(MotorReplayCommand.MOTOR_CMD_REMOVE_MOTOR, motor_id)
+
+    def set_target(self, motor_id, target):
+        """设置目标值"""
+        self.motors[motor_id][0].Controller.set_target(target)
+        self._record(MotorReplayCommand.MOTOR_CMD_SET_TARGET, motor_id, target)
+
+    def set_state(self, motor_id, state):
+        """设置控制器运行状态（ControllerState）"""
+        self.motors[motor_id][0].Controller.set_state(state)
+        self._record(MotorReplayCommand.MOTOR_CMD_SET_STATE, motor_id, state)
+
+    def set_brake_mode(self, motor_id, brake_mode):
+        """设置刹车模式（MotorBrakeMode）"""
+        self.motors[motor_id][0].Controller.set_brake_mode(brake_mode)
+        self._record(MotorReplayCommand.MOTOR_CMD_SET_BRAKE, motor_id, brake_mode)
+
+    def apply(self, command, motor_id, value):
+        """按指令码执行一条指令（回放用）"""
+        if command == MotorReplayCommand.MOTOR_CMD_SET_TARGET:
+            self.set_target(motor_id, value)
+        elif command == MotorReplayCommand.MOTOR_CMD_SET_STATE:
+            self.set_state(motor_id, int(value))
+        elif command == MotorReplayCommand.MOTOR_CMD_SET_BRAKE:
+            self.set_brake_mode(motor_id, int(value))
+        elif command == MotorReplayCommand.MOTOR_CMD_ADD_MOTOR:
+            self.add_motor(motor_id)
+        elif command == MotorReplayCommand.MOTOR_CMD_REMOVE_MOTOR:
+            self.remove_motor(motor_id)
+
+    # ---- 步进 ----
+    def step(self):
+        """推进1ms"""
+        self.time_sys.tick_inc(ms=1)
+        self.manager.update_motor()
+        for _, sensor in self.motors.values():
+            sensor.update()
+        for motor, _ in self.motors.values():
+            motor.Controller.execute()
+
+    def sample(self):
+        """
+        当前采样（未量化值）
+        :return: (tick, ((电机编号, 转速, 位置, 电流, 控制器状态, 目标值), ...))
+        """
+        return (self.time_sys.get_ticks(),
+                tuple((motor_id, sensor.get_raw_speed(), sensor.get_raw_position(), sensor.get_raw_current(),
+                       motor.Controller.state, motor.Controller.Target)
+                      for motor_id, (motor, sensor) in self.motors.items()))
+
+    # ---- 快照 ----
+    def snapshot(self):
+        """
+        导出会话状态（时间、电机成员、控制器/驱动/传感器状态及随机源状态）的二进制快照（见 motorlib_snapshot）
+        :return: bytes
+        """
+        return dumps((self.next_id, tuple(self.motors), self.manager.dump_state(),
+                      tuple(sensor.dump_state() for _, sensor in self.motors.values())))
+
+    def restore(self, snapshot):
+        """
+        恢复snapshot()保存的状态（快照本身不被修改，可多次恢复）：
+        按快照中的电机编号以factory重建电机与传感器，再载入各自状态
+        """
+        self.next_id, motor_ids, manager_state, sensor_states = loads(snapshot)
+        self.time_sys = MotorlibTimeSys()
+        self.manager = MotorManager(self.time_sys, scheduler=self.manager.scheduler)
+        self.motors = {}
+        for motor_id, sensor_state in zip(motor_ids, sensor_states):
+            motor, sensor = self.factory(motor_id, self.seed)
+            sensor.load_state(sensor_state)
+            self.motors[motor_id] = (motor, sensor)
+            self.manager.add_motor(motor)
+        self.manager.load_state(manager_state)
+        if self.recorder is not None:
+            self.recorder.time_sys = self.time_sys
+
+    def close(self):
+        """结束录制（写入结束记录）"""
+        if self.recorder is not None:
+            self.recorder.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _record(self, command, motor_id, value=0.0):
+        if self.recorder is not None:
+            self.recorder.record(command, motor_id, value)
+
+
+class Replayer:
+    """
+    指令日志回放器：
+      run(until) 从当前位置全速回放到给定tick（默认到录制结束），可逐步回调取轨迹；
+      回放经过的每 snapshot_every_ms 整数倍时刻保存一次快照，seek(tick) 从不晚于tick的最近快照恢复后补跑
+    """
+
+    def __init__(self, path, factory=default_replay_factory, snapshot_every_ms=1000,
+                 scheduler=MotorSchedulerMode.MOTOR_SCHED_LINEAR):
+        """
+        :param path: 指令日志路径
+        :param factory: 电机构造函数，须与录制时一致
+        :param snapshot_every_ms: 快照间隔（ms），0 表示不保存快照
+        :param scheduler: MotorManager调度模式（调度结果与模式无关）
+        """
+        ticks_per_ms, seed, records = read_command_log(path)
+        if seed is None:
+            raise ValueError("指令日志未记录随机种子，无法确定性回放")
+        self.seed = seed
+        self.end_tick = None
+        self.commands = []
+        for tick, motor_id, command, value in records:
+            if command == MotorReplayCommand.MOTOR_CMD_END:
+                self.end_tick = tick
+                break
+            self.commands.append((tick, motor_id, command, value))
+        if self.end_tick is None:
+            # 录制未正常结束：回放到最后一条指令为止
+            self.end_tick = self.commands[-1][0] if self.commands else 0
+        self._command_ticks = [command[0] for command in self.commands]
+        self.snapshot_every = snapshot_every_ms * ticks_per_ms
+        self.session = ReplaySession(seed=seed, factory=factory, scheduler=scheduler)
+        self._cursor = 0
+        self._snapshots = {}   # tick → 快照（该tick的指令执行之前）
+        self._snapshot_ticks = []
+
+    @property
+    def now(self):
+        """当前回放时刻（tick）"""
+        return self.session.time_sys.get_ticks()
+
+    def run(self, until=None, on_step=None):
+        """
+        从当前时刻全速回放
+        :param until: 回放到的tick（不超过录制结束时刻），None 表示到录制结束
+        :param on_step: 每步之后的回调 on_step(session)，如 lambda s: trace.append(s.sample())
+        """
+        end = self.end_tick if until is None else min(until, self.end_tick)
+        session = self.session
+        commands = self.commands
+        every = self.snapshot_every
+        while True:
+            now = session.time_sys.get_ticks()
+            if every and now % every == 0 and now not in self._snapshots:
+                self._snapshots[now] = session.snapshot()
+                self._snapshot_ticks.insert(bisect_left(self._snapshot_ticks, now), now)
+            while self._cursor < len(commands) and commands[self._cursor][0] <= now:
+                _, motor_id, command, value = commands[self._cursor]
+                session.apply(command, motor_id, value)
+                self._cursor += 1
+            if now >= end:
+                break
+            session.step()
+            if on_step is not None:
+                on_step(session)
+
+    def seek(self, tick):
+        """
+        跳转到给定tick（该tick的指令已执行）：从不晚于tick的最近快照恢复，没有合适快照时从头回放
+        :param tick: 目标时刻，不超过录制结束时刻
+        """
+        tick = min(tick, self.end_tick)
+        index = bisect_right(self._snapshot_ticks, tick) - 1
+        if index >= 0 and (self._snapshot_ticks[index] > self.now or tick < self.now):
+            start = self._snapshot_ticks[index]
+            self.session.restore(self._snapshots[start])
+            self._cursor = bisect_left(self._command_ticks, start)
+        elif tick < self.now:
+            self.session = ReplaySession(seed=self.seed, factory=self.session.factory,
+                                         scheduler=self.session.manager.scheduler)
+            self._cursor = 0
+        self.run(until=tick)
@@ -1,61 +1,197 @@
+import time
+
 from BaiMotorLib.common.motor_manager import MotorManager
 from BaiMotorLib.common.motorlib_time_sys import MotorlibTimeSys
-from BaiMotorLib.common.constants import ControllerState, MotorBrakeMode
+from BaiMotorLib.common.motorlib_snapshot import dumps, loads
+from BaiMotorLib.common.constants import ControllerState, MotorBrakeMode, MotorSimRunMode
 from BaiMotorLib.drivers.virtual.pyqt5_motor import VirtualMotor, VirtualMotorDriver
-from BaiMotorLib.drivers.virtual.pyqt5_sensor import VirtualSensor
+from BaiMotorLib.drivers.virtual.pyqt5_sensor import VirtualSensor, make_sensor_rngs
+from BaiMotorLib.drivers.virtual.dc_motor_plant import DCMotorPlant
 from BaiMotorLib.controllers.virtual.pyqt5_controller import OpenLoopController
+from BaiMotorLib.controllers.common.PID import PIDController
+from .simulation_recorder import SimulationRecorder
 
 
 class MotorSimulationCore:
-    def __init__(self, simulation_duration_ms=1000):
+    def __init__(self, simulation_duration_ms=1000, seed=None, record_every=1, ring_capacity=None,
+                 trace_sink=None, log_sys=None, plant=None, pid_gains=None):
+        """
+        :param simulation_duration_ms: 仿真时长（ms）
+        :param seed: 传感器噪声随机种子（numpy随机源，按块预生成噪声），None 表示使用全局random（不可复现）
+        :param record_every: 数据记录抽取因子，每record_every个步长记录一次
+        :param ring_capacity: 环形记录容量（行），None 表示记录全部数据（按仿真时长预分配）
+        :param trace_sink: 流式落盘输出端（如 trace_file.TraceFileSink），每个步长的采样同时写入，由调用方负责关闭
+        :param log_sys: 日志系统（MotorlibLogSys），记录控制器状态切换与刹车事件，由调用方负责关闭；
+                        构造时传入的时间系统分辨率须为1 tick/ms，时间戳改取本仿真的时间系统
+        :param plant: 被控对象（DCMotorPlant），给出时驱动指令经被控对象作用到传感器读数，None 表示噪声随机游走
+        :param pid_gains: (kp, ki, kd)，给出时以PIDController按传感器转速闭环控制，None 表示开环控制器
+        """
         self.time_sys = MotorlibTimeSys()
         self.simulation_duration_ms = simulation_duration_ms
         # 严格按大写属性绑定：先初始化驱动/控制器，再传入Motor
-        self.sensor = VirtualSensor()
-        self.motor_driver = VirtualMotorDriver()
-        self.controller = OpenLoopController(motor_driver=self.motor_driver)
+        self.plant = plant
+        self.sensor = VirtualSensor(rng=make_sensor_rngs(seed, 1)[0] if seed is not None else None, plant=plant)
+        self.motor_driver = VirtualMotorDriver(plant=plant)
+        if pid_gains is None:
+            self.controller = OpenLoopController(motor_driver=self.motor_driver)
+        else:
+            self.controller = PIDController(*pid_gains, motor_driver=self.motor_driver, sensor=self.sensor)
         self.motor = VirtualMotor(driver=self.motor_driver, controller=self.controller)  # 关键：必传driver+controller
-        self.motor_manager = MotorManager(self.time_sys, self.motor)
+        self.motor_manager = MotorManager(self.time_sys, self.motor, log_sys=log_sys)
 
         self.is_running = False
-        self.simulation_data = []
+        self.trace_sink = trace_sink
+        self.record_every = record_every
+        self.ring_capacity = ring_capacity
+        if ring_capacity is None:
+            self.simulation_data = SimulationRecorder(
+                capacity=max(1, simulation_duration_ms // record_every), decimation=record_every)
+        else:
+            self.simulation_data = SimulationRecorder(capacity=ring_capacity, decimation=record_every, ring=True)
 
-    def start_simulation(self, target_speed=100.0):
+    def start_simulation(self, target_speed=100.0, mode=MotorSimRunMode.MOTOR_SIM_ASAP, speed_factor=1.0):
+        """
+        运行仿真
+        :param target_speed: 目标转速（rpm）
+        :param mode: 运行模式（MotorSimRunMode）：
+                     ASAP 逐ms步进不等待墙钟；REALTIME 按speed_factor倍实时运行；
+                     MACRO_STEP 跳过没有控制器到期的区间，只在到期时刻完整步进并记录，
+                     到期时刻的状态与ASAP模式逐位一致，适合长时间稳态仿真
+        :param speed_factor: REALTIME模式下的倍速（1为实时，10为10倍实时）
+        :raises ValueError: 模式未知或倍速非正时抛出异常
+        """
+        if mode == MotorSimRunMode.MOTOR_SIM_REALTIME and speed_factor <= 0:
+            raise ValueError("speed_factor 需大于0")
+        if mode not in (MotorSimRunMode.MOTOR_SIM_ASAP, MotorSimRunMode.MOTOR_SIM_REALTIME,
+                        MotorSimRunMode.MOTOR_SIM_MACRO_STEP):
+            raise ValueError(f"未知的运行模式：{mode}")
         self.is_running = True
         self.controller.set_state(ControllerState.CONTROLLER_STATE_RUNNING)
         self.controller.set_target(target_speed)
 
-        for _ in range(self.simulation_duration_ms):
-            if not self.is_running:
-                break
-            self.time_sys.tick_inc(ms=1)
-            self.motor_manager.update_motor()
-            self.sensor.update()
-            self.controller.execute()
-            self._record_simulation_data()
+        if mode == MotorSimRunMode.MOTOR_SIM_MACRO_STEP:
+            self._run_macro_step()
+        else:
+            wall_start = time.perf_counter()
+            wall_per_ms = 0.001 / speed_factor
+            for step in range(1, self.simulation_duration_ms + 1):
+                if not self.is_running:
+                    break
+                self._step()
+                if mode == MotorSimRunMode.MOTOR_SIM_REALTIME:
+                    # 按绝对时刻对齐，sleep误差不累计；领先不足1ms时不睡眠，避免系统定时器粒度拖慢
+                    ahead = wall_start + step * wall_per_ms - time.perf_counter()
+                    if ahead > 0.001:
+                        time.sleep(ahead)
 
         self.is_running = False
+        if self.trace_sink is not None:
+            self.trace_sink.flush()
         print("仿真完成！")
 
+    def _step(self):
+        """完整步进1ms并记录"""
+        self.time_sys.tick_inc(ms=1)
+        self.motor_manager.update_motor()
+        self.sensor.update()
+        self.controller.execute()
+        self._record_simulation_data()
+
+    def _run_macro_step(self):
+        """
+        自适应宏步：到下一个控制器到期时刻之前，控制器输出不变，
+        时间系统一次前进、传感器以advance()连续推进（与逐步update()逐位一致），控制输出只需执行一次；
+        到期时刻做一次完整步进，只在完整步进后记录
+        """
+        time_sys = self.time_sys
+        ticks_per_ms = time_sys.TICKS_PER_MS
+        end = time_sys.get_ticks() + self.simulation_duration_ms * ticks_per_ms
+        while self.is_running:
+            now = time_sys.get_ticks()
+            if now >= end:
+                break
+            deadline = self.motor_manager.next_deadline()
+            if deadline is None or deadline > end:
+                deadline = end
+            # 到期时刻之前的空闲ms数
+            idle_ms = max(0, (deadline - now) // ticks_per_ms - 1)
+            if idle_ms:
+                time_sys.advance_ticks(idle_ms * ticks_per_ms)
+                self.sensor.advance(idle_ms)
+                self.controller.execute()
+            self._step()
+
     def stop_simulation(self):
         self.is_running = False
         self.controller.set_brake_mode(MotorBrakeMode.MOTOR_BRAKE_SOFTWARE)
         print("仿真已停止！")
 
+    def snapshot(self):
+        """
+        导出完整仿真状态的紧凑二进制快照（见 motorlib_snapshot）：时间、控制器目标/状态/下一次更新时间、
+        驱动状态、传感器读数与随机源状态、被控对象参数与状态，以及重建仿真所需的构造参数
+        已记录的数据、trace_sink与log_sys不属于快照
+        :return: bytes，可在本进程内恢复/分叉，也可发送到其他进程以 from_snapshot() 重建
+        """
+        config = (self.simulation_duration_ms, self.record_every, self.ring_capacity,
+                  isinstance(self.controller, PIDController))
+        return dumps((config, self.motor_manager.dump_state(), self.sensor.dump_state()))
+
+    def restore(self, data):
+        """
+        把snapshot()导出的状态恢复到本实例（已记录的数据保持不变），之后的仿真与快照时刻之后逐位一致
+        :raises ValueError: 快照格式无效，或控制器类型/被控对象有无与本实例不一致时抛出异常
+        """
+        self._load_state(loads(data))
+
+    def _load_state(self, state):
+        config, manager_state, sensor_state = state
+        if config[3] != isinstance(self.controller, PIDController):
+            raise ValueError("快照的控制器类型与仿真实例不一致")
+        self.sensor.load_state(sensor_state)
+        self.motor_manager.load_state(manager_state)
+
+    @classmethod
+    def from_snapshot(cls, data, **kwargs):
+        """
+        由snapshot()导出的快照新建仿真实例（数据记录为空），用于跨进程分发预热后的状态
+        :param data: 快照字节串
+        :param kwargs: 覆盖快照中的构造参数（simulation_duration_ms/record_every/ring_capacity），
+                       或给出新实例的trace_sink/log_sys
+        :raises ValueError: 快照格式无效时抛出异常
+        """
+        state = loads(data)
+        (duration_ms, record_every, ring_capacity, pid), _, sensor_state = state
+        options = dict(simulation_duration_ms=duration_ms, record_every=record_every, ring_capacity=ring_capacity)
+        options.update(kwargs)
+        core = cls(plant=DCMotorPlant() if sensor_state[-1] is not None else None,
+                   pid_gains=(0.0, 0.0, 0.0) if pid else None, **options)
+        core._load_state(state)
+        return core
+
+    def fork(self, **kwargs):
+        """
+        在本进程内分叉出状态相同、此后互相独立的仿真实例（经快照往返，随机源状态一并复制）
+        :param kwargs: 同from_snapshot
+        """
+        return type(self).from_snapshot(self.snapshot(), **kwargs)
+
     def _record_simulation_data(self):
-        current_time = self.time_sys.get_time()
-        total_ms = current_time[3] + current_time[2] * 1000 + current_time[1] * 60 * 1000 + current_time[
-            0] * 3600 * 1000
-        data = {
-            "time_ms": total_ms,
-            "speed": self.sensor.get_speed(),
-            "position": self.sensor.get_position(),
-            "current": self.sensor.get_current(),
-            "voltage": self.sensor.get_voltage(),
-            "target_speed": self.controller.Target,
-            "controller_state": self.controller.state
-        }
-        self.simulation_data.append(data)
+        sample = (self.time_sys.get_ticks() // self.time_sys.TICKS_PER_MS,
+                  self.sensor.get_speed(),
+                  self.sensor.get_position(),
+                  self.sensor.get_current(),
+                  self.sensor.get_voltage(),
+                  self.controller.Target,
+                  self.controller.state)
+        self.simulation_data.record(*sample)
+        if self.trace_sink is not None:
+            self.trace_sink.record(*sample)
 
     def get_simulation_data(self):
+        """
+        获取仿真数据记录器：data["speed"] 等列访问为零拷贝视图，
+        len(data)/data[i]/迭代 仍按旧的 list[dict] 形式工作（首次按行访问时惰性生成）；
+        返回值不是list，需要 list[dict] 时调用 data.to_rows()
+        """
         return self.simulation_data
\ No newline at end of file
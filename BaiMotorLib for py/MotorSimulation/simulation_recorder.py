@@ -0,0 +1,124 @@
+from array import array
+
+
+class SimulationRecorder:
+    """
+    列式仿真数据记录器：每列为预分配的定长类型数组（array），按行写入，不再为每个采样创建dict
+      - 增长模式（默认）：容量用尽时按倍数扩容
+      - 环形模式（ring=True）：容量固定，写满后覆盖最旧数据
+      - 抽取：decimation=k 时每k次record()只保存1次
+    兼容旧接口：支持 len()、下标取行（返回dict）、迭代（逐行dict）与 to_records()（惰性生成并缓存dict列表），
+    原先使用 list[dict] 形式仿真数据的代码无需修改；需要真正的 list（isinstance检查、修改、排序等）时用 to_rows()
+    """
+    # 列名与类型码：time_ms为int64，状态为int8，其余为double
+    COLUMNS = (("time_ms", "q"),
+               ("speed", "d"),
+               ("position", "d"),
+               ("current", "d"),
+               ("voltage", "d"),
+               ("target_speed", "d"),
+               ("controller_state", "b"))
+
+    def __init__(self, capacity=4096, decimation=1, ring=False):
+        """
+        :param capacity: 初始（增长模式）或固定（环形模式）容量，单位为行
+        :param decimation: 抽取因子，每decimation次record()保存一行
+        :param ring: 是否启用环形缓冲模式
+        :raises ValueError: 容量或抽取因子非正时抛出异常
+        """
+        if capacity <= 0 or decimation <= 0:
+            raise ValueError("capacity 与 decimation 均需为正整数")
+        self.capacity = capacity
+        self.decimation = decimation
+        self.ring = ring
+        self._columns = tuple(array(code, bytes(array(code).itemsize * capacity)) for _, code in self.COLUMNS)
+        self._head = 0        # 下一次写入的位置
+        self._length = 0      # 有效行数
+        self._calls = 0       # record()调用次数，用于抽取
+        self._records = None  # to_records()缓存，写入新数据后失效
+
+    def record(self, time_ms, speed, position, current, voltage, target_speed, controller_state):
+        """写入一行采样（按抽取因子可能被跳过）"""
+        self._calls += 1
+        if self._calls % self.decimation:
+            return
+        i = self._head
+        if i == self.capacity:
+            if self.ring:
+                i = 0
+            else:
+                self._grow()
+        t, s, p, c, v, ts, st = self._columns
+        t[i] = time_ms
+        s[i] = speed
+        p[i] = position
+        c[i] = current
+        v[i] = voltage
+        ts[i] = target_speed
+        st[i] = controller_state
+        self._head = i + 1
+        if self._length < self.capacity:
+            self._length += 1
+        self._records = None
+
+    def clear(self):
+        """清空已记录的数据（保留已分配的容量）"""
+        self._head = 0
+        self._length = 0
+        self._calls = 0
+        self._records = None
+
+    def column(self, name):
+        """
+        获取单列数据
+        :return: 未回绕时为底层数组的memoryview（零拷贝，扩容后仍指向扩容前的数据快照）；
+                 环形模式回绕后需按时间顺序拼接，返回拷贝
+        """
+        col = self._columns[self._column_index(name)]
+        if self._length < self.capacity or self._head == self.capacity:
+            return memoryview(col)[:self._length]
+        return memoryview(col[self._head:] + col[:self._head])
+
+    def columns(self):
+        """获取全部列：dict 列名 → column(name)"""
+        return {name: self.column(name) for name, _ in self.COLUMNS}
+
+    def to_rows(self):
+        """按旧格式返回新建的 list[dict]（每次调用都生成独立的列表与dict，调用方可任意修改）"""
+        cols = [self.column(name).tolist() for name, _ in self.COLUMNS]
+        names = [name for name, _ in self.COLUMNS]
+        return [dict(zip(names, row)) for row in zip(*cols)]
+
+    def to_records(self):
+        """按旧格式返回 list[dict]，首次调用时生成并缓存（与记录器共享，只读使用；需要修改时用 to_rows()）"""
+        if self._records is None:
+            self._records = self.to_rows()
+        return self._records
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, key):
+        """字符串键返回列，整数/切片返回行dict（兼容旧的list[dict]用法）"""
+        if isinstance(key, str):
+            return self.column(key)
+        return self.to_records()[key]
+
+    def __iter__(self):
+        return iter(self.to_records())
+
+    def _grow(self):
+        """增长模式扩容：新建两倍容量的数组并复制，已导出的memoryview不受影响"""
+        grown = []
+        for col in self._columns:
+            new_col = array(col.typecode, col)
+            new_col.frombytes(bytes(col.itemsize * self.capacity))
+            grown.append(new_col)
+        self._columns = tuple(grown)
+        self.capacity *= 2
+
+    def _column_index(self, name):
+        for i, (col_name, _) in enumerate(self.COLUMNS):
+            if col_name == name:
+                return i
+        raise KeyError(name)
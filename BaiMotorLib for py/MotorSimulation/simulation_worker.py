@@ -0,0 +1,201 @@
+import time
+from collections import deque
+
+import numpy as np
+from PyQt5.QtCore import QObject, QTimer, Qt, pyqtSlot
+
+from BaiMotorLib.common.constants import ControllerState, MotorBrakeMode, MotorReplayCommand
+
+
+class SnapshotChannel:
+    """
+    仿真线程 → 界面线程的单生产者/单消费者通道，不使用锁：
+      - 采样数据块放入 deque（CPython中append/popleft为原子操作），界面落后过多时丢弃最旧的数据块
+      - 最新状态快照以不可变dict整体替换引用，读者总能读到一个完整快照
+    """
+
+    def __init__(self, max_blocks=1024):
+        """
+        :param max_blocks: 最多缓存的数据块数量
+        """
+        self._blocks = deque(maxlen=max_blocks)
+        self.latest = None
+
+    def publish(self, block, snapshot):
+        """
+        仿真线程调用：发布一批采样与最新状态
+        :param block: 形状为 (通道数, n) 的采样数组，None 表示本次没有新采样
+        :param snapshot: 最新状态dict（发布后不可再修改）
+        """
+        if block is not None:
+            self._blocks.append(block)
+        self.latest = snapshot
+
+    def drain(self):
+        """界面线程调用：取出所有未读的数据块"""
+        blocks = []
+        try:
+            while True:
+                blocks.append(self._blocks.popleft())
+        except IndexError:
+            pass
+        return blocks
+
+
+class SimulationWorker(QObject):
+    """
+    在独立QThread中运行的仿真循环：
+      - 定时器在线程启动后（start_loop槽）于工作线程内创建，回调在工作线程执行，界面卡顿不影响仿真节拍
+      - 按墙钟流逝时间批量追赶步进，每批采样打包为一个数组经SnapshotChannel发布
+      - 界面线程的启停/刹车指令经无锁队列投递，在下一个tick边界统一执行，仿真对象只被工作线程访问
+    """
+    # 发布的采样通道顺序
+    CHANNELS = ("time_ms", "speed", "current", "target_speed")
+
+    def __init__(self, time_sys, motor_manager, sensor, motor_driver, controller, channel,
+                 trace_sink=None, max_catchup_steps=200, interval_ms=1, speed_factor=1.0, recorder=None):
+        """
+        :param channel: SnapshotChannel，采样与状态快照的输出通道
+        :param trace_sink: 流式落盘输出端（在工作线程中写入）
+        :param max_catchup_steps: 单次回调最多追赶的步数，超出部分视为丢弃（仿真时间放慢）
+        :param interval_ms: 工作线程定时器周期（ms）
+        :param speed_factor: 仿真倍速（1为实时，N为N倍实时），单次回调步数仍受max_catchup_steps限制
+        :param recorder: 指令录制器（CommandRecorder），启动/刹车指令在执行的tick边界同时录制（电机编号0），
+                         停止工作线程时关闭
+        """
+        super().__init__()
+        self.time_sys = time_sys
+        self.motor_manager = motor_manager
+        self.sensor = sensor
+        self.motor_driver = motor_driver
+        self.controller = controller
+        self.channel = channel
+        self.trace_sink = trace_sink
+        self.max_catchup_steps = max_catchup_steps
+        self.interval_ms = interval_ms
+        self.speed_factor = speed_factor
+        self.recorder = recorder
+        self.running = False
+        self.timer = None
+        self._commands = deque()
+        self._wall_start = 0.0
+        self._steps_done = 0
+        self._steps_total = 0  # 累计步数（供界面统计步速）
+        self._scratch = np.empty((len(self.CHANNELS), max_catchup_steps))
+
+    # ---- 界面线程接口：只投递指令，不直接触碰仿真对象 ----
+    def request_start(self, target_speed):
+        """请求以目标转速启动仿真"""
+        self._commands.append((self._cmd_start, (target_speed,)))
+
+    def request_stop(self):
+        """请求停止仿真循环（不刹车）"""
+        self._commands.append((self._cmd_stop, ()))
+
+    def request_brake(self, brake_mode=MotorBrakeMode.MOTOR_BRAKE_HARDWARE):
+        """请求刹车并停止仿真循环"""
+        self._commands.append((self._cmd_brake, (brake_mode,)))
+
+    def request_speed_factor(self, speed_factor):
+        """请求修改仿真倍速（从当前时刻起按新倍速计时）"""
+        self._commands.append((self._cmd_speed_factor, (speed_factor,)))
+
+    # ---- 工作线程 ----
+    @pyqtSlot()
+    def start_loop(self):
+        """连接到QThread.started：在工作线程中创建并启动定时器"""
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setInterval(self.interval_ms)
+        self.timer.timeout.connect(self._on_timer)
+        self.timer.start()
+        self._publish(None)
+
+    @pyqtSlot()
+    def stop_loop(self):
+        """在工作线程中停止并释放定时器（线程退出前调用，定时器只能由所属线程停止）"""
+        if self.timer is not None:
+            self.timer.stop()
+            self.timer.deleteLater()
+            self.timer = None
+        if self.trace_sink is not None:
+            self.trace_sink.flush()
+        if self.recorder is not None:
+            self.recorder.close()
+
+    def _on_timer(self):
+        """执行待处理指令，然后按墙钟时间批量推进仿真"""
+        while self._commands:
+            func, args = self._commands.popleft()
+            func(*args)
+        if not self.running:
+            return
+
+        due_steps = int((time.perf_counter() - self._wall_start) * 1000 * self.speed_factor) - self._steps_done
+        if due_steps > self.max_catchup_steps:
+            self._wall_start += (due_steps - self.max_catchup_steps) / 1000 / self.speed_factor
+            due_steps = self.max_catchup_steps
+        if due_steps <= 0:
+            return
+        scratch = self._scratch
+        for k in range(due_steps):
+            scratch[:, k] = self._step_simulation()
+        self._steps_done += due_steps
+        self._steps_total += due_steps
+        self._publish(scratch[:, :due_steps].copy())
+
+    def _step_simulation(self):
+        """仿真核心步长（1ms）：更新时间→更新电机→更新传感器→执行输出→落盘，返回曲线通道采样"""
+        self.time_sys.tick_inc(ms=1)
+        self.motor_manager.update_motor()
+        self.sensor.update()
+        self.controller.execute()
+        total_ms = self.time_sys.get_ticks() // self.time_sys.TICKS_PER_MS
+        speed = self.sensor.get_speed()
+        current = self.sensor.get_current()
+        if self.trace_sink is not None:
+            self.trace_sink.record(total_ms, speed, self.sensor.get_position(), current,
+                                   self.sensor.get_voltage(), self.controller.Target, self.controller.state)
+        return total_ms, speed, current, self.motor_driver.get_target_speed()
+
+    def _publish(self, block):
+        """发布采样块与最新状态快照"""
+        self.channel.publish(block, {
+            "time_ms": self.time_sys.get_ticks() // self.time_sys.TICKS_PER_MS,
+            "speed": self.sensor.get_speed(),
+            "target_speed": self.motor_driver.get_target_speed(),
+            "current": self.sensor.get_current(),
+            "voltage": self.sensor.get_voltage(),
+            "position": self.sensor.get_position(),
+            "running": self.running,
+            "steps_total": self._steps_total,
+        })
+
+    def _cmd_start(self, target_speed):
+        self.controller.set_target(target_speed)
+        self.controller.set_state(ControllerState.CONTROLLER_STATE_RUNNING)
+        if self.recorder is not None:
+            self.recorder.record(MotorReplayCommand.MOTOR_CMD_SET_TARGET, 0, target_speed)
+            self.recorder.record(MotorReplayCommand.MOTOR_CMD_SET_STATE, 0, ControllerState.CONTROLLER_STATE_RUNNING)
+        self.running = True
+        self._wall_start = time.perf_counter()
+        self._steps_done = 0
+
+    def _cmd_speed_factor(self, speed_factor):
+        if speed_factor <= 0:
+            return
+        # 以当前进度为新起点，倍速切换不会引起步数跳变
+        self._wall_start = time.perf_counter() - self._steps_done / 1000 / speed_factor
+        self.speed_factor = speed_factor
+
+    def _cmd_stop(self):
+        self.running = False
+        if self.trace_sink is not None:
+            self.trace_sink.flush()
+        self._publish(None)
+
+    def _cmd_brake(self, brake_mode):
+        self.controller.set_brake_mode(brake_mode)
+        if self.recorder is not None:
+            self.recorder.record(MotorReplayCommand.MOTOR_CMD_SET_BRAKE, 0, brake_mode)
+        self._cmd_stop()
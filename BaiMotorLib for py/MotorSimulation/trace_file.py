@@ -0,0 +1,226 @@
+"""
+仿真数据流式落盘：采样边产生边写入磁盘，长时间仿真不再受内存限制
+
+文件布局（小端）：
+    文件头 32字节：magic(8s) | 版本(H) | 格式(H) | 单条记录字节数(I) | 保留(16x)
+    格式 TRACE_FORMAT_RAW     ：文件头之后为连续的定长记录，可直接用 numpy.memmap 零拷贝打开
+    格式 TRACE_FORMAT_CHUNKED ：文件头之后为若干数据块，每块为
+                               块头 24字节：首条time_ms(q) | 末条time_ms(q) | 行数(I) | 压缩后字节数(I)
+                               + zlib压缩的定长记录
+定长记录 56字节：time_ms(q) | speed, position, current, voltage, target_speed(5d) | controller_state(i) | 填充(4x)
+"""
+import struct
+import zlib
+
+import numpy as np
+
+TRACE_MAGIC = b"BMLTRACE"
+TRACE_VERSION = 1
+TRACE_FORMAT_RAW = 0
+TRACE_FORMAT_CHUNKED = 1
+
+HEADER = struct.Struct("<8sHHI16x")
+RECORD = struct.Struct("<q5di4x")
+CHUNK_HEADER = struct.Struct("<qqII")
+
+# 与RECORD逐字节对应的NumPy结构化类型
+RECORD_DTYPE = np.dtype({
+    "names": ["time_ms", "speed", "position", "current", "voltage", "target_speed", "controller_state"],
+    "formats": ["<i8", "<f8", "<f8", "<f8", "<f8", "<f8", "<i4"],
+    "offsets": [0, 8, 16, 24, 32, 40, 48],
+    "itemsize": RECORD.size,
+})
+
+
+class TraceFileSink:
+    """
+    定长二进制流式写入：采样先打包进预分配的缓冲区，缓冲区写满后整体写入文件
+    record() 的参数与 SimulationRecorder.record 一致，可直接作为仿真数据的输出端
+    """
+
+    def __init__(self, path, buffer_rows=4096):
+        """
+        :param path: 输出文件路径（覆盖写）
+        :param buffer_rows: 缓冲区行数，写满后落盘一次
+        """
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(TRACE_MAGIC, TRACE_VERSION, TRACE_FORMAT_RAW, RECORD.size))
+        self._buffer = bytearray(RECORD.size * buffer_rows)
+        self._buffer_rows = buffer_rows
+        self._rows = 0
+        self.rows_written = 0
+
+    def record(self, time_ms, speed, position, current, voltage, target_speed, controller_state):
+        """写入一行采样"""
+        RECORD.pack_into(self._buffer, self._rows * RECORD.size,
+                         time_ms, speed, position, current, voltage, target_speed, controller_state)
+        self._rows += 1
+        if self._rows == self._buffer_rows:
+            self.flush()
+
+    def flush(self):
+        """把缓冲区中的采样写入文件"""
+        if self._rows:
+            self._file.write(memoryview(self._buffer)[:self._rows * RECORD.size])
+            self.rows_written += self._rows
+            self._rows = 0
+        self._file.flush()
+
+    def close(self):
+        """落盘剩余数据并关闭文件"""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class ChunkedTraceSink(TraceFileSink):
+    """
+    分块压缩流式写入：每 chunk_rows 行压缩为一个数据块，块头记录时间范围，读取时可跳过无关数据块
+    """
+
+    def __init__(self, path, chunk_rows=65536, level=6):
+        """
+        :param path: 输出文件路径（覆盖写）
+        :param chunk_rows: 每个数据块的行数
+        :param level: zlib压缩等级（0~9）
+        """
+        super().__init__(path, buffer_rows=chunk_rows)
+        self._level = level
+        self._file.seek(0)
+        self._file.write(HEADER.pack(TRACE_MAGIC, TRACE_VERSION, TRACE_FORMAT_CHUNKED, RECORD.size))
+
+    def flush(self):
+        """把缓冲区中的采样压缩为一个数据块写入文件"""
+        if self._rows:
+            raw = memoryview(self._buffer)[:self._rows * RECORD.size]
+            first_time = RECORD.unpack_from(raw, 0)[0]
+            last_time = RECORD.unpack_from(raw, (self._rows - 1) * RECORD.size)[0]
+            payload = zlib.compress(raw, self._level)
+            self._file.write(CHUNK_HEADER.pack(first_time, last_time, self._rows, len(payload)))
+            self._file.write(payload)
+            self.rows_written += self._rows
+            self._rows = 0
+        self._file.flush()
+
+
+def open_trace_memmap(path):
+    """
+    以 numpy.memmap 零拷贝打开定长格式的轨迹文件
+    :return: 结构化数组（dtype=RECORD_DTYPE），按列访问如 data["speed"]
+    :raises ValueError: 文件不是定长格式时抛出异常
+    """
+    with TraceReader(path) as reader:
+        if reader.format != TRACE_FORMAT_RAW:
+            raise ValueError("只有定长格式（TRACE_FORMAT_RAW）的轨迹文件支持memmap")
+        rows = reader.rows
+    return np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER.size, shape=(rows,))
+
+
+class TraceReader:
+    """
+    轨迹文件读取：按时间范围定位数据，无需载入整个文件
+      - 定长格式：在time_ms列上二分查找（每次探测只读8字节），再按偏移读取目标区间
+      - 分块格式：顺序读取块头并跳过时间范围不相交的数据块，只解压相交的数据块
+    要求文件中的time_ms单调不减（仿真输出天然满足）
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        try:
+            header = self._file.read(HEADER.size)
+            if len(header) != HEADER.size:
+                raise ValueError(f"轨迹文件不完整：{path}")
+            magic, version, self.format, record_size = HEADER.unpack(header)
+            if magic != TRACE_MAGIC:
+                raise ValueError(f"不是BaiMotorLib轨迹文件：{path}")
+            if version != TRACE_VERSION or record_size != RECORD.size:
+                raise ValueError(f"不支持的轨迹文件版本：{version}（记录长度 {record_size}）")
+            self._file.seek(0, 2)
+            self._size = self._file.tell()
+            if self.format == TRACE_FORMAT_RAW:
+                self.rows = (self._size - HEADER.size) // RECORD.size
+            else:
+                self.rows = sum(rows for _, _, rows, _, _ in self._chunks())
+        except BaseException:
+            # 文件头校验失败时不遗留打开的文件
+            self._file.close()
+            raise
+
+    def read_range(self, start_ms, end_ms):
+        """
+        读取 start_ms ≤ time_ms ≤ end_ms 的全部采样
+        :return: 结构化数组（dtype=RECORD_DTYPE）
+        """
+        if self.format == TRACE_FORMAT_RAW:
+            first = self._search(lambda t: t < start_ms)
+            last = self._search(lambda t: t <= end_ms)
+            return self._read_rows(first, last - first)
+
+        parts = []
+        for first_time, last_time, rows, offset, length in self._chunks():
+            if last_time < start_ms or first_time > end_ms:
+                continue
+            self._file.seek(offset)
+            chunk = np.frombuffer(zlib.decompress(self._file.read(length)), dtype=RECORD_DTYPE, count=rows)
+            mask = (chunk["time_ms"] >= start_ms) & (chunk["time_ms"] <= end_ms)
+            parts.append(chunk[mask])
+        if not parts:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        return np.concatenate(parts)
+
+    def read_all(self):
+        """读取全部采样"""
+        if self.format == TRACE_FORMAT_RAW:
+            return self._read_rows(0, self.rows)
+        return self.read_range(np.iinfo(np.int64).min, np.iinfo(np.int64).max)
+
+    def close(self):
+        self._file.close()
+
+    def __len__(self):
+        return self.rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _time_at(self, row):
+        """读取定长格式第row行的time_ms"""
+        self._file.seek(HEADER.size + row * RECORD.size)
+        return struct.unpack("<q", self._file.read(8))[0]
+
+    def _search(self, before):
+        """二分查找第一个不满足before(time)的行号"""
+        low, high = 0, self.rows
+        while low < high:
+            mid = (low + high) // 2
+            if before(self._time_at(mid)):
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def _read_rows(self, first, count):
+        """按行偏移读取定长格式的连续记录"""
+        if count <= 0:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        self._file.seek(HEADER.size + first * RECORD.size)
+        return np.frombuffer(self._file.read(count * RECORD.size), dtype=RECORD_DTYPE, count=count)
+
+    def _chunks(self):
+        """遍历分块格式的块头：yield (首条time_ms, 末条time_ms, 行数, 数据偏移, 压缩字节数)"""
+        offset = HEADER.size
+        while offset + CHUNK_HEADER.size <= self._size:
+            self._file.seek(offset)
+            first_time, last_time, rows, length = CHUNK_HEADER.unpack(self._file.read(CHUNK_HEADER.size))
+            offset += CHUNK_HEADER.size
+            yield first_time, last_time, rows, offset, length
+            offset += length
@@ -0,0 +1,60 @@
+"""
+asyncio运行时节拍基准：N台电机按1ms节拍运行，同时挂一个快订阅者与一个慢订阅者，
+统计实际tick数与墙钟应有tick数之比、补跑/放弃的tick数，以及慢订阅者丢弃的采样数
+
+运行方式（在 "BaiMotorLib for py" 目录下）：
+    python -m benchmarks.bench_async_runtime --motors 100 --seconds 2
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from BaiMotorLib.common.async_motor_runtime import AsyncMotorRuntime
+from BaiMotorLib.common.constants import ControllerState, MotorSchedulerMode
+from benchmarks.bench_suite import _build_fleet
+
+
+async def run(motors, seconds, period_ms, slow_delay_ms):
+    _, manager, _, sensors = _build_fleet(motors, MotorSchedulerMode.MOTOR_SCHED_HEAP, 10)
+    runtime = AsyncMotorRuntime(manager, sensors, period_ms=period_ms)
+    fast = runtime.subscribe(maxsize=4096)
+    slow = runtime.subscribe(maxsize=16)
+    received = [0]
+
+    async def consume_fast():
+        async for _ in fast:
+            received[0] += 1
+
+    async def consume_slow():
+        async for _ in slow:
+            await asyncio.sleep(slow_delay_ms / 1000)
+
+    async with runtime:
+        consumers = [asyncio.create_task(consume_fast()), asyncio.create_task(consume_slow())]
+        await runtime.set_state(ControllerState.CONTROLLER_STATE_RUNNING)
+        start = time.monotonic()
+        await asyncio.sleep(seconds)
+        elapsed = time.monotonic() - start
+    await asyncio.gather(*consumers)
+    expected = elapsed * 1000 / period_ms
+    print(f"电机 {motors}：tick {runtime.ticks}（应有 {expected:.0f}，{runtime.ticks / expected:.1%}）  "
+          f"补跑 {runtime.catch_up_ticks}  放弃 {runtime.skipped_ticks}  "
+          f"快订阅收到 {received[0]}  慢订阅丢弃 {slow.dropped}")
+    return runtime.skipped_ticks
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="asyncio运行时节拍基准")
+    parser.add_argument("--motors", default="1,100,1000", help="电机数量列表，逗号分隔")
+    parser.add_argument("--seconds", type=float, default=2.0, help="每项运行的墙钟时长（s）")
+    parser.add_argument("--period-ms", type=float, default=1.0, help="节拍周期（ms）")
+    parser.add_argument("--slow-delay-ms", type=float, default=50.0, help="慢订阅者处理每个采样的耗时（ms）")
+    args = parser.parse_args(argv)
+    for motors in (int(m) for m in args.motors.split(",")):
+        asyncio.run(run(motors, args.seconds, args.period_ms, args.slow_delay_ms))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
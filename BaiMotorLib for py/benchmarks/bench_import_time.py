@@ -0,0 +1,93 @@
+"""
+导入耗时基准：在全新子进程中以 python -X importtime 导入各目标，统计累计导入耗时，
+并检查无界面目标没有间接导入重型依赖（PyQt5/pyqtgraph/numpy/asyncio/multiprocessing）
+
+结果格式与 bench_suite 相同（rate = 每秒可完成的导入次数，越大越好），可用 --baseline 做回归检查；
+重型依赖被意外导入时直接判定失败
+
+运行方式（在 "BaiMotorLib for py" 目录下）：
+    python -m benchmarks.bench_import_time --output import.json
+    python -m benchmarks.bench_import_time --baseline import.json --threshold 0.5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.bench_suite import compare
+
+PACKAGES = ("BaiMotorLib", "MotorSimulation")
+# 目标名 → (导入语句, 不允许出现的顶层模块)
+HEAVY = ("PyQt5", "pyqtgraph", "numpy", "matplotlib", "asyncio", "multiprocessing")
+TARGETS = {
+    "BaiMotorLib": ("import BaiMotorLib", HEAVY),
+    "BaiMotorLib.common": ("import BaiMotorLib.common", HEAVY),
+    "BaiMotorLib.drivers.virtual": ("import BaiMotorLib.drivers.virtual", HEAVY),
+    "MotorManager": ("from BaiMotorLib.common.motor_manager import MotorManager", HEAVY),
+    "MotorSimulation": ("import MotorSimulation", HEAVY),
+    "MotorSimulationCore": ("from MotorSimulation import MotorSimulationCore", HEAVY),
+}
+
+
+def measure(statement, rounds):
+    """
+    在子进程中执行导入语句rounds次，取最快一次
+    :return: (累计导入耗时us, 导入过的顶层模块集合)
+    """
+    best = None
+    modules = set()
+    for _ in range(rounds):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], capture_output=True,
+                              text=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        if proc.returncode:
+            raise RuntimeError(f"导入失败：{statement}\n{proc.stderr}")
+        total = 0
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, cumulative, name = line.split("|")
+            if not cumulative.strip().isdigit():
+                continue
+            package = name.strip().split(".")[0]
+            # 缩进为0的本项目模块行是导入语句直接触发的导入，其累计值（含间接依赖）之和即总耗时；
+            # 解释器启动阶段的导入（site、encodings等）不计入
+            if not name[1:].startswith(" ") and package in PACKAGES:
+                total += int(cumulative)
+            modules.add(package)
+        best = total if best is None else min(best, total)
+    return best, modules
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="导入耗时基准")
+    parser.add_argument("--rounds", type=int, default=5, help="每个目标的子进程次数（取最快一次）")
+    parser.add_argument("--output", help="结果JSON输出路径")
+    parser.add_argument("--baseline", help="基线JSON路径，给出时与之比较")
+    parser.add_argument("--threshold", type=float, default=0.5, help="允许的相对基线性能下降比例")
+    args = parser.parse_args(argv)
+
+    results = {}
+    failed = False
+    for name, (statement, forbidden) in TARGETS.items():
+        us, modules = measure(statement, args.rounds)
+        leaked = sorted(set(forbidden) & modules)
+        results[f"import/{name}"] = {"rate": 1e6 / max(us, 1), "import_us": us, "heavy_modules": leaked}
+        print(f"{name:30s} {us / 1000:8.2f} ms" + (f"   重型依赖：{', '.join(leaked)}" if leaked else ""))
+        failed = failed or bool(leaked)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({"results": results}, file, ensure_ascii=False, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for name, rate, base, ratio in regressions:
+            print(f"REGRESSION {name}: {1e6 / rate:.0f}us vs 基线 {1e6 / base:.0f}us")
+        failed = failed or bool(regressions)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
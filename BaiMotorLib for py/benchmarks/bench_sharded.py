@@ -0,0 +1,50 @@
+"""
+分片管理器扩展性基准：固定电机数，分片（进程）数从1增加到CPU核数，统计电机·步/秒与相对单分片的加速比
+
+运行方式（在 "BaiMotorLib for py" 目录下）：
+    python -m benchmarks.bench_sharded --motors 10000 --ticks 200
+"""
+import argparse
+import os
+import sys
+import time
+
+from BaiMotorLib.common.constants import ControllerState
+from BaiMotorLib.common.sharded_motor_manager import ShardedMotorManager
+
+
+def run(motors, shards, ticks, batch):
+    """
+    运行一次基准（不含进程启动与电机构造时间）
+    :return: 电机·步/秒
+    """
+    with ShardedMotorManager(motors, num_shards=shards, factory_kwargs={"seed": 0}) as manager:
+        manager.set_state(ControllerState.CONTROLLER_STATE_RUNNING)
+        manager.set_target(100.0)
+        start = time.perf_counter()
+        for _ in range(ticks // batch):
+            manager.step(batch)
+        elapsed = time.perf_counter() - start
+    return motors * (ticks // batch) * batch / elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="分片管理器扩展性基准")
+    parser.add_argument("--motors", type=int, default=10000, help="电机总数")
+    parser.add_argument("--ticks", type=int, default=200, help="仿真tick数（ms）")
+    parser.add_argument("--batch", type=int, default=1, help="每轮屏障同步推进的tick数")
+    parser.add_argument("--max-shards", type=int, default=os.cpu_count() or 1, help="最大分片数")
+    args = parser.parse_args(argv)
+
+    base = None
+    shards = 1
+    while shards <= args.max_shards:
+        rate = run(args.motors, shards, args.ticks, args.batch)
+        base = base or rate
+        print(f"{shards:3d} 分片：{rate:14.0f} 电机·步/秒  加速比 {rate / base:5.2f}")
+        shards *= 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
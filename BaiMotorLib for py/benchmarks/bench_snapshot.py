@@ -0,0 +1,74 @@
+"""
+快照预热基准：把一次预热后的仿真状态导出为快照，比较“从快照分叉出各分支”与“每个分支都从时间零点重新预热”的耗时，
+同时统计快照大小、导出/恢复耗时；分支结果与不中断运行逐位不一致即判定为回归（退出码1）
+
+运行方式（在 "BaiMotorLib for py" 目录下）：
+    python -m benchmarks.bench_snapshot --warmup-ms 60000 --branch-ms 1000 --branches 8
+"""
+import argparse
+import contextlib
+import io
+import sys
+import time
+
+from BaiMotorLib.drivers.virtual.dc_motor_plant import DCMotorPlant
+from MotorSimulation.simulation_core import MotorSimulationCore
+
+
+def _run(core, target_speed):
+    """运行一段仿真并返回记录的全部行"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        core.start_simulation(target_speed)
+    data = core.get_simulation_data()
+    return [tuple(row.values()) for row in data]
+
+
+def _new_core(duration_ms, ring_capacity):
+    return MotorSimulationCore(simulation_duration_ms=duration_ms, seed=0, plant=DCMotorPlant(),
+                               pid_gains=(0.5, 2.0, 0.0), ring_capacity=ring_capacity)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="快照预热基准")
+    parser.add_argument("--warmup-ms", type=int, default=60000, help="预热时长（仿真ms）")
+    parser.add_argument("--branch-ms", type=int, default=1000, help="每个分支的仿真时长（ms）")
+    parser.add_argument("--branches", type=int, default=8, help="分支数量（各分支目标转速不同）")
+    args = parser.parse_args(argv)
+    targets = [800.0 + 50.0 * i for i in range(args.branches)]
+
+    start = time.perf_counter()
+    warm = _new_core(args.warmup_ms, 1)
+    _run(warm, 1000.0)
+    warmup_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    snapshot = warm.snapshot()
+    dump_us = (time.perf_counter() - start) * 1e6
+    start = time.perf_counter()
+    branches = [MotorSimulationCore.from_snapshot(snapshot, simulation_duration_ms=args.branch_ms,
+                                                  ring_capacity=None) for _ in targets]
+    restore_us = (time.perf_counter() - start) * 1e6 / len(targets)
+
+    start = time.perf_counter()
+    forked = [_run(core, target) for core, target in zip(branches, targets)]
+    fork_s = time.perf_counter() - start + (dump_us + restore_us * len(targets)) * 1e-6
+
+    # 对照：每个分支都从零重新预热，环形记录只保留分支区间（最后一个分支即不中断运行，用于逐位比较）
+    start = time.perf_counter()
+    for target in targets:
+        cold = _new_core(args.warmup_ms, args.branch_ms)
+        _run(cold, 1000.0)
+        cold.simulation_duration_ms = args.branch_ms
+        reference = _run(cold, target)
+    cold_s = time.perf_counter() - start
+    ok = reference == forked[-1]
+
+    print(f"预热 {args.warmup_ms} ms：{warmup_s:.3f}s  快照 {len(snapshot)} 字节，"
+          f"导出 {dump_us:.0f}us，恢复 {restore_us:.0f}us/分支")
+    print(f"{len(targets)} 个分支：快照分叉 {fork_s:.3f}s，重新预热 {cold_s:.3f}s，"
+          f"加速比 {cold_s / fork_s:.1f}  {'OK' if ok else 'MISMATCH'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+"""
+无界面基准套件：测量tick流水线与仿真核心的吞吐量，输出JSON并与基线比较
+
+包含两类基准（结果中的 rate 字段越大越好，用于基线比较）：
+  - micro/*    ：单项操作吞吐（次/秒）：tick_inc、compare_time、OpenLoopController.update、
+                 MotorSimulationCore.start_simulation（仿真ms/墙钟秒）
+  - pipeline/* ：N台电机的完整步进流水线（仿真ms/墙钟秒），并给出各阶段每步耗时
+                 场景：steady（恒速运行）、brake_storm（周期性成批刹车/释放）、target_step（周期性全体阶跃目标）
+
+运行方式（在 "BaiMotorLib for py" 目录下）：
+    python -m benchmarks.bench_suite --output bench.json
+    python -m benchmarks.bench_suite --baseline benchmarks/baseline.json --threshold 0.2
+
+benchmarks/baseline.json 为仓库中的参考基线，重新生成方法见 README.md 的“基准测试”一节
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import time
+
+from BaiMotorLib.common.motor_manager import MotorManager
+from BaiMotorLib.common.motorlib_time_sys import MotorlibTimeSys
+from BaiMotorLib.common.constants import ControllerState, MotorBrakeMode, MotorSchedulerMode
+from BaiMotorLib.drivers.virtual.pyqt5_motor import VirtualMotor, VirtualMotorDriver
+from BaiMotorLib.drivers.virtual.pyqt5_sensor import VirtualSensor, make_sensor_rngs
+from BaiMotorLib.controllers.virtual.pyqt5_controller import OpenLoopController
+from MotorSimulation.simulation_core import MotorSimulationCore
+
+SCENARIOS = ("steady", "brake_storm", "target_step")
+SCHEDULERS = {"linear": MotorSchedulerMode.MOTOR_SCHED_LINEAR,
+              "heap": MotorSchedulerMode.MOTOR_SCHED_HEAP}
+STAGES = ("tick_inc", "update_motor", "sensor_update", "execute", "scenario")
+
+
+def _rate(func, repeat, rounds):
+    """执行func共repeat次，重复rounds轮取最快一轮，返回 (次/秒, 耗时秒)"""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return repeat / best, best
+
+
+def bench_micro(repeat, rounds=3):
+    """单项操作基准（取rounds轮中最快一轮，降低调度抖动的影响）"""
+    results = {}
+    time_sys = MotorlibTimeSys()
+    results["micro/tick_inc"] = _rate(lambda: time_sys.tick_inc(ms=1), repeat, rounds)
+    results["micro/compare_time"] = _rate(lambda: time_sys.compare_time(500, 30, 1, 0), repeat, rounds)
+
+    controller = OpenLoopController(motor_driver=VirtualMotorDriver())
+    controller.bind_time_sys(time_sys)
+    controller.set_state(ControllerState.CONTROLLER_STATE_RUNNING)
+    controller.set_target(100.0)
+    results["micro/openloop_update"] = _rate(controller.update, repeat, rounds)
+
+    sim_ms = max(1, repeat // 100)
+    best = float("inf")
+    for _ in range(rounds):
+        core = MotorSimulationCore(simulation_duration_ms=sim_ms, seed=0)
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            core.start_simulation(100.0)
+            best = min(best, time.perf_counter() - start)
+    results["micro/simulation_core"] = (sim_ms / best, best)
+    return {name: {"rate": rate, "wall_seconds": elapsed} for name, (rate, elapsed) in results.items()}
+
+
+def _build_fleet(motors, scheduler, period_ms):
+    """构建N台电机（各自的驱动/控制器/传感器），控制器相位错开"""
+    time_sys = MotorlibTimeSys()
+    controllers = []
+    sensors = [VirtualSensor(rng=rng) for rng in make_sensor_rngs(0, motors)]
+    motor_list = []
+    for i in range(motors):
+        controller = OpenLoopController(motor_driver=VirtualMotorDriver())
+        controller.set_update_period(period_ms, i % period_ms)
+        controller.set_state(ControllerState.CONTROLLER_STATE_RUNNING)
+        controller.set_target(100.0)
+        controllers.append(controller)
+        motor_list.append(VirtualMotor(driver=controller.MotorDriver, controller=controller))
+    manager = MotorManager(time_sys, *motor_list, scheduler=scheduler)
+    return time_sys, manager, controllers, sensors
+
+
+def _scenario_action(scenario, controllers):
+    """
+    返回每步调用的场景动作 action(step)：
+      - steady：无动作
+      - brake_storm：每50ms让1/4的电机刹车，下一个50ms释放
+      - target_step：每100ms全体目标转速在100/1000rpm之间切换
+    """
+    if scenario == "steady":
+        return None
+    if scenario == "brake_storm":
+        def action(step):
+            if step % 50:
+                return
+            group = (step // 50) % 8
+            mode = MotorBrakeMode.MOTOR_BRAKE_SOFTWARE if group % 2 == 0 else MotorBrakeMode.MOTOR_BRAKE_NONE
+            for controller in controllers[(group // 2)::4]:
+                controller.set_brake_mode(mode)
+        return action
+    if scenario == "target_step":
+        def action(step):
+            if step % 100 == 0:
+                target = 1000.0 if (step // 100) % 2 else 100.0
+                for controller in controllers:
+                    controller.set_target(target)
+        return action
+    raise ValueError(f"未知场景：{scenario}")
+
+
+def bench_pipeline(motors, scenario, scheduler, sim_ms, period_ms):
+    """
+    完整流水线基准：tick_inc → update_motor → 传感器更新 → 控制输出，外加场景动作
+    :return: dict，rate为仿真ms/墙钟秒，stage_us为各阶段平均每步耗时（us）
+    """
+    time_sys, manager, controllers, sensors = _build_fleet(motors, scheduler, period_ms)
+    action = _scenario_action(scenario, controllers)
+    stage_time = dict.fromkeys(STAGES, 0.0)
+    clock = time.perf_counter
+    start = clock()
+    for step in range(1, sim_ms + 1):
+        t0 = clock()
+        time_sys.tick_inc(ms=1)
+        t1 = clock()
+        manager.update_motor()
+        t2 = clock()
+        for sensor in sensors:
+            sensor.update()
+        t3 = clock()
+        for controller in controllers:
+            controller.execute()
+        t4 = clock()
+        if action is not None:
+            action(step)
+        t5 = clock()
+        stage_time["tick_inc"] += t1 - t0
+        stage_time["update_motor"] += t2 - t1
+        stage_time["sensor_update"] += t3 - t2
+        stage_time["execute"] += t4 - t3
+        stage_time["scenario"] += t5 - t4
+    elapsed = clock() - start
+    return {
+        "rate": sim_ms / elapsed,
+        "wall_seconds": elapsed,
+        "sim_ms": sim_ms,
+        "motors": motors,
+        "motor_steps_per_sec": sim_ms * motors / elapsed,
+        "stage_us": {name: total / sim_ms * 1e6 for name, total in stage_time.items()},
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    与基线比较：rate 低于基线 (1 - threshold) 倍判定为回归
+    :return: [(名称, 当前rate, 基线rate, 比值)] 的回归列表
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None or not base.get("rate"):
+            continue
+        ratio = result["rate"] / base["rate"]
+        if ratio < 1 - threshold:
+            regressions.append((name, result["rate"], base["rate"], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="tick流水线与仿真核心基准套件")
+    parser.add_argument("--motors", default="1,10,100,1000,10000", help="电机数量列表，逗号分隔")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="场景列表，逗号分隔")
+    parser.add_argument("--schedulers", default="linear,heap", help="调度模式列表（linear/heap），逗号分隔")
+    parser.add_argument("--sim-ms", type=int, default=1000, help="每个流水线基准的仿真时长上限（ms）")
+    parser.add_argument("--motor-ms-budget", type=int, default=2_000_000,
+                        help="每个流水线基准的电机·毫秒预算，电机多时自动缩短仿真时长（至少100ms）")
+    parser.add_argument("--period-ms", type=int, default=10, help="控制器更新周期（ms）")
+    parser.add_argument("--micro-repeat", type=int, default=200_000, help="单项操作基准的重复次数")
+    parser.add_argument("--rounds", type=int, default=3, help="单项操作基准的轮数（取最快一轮）")
+    parser.add_argument("--output", help="结果JSON输出路径")
+    parser.add_argument("--baseline", help="基线JSON路径，给出时与之比较")
+    parser.add_argument("--threshold", type=float, default=0.2, help="允许的相对基线性能下降比例")
+    args = parser.parse_args(argv)
+
+    results = bench_micro(args.micro_repeat, args.rounds)
+    for name, result in results.items():
+        print(f"{name:40s} {result['rate']:14.1f} /s")
+
+    for motors in (int(m) for m in args.motors.split(",")):
+        sim_ms = max(100, min(args.sim_ms, args.motor_ms_budget // motors))
+        for scenario in args.scenarios.split(","):
+            for sched_name in args.schedulers.split(","):
+                name = f"pipeline/{scenario}/{sched_name}/{motors}"
+                result = bench_pipeline(motors, scenario, SCHEDULERS[sched_name], sim_ms, args.period_ms)
+                results[name] = result
+                stages = "  ".join(f"{k}={v:.1f}" for k, v in result["stage_us"].items())
+                print(f"{name:40s} {result['rate']:14.1f} 仿真ms/s   每步us: {stages}")
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for name, rate, base, ratio in regressions:
+            print(f"REGRESSION {name}: {rate:.1f} vs 基线 {base:.1f}（{ratio:.0%}）")
+        if regressions:
+            return 1
+        print(f"与基线比较通过（阈值 {args.threshold:.0%}）")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+控制器更新频率回归基准：统计每仿真秒内Controller.update()的调用次数
+期望值为 1000 / updatePeriodMS 次/秒，偏差超过容差即判定为回归（退出码1）
+
+运行方式（在 "BaiMotorLib for py" 目录下）：
+    python -m benchmarks.bench_update_rate --motors 100 --seconds 5
+"""
+import argparse
+import sys
+import time
+
+from BaiMotorLib.common.motor_manager import MotorManager
+from BaiMotorLib.common.motorlib_time_sys import MotorlibTimeSys
+from BaiMotorLib.common.constants import ControllerState, MotorSchedulerMode
+from BaiMotorLib.drivers.virtual.pyqt5_motor import VirtualMotor, VirtualMotorDriver
+from BaiMotorLib.controllers.virtual.pyqt5_controller import OpenLoopController
+
+
+class _CountingController(OpenLoopController):
+    """统计update()调用次数的开环控制器"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.update_count = 0
+
+    def update(self):
+        self.update_count += 1
+        super().update()
+
+
+def run(motors, seconds, period_ms, scheduler):
+    """
+    运行一次基准
+    :return: dict，包含每台电机每仿真秒的平均更新次数、期望值与耗时
+    """
+    time_sys = MotorlibTimeSys()
+    controllers = []
+    motor_list = []
+    for i in range(motors):
+        controller = _CountingController(motor_driver=VirtualMotorDriver())
+        controller.set_update_period(period_ms, i % period_ms)
+        controller.set_state(ControllerState.CONTROLLER_STATE_RUNNING)
+        controller.set_target(100.0)
+        controllers.append(controller)
+        motor_list.append(VirtualMotor(driver=controller.MotorDriver, controller=controller))
+    manager = MotorManager(time_sys, *motor_list, scheduler=scheduler)
+
+    start = time.perf_counter()
+    for _ in range(seconds * 1000):
+        time_sys.tick_inc(ms=1)
+        manager.update_motor()
+    elapsed = time.perf_counter() - start
+
+    total_updates = sum(c.update_count for c in controllers)
+    return {
+        "updates_per_motor_per_sec": total_updates / motors / seconds,
+        "expected_per_motor_per_sec": 1000 / period_ms,
+        "wall_seconds": elapsed,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="控制器更新频率回归基准")
+    parser.add_argument("--motors", type=int, default=100, help="电机数量")
+    parser.add_argument("--seconds", type=int, default=5, help="仿真时长（秒）")
+    parser.add_argument("--period-ms", type=int, default=10, help="控制器更新周期（ms）")
+    parser.add_argument("--tolerance", type=float, default=0.01, help="相对期望值的允许偏差比例")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for name, scheduler in (("linear", MotorSchedulerMode.MOTOR_SCHED_LINEAR),
+                            ("heap", MotorSchedulerMode.MOTOR_SCHED_HEAP)):
+        result = run(args.motors, args.seconds, args.period_ms, scheduler)
+        rate = result["updates_per_motor_per_sec"]
+        expected = result["expected_per_motor_per_sec"]
+        ok = abs(rate - expected) <= expected * args.tolerance
+        failed |= not ok
+        print(f"[{name:6s}] {rate:8.2f} 次/仿真秒/电机（期望 {expected:.2f}），"
+              f"耗时 {result['wall_seconds']:.3f}s  {'OK' if ok else 'REGRESSION'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 以 "BaiMotorLib for py" 目录为导入根，使 BaiMotorLib / MotorSimulation 可直接导入
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from BaiMotorLib.common.async_motor_runtime import AsyncMotorRuntime
+from BaiMotorLib.common.motor_manager import MotorManager
+from BaiMotorLib.common.motorlib_time_sys import MotorlibTimeSys
+from BaiMotorLib.controllers.virtual.pyqt5_controller import OpenLoopController
+from BaiMotorLib.drivers.virtual.pyqt5_motor import VirtualMotor, VirtualMotorDriver
+from BaiMotorLib.drivers.virtual.pyqt5_sensor import VirtualSensor
+
+
+class _FailingSensor(VirtualSensor):
+    """第 fail_at 次update()时先下发一条指令再抛出异常，模拟tick中途出错"""
+    __slots__ = ("runtime", "fail_at", "updates", "pending")
+
+    def __init__(self, fail_at):
+        super().__init__()
+        self.runtime = None
+        self.fail_at = fail_at
+        self.updates = 0
+        self.pending = None
+
+    def update(self):
+        self.updates += 1
+        if self.updates == self.fail_at:
+            self.pending = self.runtime.set_target(1.0)
+            raise RuntimeError("tick failed")
+        super().update()
+
+
+def _runtime(sensor, **kwargs):
+    controller = OpenLoopController(motor_driver=VirtualMotorDriver())
+    manager = MotorManager(MotorlibTimeSys(), VirtualMotor(driver=controller.MotorDriver, controller=controller))
+    return AsyncMotorRuntime(manager, [sensor], **kwargs)
+
+
+def test_failing_tick_closes_subscriptions_and_fails_commands():
+    sensor = _FailingSensor(fail_at=5)
+
+    async def main():
+        runtime = _runtime(sensor, period_ms=0.1)
+        sensor.runtime = runtime
+        subscription = runtime.subscribe()
+        runtime.start()
+        samples = [sample async for sample in subscription]
+        assert [tick for tick, _ in samples] == [1, 2, 3, 4]
+        assert not runtime.running
+        with pytest.raises(RuntimeError, match="tick failed"):
+            await sensor.pending
+        with pytest.raises(RuntimeError, match="tick failed"):
+            await runtime.stop()
+        assert subscription.closed
+        assert not runtime._commands and not runtime._subscribers
+
+    asyncio.run(asyncio.wait_for(main(), 5))
+
+
+def test_slow_subscriber_drops_oldest():
+    runtime = _runtime(VirtualSensor())
+    subscription = runtime.subscribe(maxsize=3)
+    for _ in range(5):
+        runtime.step()
+    assert subscription.dropped == 2
+
+    async def drain():
+        await runtime.stop()
+        return [tick async for tick, _ in subscription]
+
+    assert asyncio.run(drain()) == [3, 4, 5]
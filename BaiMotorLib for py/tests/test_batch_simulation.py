@@ -0,0 +1,51 @@
+import numpy as np
+
+from BaiMotorLib.common.constants import ControllerState, MotorBrakeMode
+from MotorSimulation.batch_simulation import MotorBatchSimulation
+from MotorSimulation.simulation_core import MotorSimulationCore
+
+# (时刻ms, 指令, 参数)：目标阶跃、周期/相位变化与刹车/松开，覆盖调度与状态切换
+_SCRIPT = {
+    0: [("set_state", ControllerState.CONTROLLER_STATE_RUNNING), ("set_target", 800.0)],
+    137: [("set_update_period", 7, 3)],
+    250: [("set_target", 1200.0)],
+    400: [("set_brake_mode", MotorBrakeMode.MOTOR_BRAKE_SOFTWARE)],
+    455: [("set_brake_mode", MotorBrakeMode.MOTOR_BRAKE_NONE)],
+}
+
+
+def _state(core):
+    sensor = core.sensor
+    return (sensor.get_raw_speed(), sensor.get_raw_position(), sensor.get_raw_current(), sensor.get_voltage(),
+            core.motor_driver.get_target_speed(), core.controller.state)
+
+
+def test_single_motor_batch_matches_core_bit_for_bit():
+    core = MotorSimulationCore(simulation_duration_ms=600, seed=3)
+    batch = MotorBatchSimulation(1, seed=3)
+    for now in range(600):
+        for command, *args in _SCRIPT.get(now, ()):
+            getattr(core.controller, command)(*args)
+            getattr(batch, command)(*args)
+        # MotorSimulationCore 的步进顺序：tick_inc → update_motor → sensor.update → controller.execute
+        core.time_sys.tick_inc(ms=1)
+        core.motor_manager.update_motor()
+        core.sensor.update()
+        core.controller.execute()
+        batch.step()
+        assert _state(core) == (batch.speed[0], batch.position[0], batch.current[0], batch.voltage[0],
+                                batch.driver_target[0], batch.state[0]), now
+
+
+def test_index_selects_motors():
+    batch = MotorBatchSimulation(4, seed=0)
+    batch.set_state(ControllerState.CONTROLLER_STATE_RUNNING)
+    batch.set_target(500.0, idx=[1, 3])
+    batch.set_brake_mode(MotorBrakeMode.MOTOR_BRAKE_HARDWARE, idx=3)
+    trace = batch.run(20, record_every=10)
+    assert trace["time_ms"].tolist() == [10, 20]
+    assert trace["speed"].shape == (2, 4)
+    assert batch.driver_target.tolist() == [0.0, 500.0, 0.0, 0.0]
+    assert batch.state.tolist() == [ControllerState.CONTROLLER_STATE_RUNNING] * 3 + [
+        ControllerState.CONTROLLER_STATE_BRAKE]
+    assert np.array_equal(trace["target_speed"][-1], [0.0, 500.0, 0.0, 500.0])
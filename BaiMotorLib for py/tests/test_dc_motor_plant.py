@@ -0,0 +1,114 @@
+import math
+
+import numpy as np
+import pytest
+
+from BaiMotorLib.common.constants import MotorPlantIntegrator
+from BaiMotorLib.drivers.virtual.dc_motor_plant import DCMotorPlant, DCMotorPlantArray
+
+_PARAMS = dict(resistance=1.2, inductance=1.5e-3, back_emf=0.05, torque_const=0.06, inertia=2e-5, damping=1e-5)
+# (起始ms, 端电压V, 负载转矩N·m)
+_PROFILE = ((0, 12.0, 0.0), (20, 24.0, 0.0), (35, 24.0, 5e-3), (45, -6.0, 5e-3))
+_DURATION_MS = 60
+
+
+def _input(ms):
+    voltage = torque = 0.0
+    for start, v, t in _PROFILE:
+        if ms >= start:
+            voltage, torque = v, t
+    return voltage, torque
+
+
+def _rk4_reference(substeps=1000):
+    """以 1ms/substeps 的步长对连续模型做经典RK4积分，作为精确离散化的参考解"""
+    r, l, ke, kt, j, b = (_PARAMS[key] for key in
+                          ("resistance", "inductance", "back_emf", "torque_const", "inertia", "damping"))
+
+    def deriv(x, v, t):
+        i, w, _ = x
+        return ((v - r * i - ke * w) / l, (kt * i - b * w - t) / j, w)
+
+    h = 1e-3 / substeps
+    x = (0.0, 0.0, 0.0)
+    states = []
+    for ms in range(_DURATION_MS):
+        v, t = _input(ms)
+        for _ in range(substeps):
+            k1 = deriv(x, v, t)
+            k2 = deriv(tuple(a + h / 2 * d for a, d in zip(x, k1)), v, t)
+            k3 = deriv(tuple(a + h / 2 * d for a, d in zip(x, k2)), v, t)
+            k4 = deriv(tuple(a + h * d for a, d in zip(x, k3)), v, t)
+            x = tuple(a + h / 6 * (d1 + 2 * d2 + 2 * d3 + d4) for a, d1, d2, d3, d4 in zip(x, k1, k2, k3, k4))
+        states.append(x)
+    return states
+
+
+def _simulate(plant):
+    states = []
+    for ms in range(_DURATION_MS):
+        v, t = _input(ms)
+        plant.set_voltage(v)
+        plant.set_load_torque(t)
+        plant.step()
+        states.append((plant.current, plant.omega, plant.theta))
+    return states
+
+
+@pytest.fixture(scope="module")
+def reference():
+    return _rk4_reference()
+
+
+def _max_error(states, reference):
+    # 各状态量按其参考解的最大幅值归一化
+    scale = [max(abs(s[k]) for s in reference) for k in range(3)]
+    return max(abs(a - b) / scale[k] for x, ref in zip(states, reference) for k, (a, b) in enumerate(zip(x, ref)))
+
+
+def test_exact_matches_fine_rk4(reference):
+    assert _max_error(_simulate(DCMotorPlant(**_PARAMS)), reference) < 1e-9
+
+
+@pytest.mark.parametrize("integrator, substeps, tolerance", [
+    (MotorPlantIntegrator.MOTOR_PLANT_RK4, 1, 1e-2),
+    (MotorPlantIntegrator.MOTOR_PLANT_RK4, 20, 1e-7),
+    (MotorPlantIntegrator.MOTOR_PLANT_EULER, 200, 1e-2),
+])
+def test_approximate_integrators_converge(reference, integrator, substeps, tolerance):
+    plant = DCMotorPlant(**_PARAMS, integrator=integrator, substeps=substeps)
+    assert _max_error(_simulate(plant), reference) < tolerance
+
+
+def test_command_speed_reaches_no_load_speed():
+    plant = DCMotorPlant(**_PARAMS)
+    plant.command_speed(1500.0)
+    for _ in range(2000):
+        plant.step()
+    assert plant.get_speed_rpm() == pytest.approx(1500.0, rel=1e-9)
+    assert plant.voltage == pytest.approx(1500.0 * 2 * math.pi / 60 * (0.05 + 1.2 * 1e-5 / 0.06))
+
+
+def test_voltage_is_limited():
+    plant = DCMotorPlant(**_PARAMS, voltage_limit=12.0)
+    plant.set_voltage(30.0)
+    assert plant.voltage == 12.0
+    plant.set_voltage(-30.0)
+    assert plant.voltage == -12.0
+
+
+def test_array_matches_scalar():
+    inertia = [2e-5, 5e-5, 1e-4]
+    scalars = [DCMotorPlant(**dict(_PARAMS, inertia=j)) for j in inertia]
+    array = DCMotorPlantArray(3, **dict(_PARAMS, inertia=np.array(inertia)))
+    targets = np.array([500.0, 1000.0, 3000.0])
+    array.command_speed(targets)
+    for plant, target in zip(scalars, targets.tolist()):
+        plant.command_speed(target)
+    for _ in range(100):
+        array.step()
+        for plant in scalars:
+            plant.step()
+        assert array.omega.tolist() == [plant.omega for plant in scalars]
+        assert array.current.tolist() == [plant.current for plant in scalars]
+        assert array.theta.tolist() == [plant.theta for plant in scalars]
@@ -0,0 +1,70 @@
+import threading
+
+from BaiMotorLib.common.constants import MotorLogEvent, MotorLogLevel
+from BaiMotorLib.common.motorlib_log_sys import MotorlibLogSys, read_log
+from BaiMotorLib.common.motorlib_time_sys import MotorlibMonoTimeSys
+
+
+class _BlockingFile:
+    """包装日志文件：release 之前后台线程的 write() 阻塞，模拟落盘跟不上"""
+
+    def __init__(self, file):
+        self._file = file
+        self.release = threading.Event()
+
+    def write(self, data):
+        self.release.wait()
+        return self._file.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+
+def test_pool_exhausted_then_drained(tmp_path):
+    path = tmp_path / "motor.log"
+    time_sys = MotorlibMonoTimeSys()
+    log_sys = MotorlibLogSys(time_sys, path, buffer_records=2, buffers=2)
+    blocking = _BlockingFile(log_sys._file)
+    log_sys._file = blocking
+
+    def log(count):
+        for _ in range(count):
+            time_sys.advance_ticks(1)
+            log_sys.log(MotorLogLevel.MOTOR_LOG_INFO, MotorLogEvent.MOTOR_EVT_STATE, 0, time_sys.get_ticks())
+
+    log(4)      # 两块缓冲区都交给被阻塞的后台线程
+    log(3)      # 空闲池耗尽：丢弃
+    assert log_sys.dropped == 3
+    assert log_sys._buffer is None
+
+    blocking.release.set()
+    log_sys.flush(wait=True)
+    log(3)      # 取回的缓冲区被继续使用，不再逐条丢弃
+    log_sys.close()
+
+    assert not log_sys._writer.is_alive()
+    assert log_sys.dropped == 3
+    _, records = read_log(path)
+    assert [record[0] for record in records] == [1, 2, 3, 4, 8, 9, 10]
+    assert log_sys.records_written == 7
+
+
+def test_log_and_flush_after_close(tmp_path):
+    path = tmp_path / "motor.log"
+    time_sys = MotorlibMonoTimeSys()
+    log_sys = MotorlibLogSys(time_sys, path, buffer_records=2, buffers=2)
+    log_sys.log(MotorLogLevel.MOTOR_LOG_INFO, MotorLogEvent.MOTOR_EVT_STATE, 0, 1.0)
+    log_sys.close()
+
+    for _ in range(5):
+        log_sys.log(MotorLogLevel.MOTOR_LOG_INFO, MotorLogEvent.MOTOR_EVT_STATE, 0, 2.0)
+    assert log_sys.dropped == 5
+
+    done = threading.Event()
+    flusher = threading.Thread(target=lambda: (log_sys.flush(wait=True), done.set()), daemon=True)
+    flusher.start()
+    assert done.wait(2.0), "close() 之后 flush(wait=True) 不应阻塞"
+    log_sys.close()
+
+    _, records = read_log(path)
+    assert [record[4] for record in records] == [1.0]
@@ -0,0 +1,78 @@
+import pytest
+
+from BaiMotorLib.common.constants import ControllerState, MotorSchedulerMode
+from BaiMotorLib.common.motor_manager import MotorManager
+from BaiMotorLib.common.motorlib_time_sys import MotorlibTimeSys
+from BaiMotorLib.controllers.virtual.pyqt5_controller import OpenLoopController
+from BaiMotorLib.drivers.virtual.pyqt5_motor import VirtualMotor, VirtualMotorDriver
+
+
+class _RecordingController(OpenLoopController):
+    __slots__ = ("updates",)
+
+    def __init__(self):
+        super().__init__(motor_driver=VirtualMotorDriver())
+        self.updates = []
+
+    def update(self):
+        self.updates.append(self.TimeSys.get_ticks())
+        super().update()
+
+
+def _run(scheduler):
+    time_sys = MotorlibTimeSys()
+    controllers = [_RecordingController() for _ in range(3)]
+    for i, controller in enumerate(controllers):
+        controller.set_update_period(100, i)
+        controller.set_state(ControllerState.CONTROLLER_STATE_RUNNING)
+    manager = MotorManager(time_sys, *(VirtualMotor(driver=c.MotorDriver, controller=c) for c in controllers),
+                           scheduler=scheduler)
+    deadlines = []
+    for tick in range(1, 301):
+        if tick == 105:
+            # 两次tick之间缩短周期：下一次更新由 200 提前到 110
+            controllers[0].set_update_period(10)
+            deadlines.append(manager.next_deadline())
+        if tick == 150:
+            controllers[1].set_update_period(20, 3)
+        time_sys.tick_inc(ms=1)
+        manager.update_motor()
+    return [c.updates for c in controllers], deadlines
+
+
+@pytest.mark.parametrize("scheduler", [MotorSchedulerMode.MOTOR_SCHED_LINEAR, MotorSchedulerMode.MOTOR_SCHED_HEAP])
+def test_shortened_period_takes_effect_immediately(scheduler):
+    updates, deadlines = _run(scheduler)
+    assert updates[0][:3] == [100, 110, 120]
+    assert updates[1][:4] == [1, 101, 163, 183]
+    assert deadlines == [110]
+
+
+def test_heap_matches_linear():
+    assert _run(MotorSchedulerMode.MOTOR_SCHED_HEAP) == _run(MotorSchedulerMode.MOTOR_SCHED_LINEAR)
+
+
+@pytest.mark.parametrize("scheduler", [MotorSchedulerMode.MOTOR_SCHED_LINEAR, MotorSchedulerMode.MOTOR_SCHED_HEAP])
+def test_recomputed_deadline_rekeys_heap(scheduler):
+    controller = OpenLoopController(motor_driver=VirtualMotorDriver())
+    motor = VirtualMotor(driver=controller.MotorDriver, controller=controller)
+    time_sys = MotorlibTimeSys()
+    manager = MotorManager(time_sys, motor, scheduler=scheduler)
+    # 先把到期时间推迟到1分钟后，再经 set_target 重新计算为10ms后：堆键需随之提前
+    controller.NextUpdate = (0, 0, 1, 0)
+    manager.reschedule_motor(motor)
+    controller.set_state(ControllerState.CONTROLLER_STATE_RUNNING)
+    controller.set_target(500.0)
+    for _ in range(10):
+        time_sys.tick_inc(ms=1)
+        manager.update_motor()
+    assert controller.MotorDriver.get_target_speed() == 500.0
+
+
+def test_removed_motor_is_unhooked():
+    controller = OpenLoopController(motor_driver=VirtualMotorDriver())
+    motor = VirtualMotor(driver=controller.MotorDriver, controller=controller)
+    manager = MotorManager(MotorlibTimeSys(), motor, scheduler=MotorSchedulerMode.MOTOR_SCHED_HEAP)
+    assert controller.RescheduleHook is not None
+    manager.remove_motor(motor)
+    assert controller.RescheduleHook is None
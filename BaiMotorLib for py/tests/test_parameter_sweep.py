@@ -0,0 +1,77 @@
+import pytest
+
+from MotorSimulation.parameter_sweep import grid, params_key, random_sample, run_sweep, summarize
+
+_calls = []
+
+
+def _runner(params):
+    _calls.append(("a", params["kp"]))
+    return {"final_speed": params["kp"] * 10}
+
+
+def _other_runner(params):
+    _calls.append(("b", params["kp"]))
+    return {"final_speed": -params["kp"]}
+
+
+def _sweep(points, cache_dir, runner=_runner):
+    _calls.clear()
+    results = {params["kp"]: (summary, cached) for params, summary, cached in
+               run_sweep(points, cache_dir=cache_dir, max_workers=0, runner=runner)}
+    return results, list(_calls)
+
+
+def test_grid_last_axis_fastest():
+    assert grid(kp=[1, 2], ki=[0.1, 0.2]) == [
+        {"kp": 1, "ki": 0.1}, {"kp": 1, "ki": 0.2}, {"kp": 2, "ki": 0.1}, {"kp": 2, "ki": 0.2}]
+
+
+def test_random_sample_is_reproducible_and_extends():
+    points = random_sample(5, seed=3, duration_ms=(100, 200), kp=(0.0, 1.0), plant=[True, False])
+    assert points == random_sample(5, seed=3, duration_ms=(100, 200), kp=(0.0, 1.0), plant=[True, False])
+    assert random_sample(8, seed=3, duration_ms=(100, 200), kp=(0.0, 1.0), plant=[True, False])[:5] == points
+    for point in points:
+        assert isinstance(point["duration_ms"], int) and 100 <= point["duration_ms"] <= 200
+        assert isinstance(point["kp"], float) and 0.0 <= point["kp"] <= 1.0
+        assert point["plant"] in (True, False)
+
+
+def test_summarize():
+    summary = summarize([1, 2, 3, 4, 5], [0.0, 60.0, 110.0, 99.0, 101.0], [0.5, -2.0, 1.0, 0.2, 0.1], 100.0,
+                        settle_band=0.02)
+    assert summary["settling_time_ms"] == 4
+    assert summary["overshoot_pct"] == pytest.approx(10.0)
+    assert summary["rms_error"] == pytest.approx(((100 ** 2 + 40 ** 2 + 10 ** 2 + 1 + 1) / 5) ** 0.5)
+    assert summary["peak_current"] == 2.0
+    assert summary["final_speed"] == 101.0
+    assert summarize([1, 2], [0.0, 50.0], [0.0, 0.0], 100.0)["settling_time_ms"] is None
+    with pytest.raises(ValueError):
+        summarize([], [], [], 100.0)
+
+
+def test_cache_reuses_only_computed_points(tmp_path):
+    results, calls = _sweep(grid(kp=[1, 2]), tmp_path)
+    assert calls == [("a", 1), ("a", 2)]
+    assert results == {1: ({"final_speed": 10}, False), 2: ({"final_speed": 20}, False)}
+
+    results, calls = _sweep(grid(kp=[1, 2, 3]), tmp_path)
+    assert calls == [("a", 3)]
+    assert results == {1: ({"final_speed": 10}, True), 2: ({"final_speed": 20}, True),
+                       3: ({"final_speed": 30}, False)}
+
+
+def test_cache_is_keyed_by_runner(tmp_path):
+    _sweep(grid(kp=[1]), tmp_path)
+    results, calls = _sweep(grid(kp=[1]), tmp_path, runner=_other_runner)
+    assert calls == [("b", 1)]
+    assert results == {1: ({"final_speed": -1}, False)}
+    assert params_key({"kp": 1}, _runner) != params_key({"kp": 1}, _other_runner)
+
+
+def test_cache_rejects_anonymous_runner(tmp_path):
+    with pytest.raises(ValueError):
+        list(run_sweep(grid(kp=[1]), cache_dir=tmp_path, max_workers=0, runner=lambda params: {}))
+    # 不缓存时任意可调用对象均可
+    assert list(run_sweep(grid(kp=[1]), max_workers=0, runner=lambda params: {"ok": True})) == [
+        ({"kp": 1}, {"ok": True}, False)]
@@ -0,0 +1,73 @@
+import random
+
+import numpy as np
+import pytest
+
+from BaiMotorLib.common.constants import ControllerState
+from BaiMotorLib.controllers.common.PID import PIDController, PIDControllerArray
+
+
+def test_output_is_clamped():
+    pid = PIDController(kp=2.0, ki=5.0, kd=0.1, output_min=10.0, output_max=100.0)
+    pid.set_target(1000.0)
+    assert pid.step(0.0) == 100.0
+    pid.set_target(0.0)
+    for _ in range(5):
+        assert pid.step(500.0) == 10.0
+
+
+def test_anti_windup_recovers_immediately():
+    pid = PIDController(kp=1.0, ki=10.0, output_max=100.0)
+    pid.set_target(1000.0)
+    for _ in range(500):
+        assert pid.step(0.0) == 100.0
+    # 饱和期间积分不再累加：目标回落后下一步即退出饱和（无抗饱和时积分约为 10*1000*0.01*500）
+    pid.set_target(50.0)
+    assert pid.step(40.0) == pytest.approx(10.0 + 10.0 * 10.0 * 0.01)
+
+
+def test_integral_stays_within_output_range():
+    pid = PIDController(kp=0.0, ki=100.0, output_max=20.0)
+    pid.set_target(5.0)
+    for _ in range(100):
+        pid.step(0.0)
+    assert pid.step(0.0) == 20.0
+    assert pid._integral == 20.0
+
+
+def test_derivative_acts_on_measurement_only():
+    pid = PIDController(kp=1.0, kd=1.0, output_max=None)
+    pid.set_target(100.0)
+    assert pid.step(10.0) == 90.0
+    pid.set_target(500.0)       # 目标突变不产生微分冲击
+    assert pid.step(10.0) == 490.0
+    assert pid.step(11.0) == pytest.approx(489.0 - 1.0 / 0.01)
+
+
+def test_brake_and_idle_reset_output():
+    pid = PIDController(kp=1.0, ki=1.0)
+    pid.set_state(ControllerState.CONTROLLER_STATE_RUNNING)
+    pid.set_target(100.0)
+    pid.step(0.0)
+    pid.set_state(ControllerState.CONTROLLER_STATE_IDLE)
+    pid.update()
+    assert pid.put_output() == 0.0
+    assert pid._integral == 0.0
+
+
+def test_array_matches_scalar():
+    gains = [(1.0, 5.0, 0.01, 0.0, 150.0, 0.0), (0.5, 20.0, 0.0, 10.0, 80.0, 5.0), (2.0, 0.0, 0.02, 0.0, 1e9, 2.0)]
+    scalars = [PIDController(kp, ki, kd, output_min=low, output_max=high, derivative_filter_ms=tau)
+               for kp, ki, kd, low, high, tau in gains]
+    kp, ki, kd, low, high, tau = (np.array(column) for column in zip(*gains))
+    array = PIDControllerArray(3, kp, ki, kd, output_min=low, output_max=high, derivative_filter_ms=tau)
+    array.set_state(ControllerState.CONTROLLER_STATE_RUNNING)
+    rng = random.Random(2)
+    for step in range(200):
+        if step % 50 == 0:
+            targets = [rng.uniform(0.0, 200.0) for _ in scalars]
+            array.set_target(np.array(targets))
+            for pid, target in zip(scalars, targets):
+                pid.set_target(target)
+        measure = np.array([rng.uniform(0.0, 200.0) for _ in scalars])
+        assert array.update(measure).tolist() == [pid.step(m) for pid, m in zip(scalars, measure.tolist())]
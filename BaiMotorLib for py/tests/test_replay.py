@@ -0,0 +1,34 @@
+import pytest
+
+from BaiMotorLib.common.constants import ControllerState
+from BaiMotorLib.common.motorlib_replay import read_command_log
+from MotorSimulation.replay import Replayer, ReplaySession
+
+
+def test_truncated_header_raises_value_error(tmp_path):
+    path = tmp_path / "short.bin"
+    path.write_bytes(b"BMLREPL")
+    with pytest.raises(ValueError):
+        read_command_log(path)
+
+
+def test_replay_matches_recording(tmp_path):
+    path = tmp_path / "cmd.bin"
+    trace = []
+    with ReplaySession(seed=1, recorder_path=path) as session:
+        for _ in range(2):
+            session.add_motor()
+        session.set_target(0, 300.0)
+        session.set_state(0, ControllerState.CONTROLLER_STATE_RUNNING)
+        for t in range(300):
+            if t == 150:
+                session.set_target(1, 50.0)
+                session.set_state(1, ControllerState.CONTROLLER_STATE_RUNNING)
+            session.step()
+            trace.append(session.sample())
+    replayed = []
+    replayer = Replayer(path, snapshot_every_ms=100)
+    replayer.run(on_step=lambda s: replayed.append(s.sample()))
+    assert replayed == trace
+    replayer.seek(170)
+    assert replayer.session.sample() == trace[169]
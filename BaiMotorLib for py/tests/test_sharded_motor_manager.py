@@ -0,0 +1,24 @@
+import threading
+
+import pytest
+
+from BaiMotorLib.common.constants import ControllerState
+from BaiMotorLib.common.sharded_motor_manager import ShardedMotorManager
+
+
+def test_step_broadcasts_common_time():
+    with ShardedMotorManager(8, num_shards=2, factory_kwargs={"seed": 0}) as manager:
+        manager.set_state(ControllerState.CONTROLLER_STATE_RUNNING)
+        manager.set_target(100.0)
+        for _ in range(5):
+            manager.step(10)
+        assert manager.now_ticks == 50
+        assert list(manager.column("output")) == [100.0] * 8
+
+
+def test_shard_clock_mismatch_fails_loudly():
+    with ShardedMotorManager(4, num_shards=1) as manager:
+        manager.step(3)
+        manager.now_ticks += 1      # 模拟分片时钟与主进程失步
+        with pytest.raises(threading.BrokenBarrierError):
+            manager.step(1)
@@ -0,0 +1,67 @@
+import contextlib
+import io
+
+import pytest
+
+from BaiMotorLib.common.constants import ControllerState, MotorBrakeMode, MotorSimRunMode
+from BaiMotorLib.drivers.virtual.dc_motor_plant import DCMotorPlant
+from MotorSimulation.simulation_core import MotorSimulationCore
+
+
+def _run(mode):
+    core = MotorSimulationCore(simulation_duration_ms=200, seed=0)
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        core.start_simulation(500.0, mode=mode)
+    return core, out.getvalue()
+
+
+def test_macro_step_ends_like_asap():
+    asap, asap_out = _run(MotorSimRunMode.MOTOR_SIM_ASAP)
+    macro, macro_out = _run(MotorSimRunMode.MOTOR_SIM_MACRO_STEP)
+    assert macro_out == asap_out == "仿真完成！\n"
+    assert macro.controller.BrakeMode == asap.controller.BrakeMode == MotorBrakeMode.MOTOR_BRAKE_NONE
+    assert macro.controller.state == ControllerState.CONTROLLER_STATE_RUNNING
+
+
+@pytest.mark.parametrize("options", [{}, {"plant": True}, {"pid_gains": (0.5, 2.0, 0.001)}])
+@pytest.mark.parametrize("period", [(10, 0), (7, 3), (1, 0)])
+def test_macro_step_samples_match_asap(options, period):
+    rows = {}
+    for mode in (MotorSimRunMode.MOTOR_SIM_ASAP, MotorSimRunMode.MOTOR_SIM_MACRO_STEP):
+        kwargs = dict(options, plant=DCMotorPlant()) if options.get("plant") else options
+        core = MotorSimulationCore(simulation_duration_ms=500, seed=4, **kwargs)
+        core.controller.set_update_period(*period)
+        with contextlib.redirect_stdout(io.StringIO()):
+            core.start_simulation(800.0, mode=mode)
+        rows[mode] = {row["time_ms"]: row for row in core.get_simulation_data()}
+    asap, macro = rows[MotorSimRunMode.MOTOR_SIM_ASAP], rows[MotorSimRunMode.MOTOR_SIM_MACRO_STEP]
+    # 宏步只在控制器到期时刻（及结束时刻）记录，这些时刻的采样与逐ms步进逐位一致
+    expected_times = sorted({t for t in range(1, 501) if t % period[0] == period[1]} | {500})
+    assert sorted(macro) == expected_times
+    assert all(macro[t] == asap[t] for t in macro)
+
+
+def test_stop_simulation_brakes():
+    core = MotorSimulationCore(simulation_duration_ms=100, seed=0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        core.stop_simulation()
+    assert not core.is_running
+    assert core.controller.BrakeMode == MotorBrakeMode.MOTOR_BRAKE_SOFTWARE
+
+
+def test_log_sys_uses_simulation_clock(tmp_path):
+    from BaiMotorLib.common.constants import MotorLogEvent
+    from BaiMotorLib.common.motorlib_log_sys import MotorlibLogSys, read_log
+    from BaiMotorLib.common.motorlib_time_sys import MotorlibTimeSys
+
+    path = tmp_path / "sim.log"
+    with MotorlibLogSys(MotorlibTimeSys(), path) as log_sys:
+        core = MotorSimulationCore(simulation_duration_ms=500, seed=0, log_sys=log_sys)
+        assert log_sys.time_sys is core.time_sys
+        with contextlib.redirect_stdout(io.StringIO()):
+            core.start_simulation(500.0)
+            core.stop_simulation()
+    _, records = read_log(path)
+    brakes = [record[0] for record in records if record[2] == MotorLogEvent.MOTOR_EVT_BRAKE]
+    assert brakes == [500]
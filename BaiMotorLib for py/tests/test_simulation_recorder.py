@@ -0,0 +1,44 @@
+import contextlib
+import io
+
+from MotorSimulation.simulation_core import MotorSimulationCore
+from MotorSimulation.simulation_recorder import SimulationRecorder
+
+
+def _fill(recorder, count):
+    for t in range(count):
+        recorder.record(t, t * 0.5, 0.0, 0.0, 0.0, 100.0, 1)
+
+
+def test_to_rows_matches_legacy_access():
+    core = MotorSimulationCore(simulation_duration_ms=50, seed=0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        core.start_simulation(300.0)
+    data = core.get_simulation_data()
+    rows = data.to_rows()
+    assert isinstance(rows, list)
+    assert len(rows) == len(data) == 50
+    assert rows == list(data) == data.to_records()
+    assert rows[-1] == data[-1]
+    assert [row["speed"] for row in rows] == list(data["speed"])
+
+
+def test_to_rows_is_independent_copy():
+    recorder = SimulationRecorder(capacity=4)
+    _fill(recorder, 3)
+    rows = recorder.to_rows()
+    rows[0]["speed"] = -1.0
+    rows.append({})
+    assert recorder.to_rows() is not rows
+    assert recorder[0]["speed"] == 0.0
+    assert len(recorder.to_records()) == 3
+
+
+def test_to_rows_ring_and_decimation():
+    ring = SimulationRecorder(capacity=4, ring=True)
+    _fill(ring, 10)
+    assert [row["time_ms"] for row in ring.to_rows()] == [6, 7, 8, 9]
+
+    decimated = SimulationRecorder(capacity=2, decimation=3)
+    _fill(decimated, 10)
+    assert [row["time_ms"] for row in decimated.to_rows()] == [2, 5, 8]
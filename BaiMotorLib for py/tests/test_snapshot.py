@@ -0,0 +1,115 @@
+import contextlib
+import io
+import random
+
+import numpy as np
+import pytest
+
+from BaiMotorLib.common.motorlib_snapshot import SNAPSHOT_HEADER, dumps, loads, restore_rng, rng_state
+from BaiMotorLib.drivers.virtual.dc_motor_plant import DCMotorPlant
+from MotorSimulation.simulation_core import MotorSimulationCore
+
+_VALUES = (None, True, False, 0, -1, 2 ** 63 - 1, -2 ** 63, 2 ** 63, -2 ** 63 - 1, 2 ** 200, -2 ** 130,
+           1.5, -0.0, float("inf"), "中文", "", b"\x00\x01", b"", [], (), [1.0, 2.5], [1, 2.0], [True, 1.0],
+           {"a": (1, [2.0]), 3: None}, ((1,), [[]]))
+
+
+def _run(core, target_speed):
+    with contextlib.redirect_stdout(io.StringIO()):
+        core.start_simulation(target_speed)
+    return [tuple(row.values()) for row in core.get_simulation_data()]
+
+
+def _warm_core():
+    core = MotorSimulationCore(simulation_duration_ms=1000, seed=7, plant=DCMotorPlant(load_torque=1e-3),
+                               pid_gains=(0.5, 2.0, 0.001))
+    _run(core, 500.0)
+    return core
+
+
+def test_fork_and_from_snapshot_continue_bit_identically():
+    core = _warm_core()
+    snapshot = core.snapshot()
+    forked = core.fork()
+    rebuilt = MotorSimulationCore.from_snapshot(snapshot)
+    restored = MotorSimulationCore(simulation_duration_ms=1000, seed=99, plant=DCMotorPlant(),
+                                   pid_gains=(1.0, 1.0, 1.0))
+    restored.restore(snapshot)
+
+    expected = _run(core, 800.0)[1000:]
+    assert len(expected) == 1000
+    assert _run(forked, 800.0) == expected
+    assert _run(rebuilt, 800.0) == expected
+    assert _run(restored, 800.0) == expected
+    assert forked.snapshot() == rebuilt.snapshot() == core.snapshot()
+
+
+def test_restore_rejects_mismatched_controller():
+    snapshot = _warm_core().snapshot()
+    with pytest.raises(ValueError):
+        MotorSimulationCore(simulation_duration_ms=10, seed=0, plant=DCMotorPlant()).restore(snapshot)
+
+
+def test_codec_round_trip():
+    decoded = loads(dumps(_VALUES))
+    assert decoded == _VALUES
+    assert [type(value) for value in decoded] == [type(value) for value in _VALUES]
+    assert str(decoded[12]) == "-0.0"
+
+
+def test_codec_rejects_unsupported_type():
+    with pytest.raises(ValueError):
+        dumps({1, 2})
+
+
+@pytest.mark.parametrize("value", _VALUES)
+def test_every_truncation_is_rejected(value):
+    data = dumps(value)
+    for end in range(len(data)):
+        with pytest.raises(ValueError):
+            loads(data[:end])
+
+
+def test_corrupt_snapshot_is_rejected():
+    data = dumps(_VALUES)
+    with pytest.raises(ValueError, match="多余"):
+        loads(data + b"N")
+    with pytest.raises(ValueError):
+        loads(b"NOTSNAP\x00" + data[8:])
+    with pytest.raises(ValueError):
+        loads(SNAPSHOT_HEADER.pack(b"BMLSNAP\x00", 99) + data[SNAPSHOT_HEADER.size:])
+    with pytest.raises(ValueError):
+        loads(data[:SNAPSHOT_HEADER.size] + b"?")
+    with pytest.raises(ValueError):
+        loads(dumps("x")[:-1] + b"\xff")
+    with pytest.raises(ValueError):
+        MotorSimulationCore.from_snapshot(_warm_core().snapshot()[:-1])
+
+
+def test_rng_state_round_trip():
+    generator = np.random.default_rng(5)
+    generator.standard_normal(3)
+    other = restore_rng(np.random.Generator(np.random.MT19937(1)), loads(dumps(rng_state(generator))))
+    assert other.standard_normal(4).tolist() == generator.standard_normal(4).tolist()
+
+    source = random.Random(5)
+    source.random()
+    copy = restore_rng(None, loads(dumps(rng_state(source))))
+    assert [copy.random() for _ in range(4)] == [source.random() for _ in range(4)]
+
+    assert rng_state(random) is None
+    assert restore_rng(random, None) is random
+
+
+@pytest.mark.parametrize("state", [
+    ("xx", None),
+    ("np", {"bit_generator": "NoSuchGenerator"}),
+    ("np", {"bit_generator": "default_rng"}),
+    ("np", {"bit_generator": "PCG64", "state": "garbage"}),
+    ("np", {}),
+    ("py", (1, 2)),
+    ("py",),
+])
+def test_corrupt_rng_state_is_rejected(state):
+    with pytest.raises(ValueError):
+        restore_rng(None, state)
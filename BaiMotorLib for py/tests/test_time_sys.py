@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from BaiMotorLib.common.motorlib_time_sys import MotorlibMonoTimeSys, MotorlibTimeSys
+
+
+def test_mono_matches_legacy_carries():
+    legacy, mono = MotorlibTimeSys(), MotorlibMonoTimeSys()
+    rng = random.Random(1)
+    for _ in range(2000):
+        step = dict(ms=rng.randint(0, 2500), sec=rng.randint(0, 70), min=rng.randint(0, 3), hour=rng.randint(0, 1))
+        legacy.tick_inc(**step)
+        mono.tick_inc(**step)
+        assert mono.get_time() == legacy.get_time()
+        assert mono.get_ticks() == legacy.get_ticks()
+        assert (mono.MS, mono.SEC, mono.MIN, mono.HOUR) == (legacy.MS, legacy.SEC, legacy.MIN, legacy.HOUR)
+    assert legacy.HOUR > 24     # 小时无上限，持续累加
+
+
+@pytest.mark.parametrize("time_sys", [MotorlibTimeSys(), MotorlibMonoTimeSys(), MotorlibMonoTimeSys(1000)])
+def test_compare_and_tick_conversion(time_sys):
+    time_sys.tick_inc(ms=999, sec=59, min=59)      # 00:59:59.999
+    time_sys.tick_inc(ms=1)                         # 进位到 01:00:00.000
+    assert time_sys.get_time() == (1, 0, 0, 0)
+    now = time_sys.get_ticks()
+    assert now == 3600000 * time_sys.TICKS_PER_MS
+    assert time_sys.to_ticks(0, 0, 0, 1) == now
+    assert time_sys.split_ticks(now) == (0, 0, 0, 1)
+    assert time_sys.split_ticks(now - 1) == (999, 59, 59, 0)
+    assert time_sys.compare_time(999, 59, 59, 0) == time_sys.OnceUponATime
+    assert time_sys.compare_time(0, 0, 0, 1) == time_sys.NowTheTime
+    assert time_sys.compare_time(1, 0, 0, 1) == time_sys.FutureTime
+    assert [time_sys.compare_ticks(now + d) for d in (-1, 0, 1)] == [
+        time_sys.OnceUponATime, time_sys.NowTheTime, time_sys.FutureTime]
+    assert time_sys.deadline_after(ms=10, ticks=1) == now + 10 * time_sys.TICKS_PER_MS + 1
+
+
+def test_sub_millisecond_ticks():
+    time_sys = MotorlibMonoTimeSys(1000)
+    time_sys.advance_ticks(1500)
+    assert time_sys.get_ticks() == 1500
+    assert time_sys.get_time() == (0, 0, 0, 1)     # 不足1毫秒的部分向下取整
+    assert time_sys.split_ticks(1999) == (1, 0, 0, 0)
+    assert time_sys.compare_time(1, 0, 0, 0) == time_sys.OnceUponATime
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        MotorlibMonoTimeSys(0)
+    with pytest.raises(ValueError):
+        MotorlibMonoTimeSys(1.5)
+    for time_sys in (MotorlibTimeSys(), MotorlibMonoTimeSys()):
+        with pytest.raises(ValueError):
+            time_sys.tick_inc(ms=-1)
+        with pytest.raises(ValueError):
+            time_sys.compare_time(0, -1, 0, 0)
@@ -0,0 +1,27 @@
+import gc
+import warnings
+
+import pytest
+
+from MotorSimulation.trace_file import TraceFileSink, TraceReader
+
+
+@pytest.mark.parametrize("content", [b"", b"BML", b"NOTATRACE" * 8])
+def test_invalid_header_closes_file(tmp_path, content):
+    path = tmp_path / "bad.trace"
+    path.write_bytes(content)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", ResourceWarning)
+        with pytest.raises(ValueError):
+            TraceReader(path)
+        gc.collect()
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "ok.trace"
+    with TraceFileSink(path) as sink:
+        for t in range(1, 11):
+            sink.record(t, 1.0, 0.5, 0.1, 24.0, 100.0, 1)
+    with TraceReader(path) as reader:
+        assert len(reader) == 10
+        assert list(reader.read_range(3, 5)["time_ms"]) == [3, 4, 5]
@@ -0,0 +1,41 @@
+import random
+
+import pytest
+
+from BaiMotorLib.drivers.virtual.pyqt5_sensor import VirtualSensor, VirtualSensorArray, make_sensor_rngs
+
+
+def _raw(sensor):
+    return sensor.get_raw_speed(), sensor.get_raw_position(), sensor.get_raw_current(), sensor.get_voltage()
+
+
+def test_array_matches_scalar_sensors():
+    # 块大小互不相同：结果与块大小无关
+    array = VirtualSensorArray(3, seed=5, noise_block=7)
+    sensors = [VirtualSensor(rng=rng, noise_block=5) for rng in make_sensor_rngs(5, 3)]
+    for _ in range(300):
+        array.update()
+        for sensor in sensors:
+            sensor.update()
+        for i, sensor in enumerate(sensors):
+            assert _raw(sensor) == (array.speed[i], array.position[i], array.current[i], array.voltage[i])
+    assert array.get_speed().tolist() == [sensor.get_speed() for sensor in sensors]
+
+
+def test_array_is_independent_of_motor_count():
+    small, large = VirtualSensorArray(2, seed=9), VirtualSensorArray(5, seed=9, noise_block=3)
+    for _ in range(50):
+        small.update()
+        large.update()
+    assert small.speed.tolist() == large.speed[:2].tolist()
+    assert small.current.tolist() == large.current[:2].tolist()
+
+
+@pytest.mark.parametrize("make_rng", [lambda: make_sensor_rngs(1, 1)[0], lambda: random.Random(1)])
+def test_advance_matches_repeated_update(make_rng):
+    stepped, advanced = VirtualSensor(rng=make_rng(), noise_block=4), VirtualSensor(rng=make_rng(), noise_block=4)
+    for steps in (1, 3, 4, 10, 0, 7):
+        for _ in range(steps):
+            stepped.update()
+        advanced.advance(steps)
+        assert _raw(advanced) == _raw(stepped)
@@ -1,3 +1,4 @@
+import os
 import sys
 import numpy as np
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
@@ -11,6 +12,9 @@ from matplotlib.figure import Figure
 import matplotlib.pyplot as plt
 plt.rcParams['font.sans-serif'] = ['SimHei']  # 解决中文乱码
 plt.rcParams['axes.unicode_minus'] = False    # 解决负号显示
+# 波形环形缓冲区复用仿真界面的 PlotRingBuffer
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "BaiMotorLib for py"))
+from MotorSimulation.plot_buffer import PlotRingBuffer
 
 # 电机模拟核心参数（可根据需求修改）
 HALL_PHASE_NUM = 6  # 三相霍尔6个换向状态
@@ -18,13 +22,61 @@ ENCODER_PPR = 1000  # 编码器线数（每转脉冲数）
 MAX_RPM = 5000      # 最大模拟转速(RPM)
 MIN_RPM = 0         # 最小模拟转速
 DEFAULT_ACCEL = 100 # 默认加减速斜率(RPM/100ms)
-WAVE_DATA_LEN = 200 # 波形显示数据长度（点数）
-REFRESH_RATE = 50   # 界面刷新频率(ms)
+WAVE_DATA_LEN = 1000 # 波形显示数据长度（点数）
+WAVE_SAMPLE_US = 50  # 波形采样间隔(us)，即20kHz采样
+REFRESH_RATE = 20   # 界面刷新频率(ms)
+SIM_TICK_MS = 5     # 模拟计算周期(ms)
+WAVE_CHANNEL_NAMES = ("HA", "HB", "HC", "A", "B")  # 波形通道
+WAVE_CHANNELS = len(WAVE_CHANNEL_NAMES)
+
+class EdgeAccurateCounter:
+    """
+    边沿精确计数器：按解析式计算一个时间区间内发生的信号跳变数，不受计算周期限制
+    区间内转速视为线性变化（rpm0→rpm1），跳变累计量 = 平均转速 × 时长 × 每转跳变数，
+    小数部分（相位）跨区间保留，因此任意转速下计数都不丢边沿
+    """
+    def __init__(self, edges_per_rev):
+        self.edges_per_rev = edges_per_rev  # 每转跳变数（霍尔6，正交编码器PPR*4）
+        self.phase = 0.0   # 距下一次跳变已累计的相位（0~1）
+        self.edges = 0     # 累计跳变数（不分方向）
+        self.count = 0     # 带方向的累计计数（正转+、反转-）
+
+    def advance(self, rpm0, rpm1, dt_ms, forward=True, with_times=False):
+        """
+        推进一个时间区间
+        :param rpm0: 区间起点转速(RPM)
+        :param rpm1: 区间终点转速(RPM)
+        :param dt_ms: 区间时长(ms)
+        :param forward: 是否正转（决定count的符号）
+        :param with_times: 是否同时返回区间内每个跳变相对区间起点的时间戳数组(ms)
+        :return: (跳变数, 时间戳数组或None)
+        """
+        rate0 = rpm0 * self.edges_per_rev / 60000  # 跳变/ms
+        rate1 = rpm1 * self.edges_per_rev / 60000
+        total = self.phase + (rate0 + rate1) / 2 * dt_ms
+        n = int(total)
+        times = None
+        if with_times and n:
+            # 第k个跳变满足 rate0*t + accel*t^2/2 = k - phase，取数值稳定形式的正根
+            accel = (rate1 - rate0) / dt_ms
+            need = np.arange(1, n + 1) - self.phase
+            times = 2 * need / (rate0 + np.sqrt(np.maximum(rate0 * rate0 + 2 * accel * need, 0.0)))
+        self.phase = total - n
+        self.edges += n
+        self.count += n if forward else -n
+        return n, times
+
+    @property
+    def revolutions(self):
+        """带方向的累计转数"""
+        return self.count / self.edges_per_rev
 
 class MotorSimThread(QThread):
     """电机模拟子线程：独立计算霍尔/编码器状态，避免阻塞界面"""
     state_update = pyqtSignal(int, int, int, bool)  # 霍尔状态、A相、B相、运行状态
     param_update = pyqtSignal(int, str)             # 转速、转向
+    count_update = pyqtSignal(object, float)        # 编码器累计计数、累计转数
+    wave_batch = pyqtSignal(object)                 # 本周期的波形采样块 (WAVE_CHANNELS, n)，每周期发射一次
 
     def __init__(self):
         super().__init__()
@@ -38,29 +90,45 @@ class MotorSimThread(QThread):
         self.hall_state = 0
         self.hall_pos_forward = [0x01, 0x03, 0x02, 0x06, 0x04, 0x05]  # 正转状态表
         self.hall_pos_reverse = self.hall_pos_forward[::-1]          # 反转状态表（逆序）
-        self.hall_tick = 0
+        self.hall_counter = EdgeAccurateCounter(HALL_PHASE_NUM)  # 霍尔跳变解析计数
         self.hall_period = 0  # 霍尔状态切换周期(ms)
         # 编码器信号配置
         self.encoder_phase = 0  # 0-3：正交相位状态
-        self.encoder_tick = 0
+        self.encoder_counter = EdgeAccurateCounter(ENCODER_PPR * 4)  # 编码器跳变解析计数
         self.encoder_period = 0  # 编码器相位切换周期(ms)
-        # 定时器：5ms刷新一次（高精度计算）
-        self.timer = QTimer()
-        self.timer.setInterval(5)
-        self.timer.timeout.connect(self.calc_motor_state)
+        # 波形采样：每个计算周期内按WAVE_SAMPLE_US等间隔采样电平，整块发往界面
+        self.wave_sample_t = np.arange(1, SIM_TICK_MS * 1000 // WAVE_SAMPLE_US + 1) * (WAVE_SAMPLE_US / 1000)
+        self.hall_table = {1: np.array(self.hall_pos_forward), 0: np.array(self.hall_pos_reverse)}
+        self.enc_table = {1: np.array([(1,0), (1,1), (0,1), (0,0)]).T,   # 正转相位表 (A行, B行)
+                          0: np.array([(0,1), (1,1), (1,0), (0,0)]).T}   # 反转相位表
+        # 定时器：5ms刷新一次（高精度计算），在run()中创建，使其归属并运行于子线程
+        self.timer = None
 
     def calc_motor_state(self):
-        """核心计算：根据目标转速更新实际转速，计算霍尔/编码器周期并更新状态"""
+        """
+        核心计算：根据目标转速更新实际转速，按解析式累计本周期内的霍尔/编码器跳变并更新状态
+        每个周期可跨越任意多个跳变（如5000RPM时编码器每周期约1667次跳变），计数与相位不丢失
+        """
         if not self.running:
             self.target_rpm = 0
         # 1. 加减速控制：实际转速向目标转速逼近
+        prev_rpm = self.current_rpm
         if self.current_rpm < self.target_rpm:
             self.current_rpm = min(self.current_rpm + self.accel_rate/20, self.target_rpm)
         elif self.current_rpm > self.target_rpm:
             self.current_rpm = max(self.current_rpm - self.accel_rate/20, self.target_rpm)
         self.current_rpm = int(self.current_rpm)
 
-        # 2. 计算霍尔和编码器周期（转速→频率→周期）
+        # 2. 解析累计本周期（转速由prev_rpm线性变化到current_rpm）内的跳变数及跳变时刻
+        hall_edges, hall_times = self.hall_counter.advance(prev_rpm, self.current_rpm, SIM_TICK_MS,
+                                                           bool(self.dir), with_times=True)
+        enc_edges, enc_times = self.encoder_counter.advance(prev_rpm, self.current_rpm, SIM_TICK_MS,
+                                                            bool(self.dir), with_times=True)
+        self.wave_batch.emit(self._sample_waves(prev_rpm, hall_times, enc_times))
+        self.hall_state = (self.hall_state + hall_edges) % HALL_PHASE_NUM
+        self.encoder_phase = (self.encoder_phase + enc_edges) % 4
+
+        # 3. 计算霍尔和编码器周期（转速→频率→周期，仅供显示参考）
         if self.current_rpm == 0:
             self.hall_period = 0
             self.encoder_period = 0
@@ -68,43 +136,53 @@ class MotorSimThread(QThread):
             enc_a, enc_b = 0, 0
         else:
             # 霍尔周期：每转6个状态，周期=60000/(转速*6) （ms/状态）
-            self.hall_period = 60000 / (self.current_rpm * HALL_PHASE_NUM) if self.current_rpm else 0
+            self.hall_period = 60000 / (self.current_rpm * HALL_PHASE_NUM)
             # 编码器周期：每转PPR个脉冲，每个脉冲4个相位，周期=60000/(转速*ENCODER_PPR*4) （ms/相位）
-            self.encoder_period = 60000 / (self.current_rpm * ENCODER_PPR * 4) if self.current_rpm else 0
-
-            # 3. 更新霍尔状态（6个状态循环）
-            self.hall_tick += 5
-            if self.hall_tick >= self.hall_period:
-                self.hall_tick = 0
-                self.hall_state = (self.hall_state + 1) % HALL_PHASE_NUM
-            # 解析霍尔状态为HA/HB/HC电平（1-高，0-低）
+            self.encoder_period = 60000 / (self.current_rpm * ENCODER_PPR * 4)
+
+            # 4. 解析霍尔状态为HA/HB/HC电平（1-高，0-低）
             hall_val = self.hall_pos_forward[self.hall_state] if self.dir else self.hall_pos_reverse[self.hall_state]
             ha = (hall_val & 0x01) >> 0
             hb = (hall_val & 0x02) >> 1
             hc = (hall_val & 0x04) >> 2
 
-            # 4. 更新编码器正交相位（4个相位循环，正反转相位顺序相反）
-            self.encoder_tick += 5
-            if self.encoder_tick >= self.encoder_period:
-                self.encoder_tick = 0
-                self.encoder_phase = (self.encoder_phase + 1) % 4
-            # 正转：A超前B90°；反转：B超前A90°
+            # 5. 编码器正交相位：正转A超前B90°；反转B超前A90°
             if self.dir:
                 enc_phase_map = [(1,0), (1,1), (0,1), (0,0)]  # 正转相位表
             else:
                 enc_phase_map = [(0,1), (1,1), (1,0), (0,0)]  # 反转相位表
             enc_a, enc_b = enc_phase_map[self.encoder_phase]
 
-        # 5. 发射状态更新信号（传递给主线程绘制）
+        # 6. 发射状态更新信号（传递给主线程绘制）
         hall_combined = (ha << 2) | (hb << 1) | hc  # 合并HA(2)/HB(1)/HC(0)
         self.state_update.emit(hall_combined, enc_a, enc_b, self.running)
         self.param_update.emit(self.current_rpm, "正转" if self.dir else "反转")
+        self.count_update.emit(self.encoder_counter.count, self.encoder_counter.revolutions)
+
+    def _sample_waves(self, prev_rpm, hall_times, enc_times):
+        """
+        按WAVE_SAMPLE_US对本周期的电平采样（向量化）：采样时刻之前发生的跳变数决定该时刻的状态
+        :return: 形状为 (WAVE_CHANNELS, n) 的电平数组，行依次为 HA/HB/HC/A/B
+        """
+        block = np.zeros((WAVE_CHANNELS, len(self.wave_sample_t)), dtype=np.uint8)
+        if prev_rpm == 0 and self.current_rpm == 0:
+            return block  # 静止时电平全为0（与状态显示一致）
+        hall_idx = np.full(len(self.wave_sample_t), self.hall_state)
+        enc_idx = np.full(len(self.wave_sample_t), self.encoder_phase)
+        if hall_times is not None:
+            hall_idx += np.searchsorted(hall_times, self.wave_sample_t, side="right")
+        if enc_times is not None:
+            enc_idx += np.searchsorted(enc_times, self.wave_sample_t, side="right")
+        hall_val = self.hall_table[self.dir][hall_idx % HALL_PHASE_NUM]
+        block[0] = hall_val & 0x01
+        block[1] = (hall_val & 0x02) >> 1
+        block[2] = (hall_val & 0x04) >> 2
+        block[3:5] = self.enc_table[self.dir][:, enc_idx % 4]
+        return block
 
     def start_motor(self):
-        """启动电机"""
+        """启动电机（定时器随线程常驻运行，这里只切换运行状态）"""
         self.running = True
-        if not self.timer.isActive():
-            self.timer.start()
 
     def stop_motor(self):
         """停止电机（急停）"""
@@ -123,8 +201,18 @@ class MotorSimThread(QThread):
         self.accel_rate = accel
 
     def run(self):
-        """线程运行"""
+        """
+        线程运行：定时器在子线程内创建，并以DirectConnection连接，保证calc_motor_state在子线程执行
+        （QThread对象本身属于主线程，默认的自动连接会把回调排队到主线程，子线程实际不做任何计算）
+        计算结果经信号以排队方式发往主线程，界面卡顿不会阻塞仿真节拍
+        """
+        self.timer = QTimer()
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setInterval(SIM_TICK_MS)
+        self.timer.timeout.connect(self.calc_motor_state, Qt.DirectConnection)
+        self.timer.start()
         self.exec_()
+        self.timer.stop()
 
 class HallEncoderMotorSim(QMainWindow):
     """主窗口：可视化界面+波形绘制+参数交互"""
@@ -134,18 +222,19 @@ class HallEncoderMotorSim(QMainWindow):
         self.setGeometry(100, 100, 1200, 800)
         self.setStyleSheet("font-size:12px; background-color:#f5f5f5;")
 
-        # 初始化波形数据（存储最新WAVE_DATA_LEN个点）
+        # 初始化波形数据：5个通道共用一个环形缓冲区（存储最新WAVE_DATA_LEN个点），
+        # 预先填满0电平，使各通道视图始终为WAVE_DATA_LEN个点、与x_data等长
         self.x_data = np.linspace(0, WAVE_DATA_LEN-1, WAVE_DATA_LEN)
-        self.ha_data = np.zeros(WAVE_DATA_LEN)
-        self.hb_data = np.zeros(WAVE_DATA_LEN)
-        self.hc_data = np.zeros(WAVE_DATA_LEN)
-        self.enc_a_data = np.zeros(WAVE_DATA_LEN)
-        self.enc_b_data = np.zeros(WAVE_DATA_LEN)
+        self.wave_buffer = PlotRingBuffer(WAVE_CHANNEL_NAMES, WAVE_DATA_LEN)
+        self.wave_buffer.extend(np.zeros((WAVE_CHANNELS, WAVE_DATA_LEN)))
+        self._wave_dirty = False
 
         # 初始化电机模拟子线程
         self.motor_thread = MotorSimThread()
-        self.motor_thread.state_update.connect(self.update_wave_data)
+        self.motor_thread.state_update.connect(self.update_state_display)
+        self.motor_thread.wave_batch.connect(self.append_wave_batch)
         self.motor_thread.param_update.connect(self.update_param_display)
+        self.motor_thread.count_update.connect(self.update_count_display)
         self.motor_thread.start()
 
         # 构建主界面
@@ -254,8 +343,9 @@ class HallEncoderMotorSim(QMainWindow):
         self.dir_label = QLabel(f"当前转向：正转")
         self.hall_label = QLabel(f"霍尔状态：000 (HA=0, HB=0, HC=0)")
         self.enc_label = QLabel(f"编码器状态：A=0, B=0")
+        self.count_label = QLabel(f"编码器计数：0（0.000 转）")
         # 设置字体大小
-        for lbl in [self.rpm_label, self.dir_label, self.hall_label, self.enc_label]:
+        for lbl in [self.rpm_label, self.dir_label, self.hall_label, self.enc_label, self.count_label]:
             lbl.setFont(QFont("Arial", 14))
         # 布局
         state_layout.addWidget(QLabel("运行状态："), 0,0)
@@ -264,11 +354,13 @@ class HallEncoderMotorSim(QMainWindow):
         state_layout.addWidget(self.dir_label, 1,0,1,2)
         state_layout.addWidget(self.hall_label, 1,2)
         state_layout.addWidget(self.enc_label, 2,0,1,3)
+        state_layout.addWidget(self.count_label, 3,0,1,3)
         display_layout.addWidget(state_group)
 
         # 2. 波形显示区（霍尔信号+编码器信号）- matplotlib适配
         wave_group = QGroupBox("实时波形显示（高=1，低=0）")
         wave_layout = QVBoxLayout(wave_group)
+        self._backgrounds = {}  # 各图的静态背景缓存（blit用）
         # 霍尔信号波形图（HA/HB/HC）
         self.hall_fig = Figure(figsize=(8, 3), dpi=100)
         self.hall_canvas = FigureCanvas(self.hall_fig)
@@ -293,7 +385,7 @@ class HallEncoderMotorSim(QMainWindow):
         plot_fig.clear()
         ax = plot_fig.add_subplot(111)
         ax.set_title(title, fontsize=12)
-        ax.set_xlabel("采样点", fontsize=10)
+        ax.set_xlabel(f"采样点（{WAVE_SAMPLE_US}us/点）", fontsize=10)
         ax.set_ylabel("电平", fontsize=10)
         ax.set_ylim(-0.5, 1.5)  # 电平仅0/1，预留上下余量
         ax.set_xlim(0, WAVE_DATA_LEN-1)
@@ -304,8 +396,19 @@ class HallEncoderMotorSim(QMainWindow):
             line, = ax.plot(self.x_data, np.zeros(WAVE_DATA_LEN), color=color, label=label, linewidth=2)
             lines.append(line)
         ax.legend(loc="upper right", fontsize=10)
+        # 波形线设为animated，由blit单独重绘，坐标轴/图例等静态部分缓存为背景
+        for line in lines:
+            line.set_animated(True)
+        plot_fig.canvas.mpl_connect("draw_event", lambda event, fig=plot_fig: self._cache_background(fig))
         return lines
 
+    def _cache_background(self, plot_fig):
+        """完整重绘（首次显示、窗口缩放）后缓存静态背景，并把波形线画回去"""
+        ax = plot_fig.axes[0]
+        self._backgrounds[plot_fig] = plot_fig.canvas.copy_from_bbox(ax.bbox)
+        for line in ax.get_lines():
+            ax.draw_artist(line)
+
     def _on_dir_toggle(self):
         """切换转向回调"""
         self.motor_thread.toggle_dir()
@@ -321,26 +424,18 @@ class HallEncoderMotorSim(QMainWindow):
         self.motor_thread.set_accel(accel)
         self.accel_slider.setValue(accel)
 
-    def update_wave_data(self, hall_combined, enc_a, enc_b, running):
-        """更新波形数据：移除最旧点，添加最新点"""
+    def append_wave_batch(self, block):
+        """接收一个周期的波形采样块，整块写入环形缓冲区"""
+        self.wave_buffer.extend(block)
+        self._wave_dirty = True
+
+    def update_state_display(self, hall_combined, enc_a, enc_b, running):
+        """更新运行状态、霍尔与编码器状态显示"""
         # 解析霍尔组合值为HA/HB/HC
         ha = (hall_combined >> 2) & 0x01
         hb = (hall_combined >> 1) & 0x01
         hc = hall_combined & 0x01
 
-        # 波形数据滚动更新（保持固定长度）
-        self.ha_data = np.roll(self.ha_data, -1)
-        self.hb_data = np.roll(self.hb_data, -1)
-        self.hc_data = np.roll(self.hc_data, -1)
-        self.enc_a_data = np.roll(self.enc_a_data, -1)
-        self.enc_b_data = np.roll(self.enc_b_data, -1)
-        # 添加最新电平值
-        self.ha_data[-1] = ha
-        self.hb_data[-1] = hb
-        self.hc_data[-1] = hc
-        self.enc_a_data[-1] = enc_a
-        self.enc_b_data[-1] = enc_b
-
         # 更新状态显示
         self.run_led.setStyleSheet(f"background-color:{'#4CAF50' if running else '#cccccc'}; border-radius:10px;")
         self.hall_label.setText(f"霍尔状态：{ha}{hb}{hc} (HA={ha}, HB={hb}, HC={hc})")
@@ -352,21 +447,30 @@ class HallEncoderMotorSim(QMainWindow):
         self.dir_label.setText(f"当前转向：{dir}")
         self.dir_btn.setText(f"切换转向（当前：{dir}）")
 
+    def update_count_display(self, count, revolutions):
+        """更新编码器累计计数显示"""
+        self.count_label.setText(f"编码器计数：{count}（{revolutions:.3f} 转）")
+
     def replot_waves(self):
-        """重绘波形：将最新数据更新到matplotlib图表"""
-        # 重绘霍尔信号
-        self.hall_lines[0].set_ydata(self.ha_data)
-        self.hall_lines[1].set_ydata(self.hb_data)
-        self.hall_lines[2].set_ydata(self.hc_data)
-        self.hall_fig.canvas.draw_idle()
-        # 重绘编码器信号
-        self.enc_lines[0].set_ydata(self.enc_a_data)
-        self.enc_lines[1].set_ydata(self.enc_b_data)
-        self.enc_fig.canvas.draw_idle()
+        """重绘波形：恢复缓存背景后只重绘波形线并blit，不触发整幅图重绘"""
+        if not self._wave_dirty:
+            return
+        self._wave_dirty = False
+        for fig, lines, channels in ((self.hall_fig, self.hall_lines, ("HA", "HB", "HC")),
+                                     (self.enc_fig, self.enc_lines, ("A", "B"))):
+            background = self._backgrounds.get(fig)
+            if background is None:
+                continue  # 尚未完成首次绘制
+            for line, channel in zip(lines, channels):
+                line.set_ydata(self.wave_buffer.view(channel))
+            fig.canvas.restore_region(background)
+            ax = fig.axes[0]
+            for line in lines:
+                ax.draw_artist(line)
+            fig.canvas.blit(ax.bbox)
 
     def closeEvent(self, event):
-        """窗口关闭事件：停止线程和定时器"""
-        self.motor_thread.timer.stop()
+        """窗口关闭事件：停止线程和定时器（子线程定时器在线程退出时于子线程内停止）"""
         self.motor_thread.quit()
         self.motor_thread.wait()
         self.refresh_timer.stop()